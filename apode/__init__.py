@@ -13,7 +13,7 @@
 Apode contains a set of measures applied in economics.
 """
 
-__all__ = ["ApodeData"]
+__all__ = ["ApodeData", "State"]
 
 
 __version__ = "0.0.1"
@@ -24,3 +24,12 @@ __version__ = "0.0.1"
 # =============================================================================
 
 from .basic import ApodeData  # noqa
+
+
+def __getattr__(name):
+    """Import ``State`` on first access (PEP 562)."""
+    if name == "State":
+        from .state import State
+
+        return State
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Compute backends of the loop-heavy kernels of Apode.
+
+The ``"numpy"`` backend is the reference implementation. The optional
+``"numba"`` backend compiles single-pass loops of the same kernels
+(no temporaries), caching the machine code on disk (``__pycache__``
+next to this module, or ``NUMBA_CACHE_DIR``) so that new processes do
+not compile again.
+
+The backend is chosen with ``set_backend`` or ``use_backend``, or with
+the ``APODE_BACKEND`` environment variable.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import os
+from contextlib import contextmanager
+
+import attr
+
+import numpy as np
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True)
+class Backend:
+    """Kernels of the unweighted measures.
+
+    Every kernel takes the sorted incomes ``ys`` (or their cumulative
+    sums), the number of records ``n`` and, for poverty, the records
+    below the line ``q`` and the line ``pline``.
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend.
+
+    kakwani, thon, takayama : callable
+        Poverty indices.
+
+    merhan, piesch, bonferroni : callable
+        Inequality indices from the cumulative sums.
+
+    tip, lorenz : callable
+        Curve ordinates (with the leading zero) of the plots.
+
+    """
+
+    name = attr.ib()
+    kakwani = attr.ib()
+    thon = attr.ib()
+    takayama = attr.ib()
+    merhan = attr.ib()
+    piesch = attr.ib()
+    bonferroni = attr.ib()
+    tip = attr.ib()
+    lorenz = attr.ib()
+
+
+# =============================================================================
+# NUMPY KERNELS
+# =============================================================================
+
+
+def _np_kakwani(ys, n, q, pline, alpha):
+    ii = np.arange(q)
+    f = np.power(q - ii + 2, alpha)
+    a = float(np.sum(f))
+    u = np.sum(np.dot(f, pline - ys[:q]))
+    if u == 0:
+        return 0  # to avoid NaNs for zero division error
+    return (q / (n * pline * a)) * u
+
+
+def _np_thon(ys, n, q, pline):
+    ii = np.arange(q)
+    u = np.sum(np.dot(n - ii + 1, pline - ys[:q]))
+    return (2 / (n * (n + 1) * pline)) * u
+
+
+def _np_takayama(ys, n, q, pline):
+    if q == 0:
+        return 0
+    yp = ys[0:q]
+    u = (yp.sum() + (n - q) * pline) / n
+    if u * n * n == 0:
+        return 0  # to avoid NaNs for zero division error
+    i_0q = np.arange(q)
+    i_qn = np.arange(q, n)
+    a = np.sum(np.dot(n - i_0q + 1, ys[:q])) + np.sum((n - i_qn + 1) * pline)
+    return 1 + 1 / n - (2 / (u * n * n)) * a
+
+
+def _np_merhan(cumsum, n, mean):
+    f = 1.0 / (n * mean)
+    pi = np.arange(n - 1) / n
+    pi[0] = 1 / n
+    qi = f * cumsum[:-1]
+    p_q = pi - qi
+    pi[0] = 0
+    return np.sum(np.dot(1 - pi, p_q)) * 6 / n
+
+
+def _np_piesch(cumsum, n, mean):
+    f = 1.0 / (n * mean)
+    pi = np.arange(n - 1) / n
+    pi[0] = 1 / n
+    qi = f * cumsum[:-1]
+    p_q = pi - qi
+    pi[0] = 1
+    return np.sum(np.dot(pi, p_q)) * 3 / n
+
+
+def _np_bonferroni(cumsum, n):
+    ii = np.arange(n - 1)
+    ii[0] = 1
+    x = cumsum[:-1]
+    s = np.sum(x / ii)
+    u = cumsum[-1] / n
+    return 1 - (1 / ((n - 1) * u)) * s
+
+
+def _np_tip(ys, n, q, pline):
+    ygap = np.zeros(n)
+    ygap[0:q] = (pline - ys[0:q]) / pline
+    z = np.cumsum(ygap) / n
+    return np.insert(z, 0, 0)
+
+
+def _np_lorenz(ys, cumsum, alpha, mu):
+    z = cumsum / ys.sum()
+    if alpha == "g":
+        z = z * mu
+    elif alpha == "a":
+        z = np.cumsum(ys - mu)
+    return np.insert(z, 0, 0)
+
+
+NUMPY = Backend(
+    name="numpy",
+    kakwani=_np_kakwani,
+    thon=_np_thon,
+    takayama=_np_takayama,
+    merhan=_np_merhan,
+    piesch=_np_piesch,
+    bonferroni=_np_bonferroni,
+    tip=_np_tip,
+    lorenz=_np_lorenz,
+)
+
+
+# =============================================================================
+# LOOP KERNELS (compiled by the numba backend)
+# =============================================================================
+
+
+def _loop_kakwani(ys, n, q, pline, alpha):
+    a = 0.0
+    u = 0.0
+    for i in range(q):
+        f = (q - i + 2.0) ** alpha
+        a += f
+        u += f * (pline - ys[i])
+    if u == 0:
+        return 0.0
+    return (q / (n * pline * a)) * u
+
+
+def _loop_thon(ys, n, q, pline):
+    u = 0.0
+    for i in range(q):
+        u += (n - i + 1.0) * (pline - ys[i])
+    return (2.0 / (n * (n + 1.0) * pline)) * u
+
+
+def _loop_takayama(ys, n, q, pline):
+    if q == 0:
+        return 0.0
+    s = 0.0
+    a = 0.0
+    for i in range(q):
+        s += ys[i]
+        a += (n - i + 1.0) * ys[i]
+    u = (s + (n - q) * pline) / n
+    if u * n * n == 0:
+        return 0.0
+    for i in range(q, n):
+        a += (n - i + 1.0) * pline
+    return 1.0 + 1.0 / n - (2.0 / (u * n * n)) * a
+
+
+def _loop_merhan(cumsum, n, mean):
+    f = 1.0 / (n * mean)
+    s = 0.0
+    for i in range(n - 1):
+        p = i / n if i > 0 else 1.0 / n
+        s += (1.0 - i / n) * (p - f * cumsum[i])
+    return s * 6.0 / n
+
+
+def _loop_piesch(cumsum, n, mean):
+    f = 1.0 / (n * mean)
+    s = 1.0 / n - f * cumsum[0]
+    for i in range(1, n - 1):
+        p = i / n
+        s += p * (p - f * cumsum[i])
+    return s * 3.0 / n
+
+
+def _loop_bonferroni(cumsum, n):
+    s = cumsum[0]
+    for i in range(1, n - 1):
+        s += cumsum[i] / i
+    u = cumsum[n - 1] / n
+    return 1.0 - (1.0 / ((n - 1) * u)) * s
+
+
+def _loop_tip(ys, n, q, pline):
+    z = np.zeros(n + 1)
+    acc = 0.0
+    for i in range(n):
+        if i < q:
+            acc += (pline - ys[i]) / pline
+        z[i + 1] = acc / n
+    return z
+
+
+def _loop_lorenz(ys, cumsum, alpha, mu):
+    n = len(ys)
+    z = np.zeros(n + 1)
+    if alpha == "a":
+        acc = 0.0
+        for i in range(n):
+            acc += ys[i] - mu
+            z[i + 1] = acc
+        return z
+    total = 0.0
+    for i in range(n):
+        total += ys[i]
+    scale = mu / total if alpha == "g" else 1.0 / total
+    for i in range(n):
+        z[i + 1] = cumsum[i] * scale
+    return z
+
+
+_LOOPS = {
+    "kakwani": _loop_kakwani,
+    "thon": _loop_thon,
+    "takayama": _loop_takayama,
+    "merhan": _loop_merhan,
+    "piesch": _loop_piesch,
+    "bonferroni": _loop_bonferroni,
+    "tip": _loop_tip,
+    "lorenz": _loop_lorenz,
+}
+
+
+def _numba_backend():
+    """Compile the loop kernels with numba (cached on disk)."""
+    try:
+        import numba
+    except ImportError:
+        raise ImportError("The 'numba' backend requires numba")
+    kernels = {
+        name: numba.njit(cache=True, nogil=True)(func)
+        for name, func in _LOOPS.items()
+    }
+    return Backend(name="numba", **kernels)
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_FACTORIES = {"numpy": lambda: NUMPY, "numba": _numba_backend}
+
+_BACKENDS = {}
+
+_ACTIVE = [os.environ.get("APODE_BACKEND", "numpy")]
+
+
+def register_backend(name, factory):
+    """Register a backend.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend.
+
+    factory : callable
+        Function without arguments returning the ``Backend``; called
+        the first time the backend is used.
+
+    """
+    _FACTORIES[name] = factory
+    _BACKENDS.pop(name, None)
+
+
+def get_backend(name=None):
+    """Return a backend, the active one by default.
+
+    Parameters
+    ----------
+    name : str, optional(default=None)
+        Name of the backend.
+
+    Return
+    ------
+    out: Backend
+        Kernels of the backend.
+
+    """
+    name = _ACTIVE[-1] if name is None else name
+    if name not in _BACKENDS:
+        if name not in _FACTORIES:
+            raise ValueError(
+                f"Unknown backend '{name}'. "
+                f"Available: {sorted(_FACTORIES)}"
+            )
+        _BACKENDS[name] = _FACTORIES[name]()
+    return _BACKENDS[name]
+
+
+def set_backend(name):
+    """Make ``name`` the active backend of every measure."""
+    get_backend(name)
+    _ACTIVE[0] = name
+    del _ACTIVE[1:]
+
+
+@contextmanager
+def use_backend(name):
+    """Use the backend ``name`` inside a ``with`` block."""
+    get_backend(name)
+    _ACTIVE.append(name)
+    try:
+        yield get_backend(name)
+    finally:
+        _ACTIVE.pop()
@@ -17,16 +17,78 @@
 # IMPORTS
 # =============================================================================
 
+import importlib
+from functools import cached_property
+
 import attr
 
+import numpy as np
+
 import pandas as pd
 
-from .concentration import ConcentrationMeasures
-from .inequality import InequalityMeasures
-from .plots import PlotAccsessor
-from .polarization import PolarizationMeasures
-from .poverty import PovertyMeasures
-from .welfare import WelfareMeasures
+from .cache import IncomeCache
+from .profiling import timed
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MEASURE_FAMILIES = (
+    "poverty",
+    "inequality",
+    "polarization",
+    "concentration",
+    "welfare",
+)
+
+# Module and class of every accessor. They are imported on first access,
+# so that ``import apode`` does not load matplotlib nor the measures.
+_ACCESSORS = {
+    "poverty": ("poverty", "PovertyMeasures"),
+    "inequality": ("inequality", "InequalityMeasures"),
+    "polarization": ("polarization", "PolarizationMeasures"),
+    "concentration": ("concentration", "ConcentrationMeasures"),
+    "welfare": ("welfare", "WelfareMeasures"),
+    "plot": ("plots", "PlotAccsessor"),
+}
+
+# Cached primitives read by each measure (see IncomeCache). Measures not
+# listed here only need the sorted values.
+_PRIMITIVES = {
+    "poverty": {
+        "sen": ("ys", "mean"),
+        "sst": ("ys", "mean"),
+        "hagenaars": ("ys", "logys"),
+        "bd": ("ys", "mean"),
+    },
+    "inequality": {
+        "rrange": ("ys", "mean"),
+        "rad": ("ys", "mean"),
+        "cv": ("ys", "mean"),
+        "sdlog": ("ys", "mean"),
+        "gini": ("ys", "mean"),
+        "merhan": ("cumsum", "mean"),
+        "piesch": ("cumsum", "mean"),
+        "bonferroni": ("cumsum",),
+        "kolm": ("ys", "mean"),
+        "entropy": ("ys", "mean"),
+        "atkinson": ("ys", "mean"),
+    },
+    "polarization": {
+        "wolfson": ("cumsum", "total", "mean", "median"),
+    },
+    "concentration": {
+        "rosenbluth": ("ys", "mean"),
+    },
+    "welfare": {
+        "utilitarian": ("ys", "mean"),
+        "isoelastic": ("ys", "mean"),
+        "sen": ("ys", "mean"),
+        "theill": ("ys", "mean"),
+        "theilt": ("ys", "mean"),
+    },
+}
 
 
 # =============================================================================
@@ -54,39 +116,395 @@ class ApodeData:
     income_column : str
         Column name
 
+    weight_column : str, optional(default=None)
+        Column with the sampling weights (expansion factors) of each
+        record. Every record then stands for ``weight`` persons.
+
     Attributes
     ----------
-    data, income_column : see Parameters
+    data, income_column, weight_column : see Parameters
+
+    cache : IncomeCache
+        Sorted values, cumulative sums and order statistics of the income
+        column, computed lazily and shared by all the measures. The cache
+        assumes that ``data`` is not modified in place.
 
     """
 
     data = attr.ib(converter=pd.DataFrame)
     income_column = attr.ib()
-    poverty = attr.ib(
-        init=False, default=attr.Factory(PovertyMeasures, takes_self=True)
-    )
-    inequality = attr.ib(
-        init=False, default=attr.Factory(InequalityMeasures, takes_self=True)
-    )
-    polarization = attr.ib(
-        init=False, default=attr.Factory(PolarizationMeasures, takes_self=True)
-    )
-    concentration = attr.ib(
-        init=False,
-        default=attr.Factory(ConcentrationMeasures, takes_self=True),
-    )
-    welfare = attr.ib(
-        init=False, default=attr.Factory(WelfareMeasures, takes_self=True)
-    )
-    plot = attr.ib(
-        init=False, default=attr.Factory(PlotAccsessor, takes_self=True)
-    )
+    weight_column = attr.ib(default=None, kw_only=True)
+
+    @classmethod
+    def from_array(
+        cls,
+        y,
+        weights=None,
+        income_column="x",
+        weight_column="w",
+        dtype="float64",
+    ):
+        """Wrap an income array without copying it.
+
+        A contiguous vector of ``dtype`` (``ndarray``, ``np.memmap`` or a
+        buffer exposing ``__array__``, such as an Arrow array without
+        nulls) is used as it is: the DataFrame column and the income
+        cache of the measures share its memory. Other inputs are
+        converted to ``dtype``, which makes one copy.
+
+        Parameters
+        ----------
+        y : array_like
+            Income values.
+
+        weights : array_like, optional(default=None)
+            Sampling weights of each income, also wrapped without copy.
+
+        income_column : str, optional(default="x")
+            Name of the income column.
+
+        weight_column : str, optional(default="w")
+            Name of the weight column, used only with ``weights``.
+
+        dtype : str, optional(default="float64")
+            Storage of the incomes, ``"float64"`` or ``"float32"``.
+            float32 halves the memory of the incomes and of their sorted
+            copy; sums are still accumulated in float64 with compensation.
+            See ``apode.precision`` for the accuracy of the measures.
+
+        Return
+        ------
+        out: ApodeData
+            Data over the given buffers.
+
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float64, np.float32):
+            raise ValueError(
+                f"'dtype' must be float64 or float32. Found '{dtype}'"
+            )
+        y = _as_vector(y, dtype=dtype)
+        if weights is not None:
+            weights = _as_vector(weights)
+            if len(weights) != len(y):
+                raise ValueError("'weights' must have the length of 'y'")
+        idf = cls._from_vectors(y, weights, income_column, weight_column)
+        attr.validate(idf)
+        return idf
+
+    @classmethod
+    def _from_vectors(cls, y, weights, income_column, weight_column):
+        """Wrap checked vectors without running the validators.
+
+        Used for stores written by ``save_store``, whose weights were
+        validated when saved: checking them again would read the whole
+        memory mapped column on open.
+        """
+        columns = {income_column: y}
+        if weights is not None:
+            columns[weight_column] = weights
+        else:
+            weight_column = None
+        idf = cls.__new__(cls)
+        idf.__dict__.update(
+            data=pd.DataFrame(columns, copy=False),
+            income_column=income_column,
+            weight_column=weight_column,
+            cache=IncomeCache(y, weights),
+        )
+        return idf
+
+    @classmethod
+    def open_store(cls, path, mmap_mode="r"):
+        """Open a pre-sorted income store written by ``save_store``.
+
+        See ``apode.store.open_store``.
+
+        Return
+        ------
+        out: ApodeData
+            Data over the memory mapped incomes, already sorted.
+
+        """
+        from .store import open_store
+
+        return open_store(path, mmap_mode=mmap_mode)
+
+    def save_store(self, path):
+        """Write the incomes to a pre-sorted binary store.
+
+        The sorted incomes, permutation and prefix sums are saved along
+        with the incomes and weights; see ``apode.store.save_store``.
+        Reopen it with ``ApodeData.open_store(path)``.
+
+        Parameters
+        ----------
+        path : str or path-like
+            Directory of the store.
+
+        """
+        from .store import save_store
+
+        save_store(self, path)
+
+    @cached_property
+    def poverty(self):
+        """Poverty measures (``PovertyMeasures``)."""
+        return _accessor(self, "poverty")
+
+    @cached_property
+    def inequality(self):
+        """Inequality measures (``InequalityMeasures``)."""
+        return _accessor(self, "inequality")
+
+    @cached_property
+    def polarization(self):
+        """Polarization measures (``PolarizationMeasures``)."""
+        return _accessor(self, "polarization")
+
+    @cached_property
+    def concentration(self):
+        """Concentration measures (``ConcentrationMeasures``)."""
+        return _accessor(self, "concentration")
+
+    @cached_property
+    def welfare(self):
+        """Welfare measures (``WelfareMeasures``)."""
+        return _accessor(self, "welfare")
+
+    @cached_property
+    def plot(self):
+        """Plots (``PlotAccsessor``); loads matplotlib on first use."""
+        return _accessor(self, "plot")
 
     @income_column.validator
     def _validate_income_column(self, name, value):
         if value not in self.data.columns:
             raise ValueError()
 
+    @weight_column.validator
+    def _validate_weight_column(self, name, value):
+        if value is None:
+            return
+        if value not in self.data.columns:
+            raise ValueError(f"Column '{value}' not found")
+        if (self.data[value] < 0).any():
+            raise ValueError("Weights must be >= 0")
+
+    @cached_property
+    def cache(self):
+        """Income cache shared by all the measures."""
+        with timed("extract"):
+            weights = None
+            if self.weight_column is not None:
+                weights = self.data[self.weight_column].values
+            y = self.data[self.income_column].values
+        return IncomeCache(y, weights)
+
+    def extend(self, new_rows):
+        """Append new records, updating the cache incrementally.
+
+        The sorted values, argsort and prefix sums already computed are
+        merged with those of the new records (see
+        ``IncomeCache.extend``) instead of sorting the whole income
+        column again.
+
+        Parameters
+        ----------
+        new_rows : dataframe
+            New records, with the income column (and the weight column,
+            if any).
+
+        Return
+        ------
+        out: ApodeData
+            Data with the new records appended (index reset).
+
+        """
+        new_rows = pd.DataFrame(new_rows)
+        data = pd.concat((self.data, new_rows), ignore_index=True)
+        idf = ApodeData(
+            data,
+            income_column=self.income_column,
+            weight_column=self.weight_column,
+        )
+        weights = None
+        if self.weight_column is not None:
+            weights = new_rows[self.weight_column].values
+        cache = self.cache.extend(new_rows[self.income_column].values, weights)
+        idf.__dict__["cache"] = cache
+        return idf
+
+    def evaluate(self, specs):
+        """Evaluate several measures in a single call.
+
+        The primitives required by all the measures (sorted values,
+        cumulative sums, logs, powers and the statistics behind relative
+        poverty lines) are computed once and shared.
+
+        Parameters
+        ----------
+        specs : iterable
+            Measures to evaluate, as ``(family, method)`` or
+            ``(family, method, kwargs)`` tuples, e.g.
+            ``[("poverty", "fgt", {"alpha": 2}), ("inequality", "gini")]``.
+
+        Return
+        ------
+        out: DataFrame
+            One row per spec with columns ``family``, ``method``,
+            ``params`` and ``value``.
+
+        """
+        specs = [_parse_spec(spec) for spec in specs]
+        primitives = []
+        for family, method, kwargs in specs:
+            primitives.extend(_spec_primitives(family, method, kwargs))
+        self.cache.warm(dict.fromkeys(primitives))
+
+        rows = []
+        for family, method, kwargs in specs:
+            value = getattr(self, family)(method, **kwargs)
+            params = ", ".join(f"{k}={v!r}" for k, v in sorted(kwargs.items()))
+            rows.append(
+                {
+                    "family": family,
+                    "method": method,
+                    "params": params,
+                    "value": value,
+                }
+            )
+        return pd.DataFrame(
+            rows, columns=["family", "method", "params", "value"]
+        )
+
+    def bootstrap(
+        self,
+        measure,
+        reps=2000,
+        ci=0.95,
+        interval="percentile",
+        seed=None,
+        batch_size=None,
+        n_jobs=1,
+        **kwargs,
+    ):
+        """Bootstrap standard error and confidence interval of a measure.
+
+        See ``apode.bootstrap.bootstrap``; e.g.
+        ``idf.bootstrap("inequality.gini", reps=2000, n_jobs=-1)``.
+
+        Return
+        ------
+        out: BootstrapResult
+            Estimate, standard error, interval and replicates.
+
+        """
+        from .bootstrap import bootstrap
+
+        return bootstrap(
+            self,
+            measure,
+            reps=reps,
+            ci=ci,
+            interval=interval,
+            seed=seed,
+            batch_size=batch_size,
+            n_jobs=n_jobs,
+            **kwargs,
+        )
+
+    def standard_error(self, measure, **kwargs):
+        """Linearized (influence function) standard error of a measure.
+
+        Cheaper than ``bootstrap``: one pass over the sorted incomes.
+        See ``apode.variance.linearized_se``.
+
+        Parameters
+        ----------
+        measure : str or tuple
+            Measure as ``"family.method"`` (e.g. ``"poverty.fgt"``).
+
+        kwargs :
+            Parameters of the measure.
+
+        Return
+        ------
+        out: float
+            Standard error.
+
+        """
+        from .variance import linearized_se
+
+        return linearized_se(self.cache, measure, **kwargs)
+
+    def groupby(self, by):
+        """Group the data to evaluate the measures on every group.
+
+        The income column is sorted once by (group, income) and the
+        measures are computed on the sorted segment of each group; no
+        ApodeData is built per group.
+
+        Parameters
+        ----------
+        by : str or list
+            Column (or columns) defining the groups.
+
+        Return
+        ------
+        out: ApodeGroupBy
+            Grouped data with the measure accessors. Every measure returns
+            a Series indexed by group, e.g.
+            ``idf.groupby("region").inequality.gini()``.
+
+        """
+        from .groupby import ApodeGroupBy
+
+        return ApodeGroupBy(self, by)
+
+    def concepts(self, columns):
+        """Measure several income columns of the same records at once.
+
+        The columns are extracted as one matrix and sorted column-wise in
+        a single pass; ``income_column`` is not used.
+
+        Parameters
+        ----------
+        columns : list
+            Income columns (income concepts or imputation draws).
+
+        Return
+        ------
+        out: ApodeConcepts
+            Columns with the measure accessors. Every measure returns a
+            Series indexed by column, e.g.
+            ``idf.concepts(["market", "disposable"]).poverty.headcount()``.
+
+        """
+        from .concepts import ApodeConcepts
+
+        return ApodeConcepts(self, columns)
+
+    def panel(self, period_column):
+        """Split the data into one income distribution per period.
+
+        Parameters
+        ----------
+        period_column : str
+            Column with the period (survey wave) of each record.
+
+        Return
+        ------
+        out: ApodePanel
+            Periods with the measure accessors. Every measure returns a
+            time series, e.g. ``idf.panel("year").poverty.headcount()``.
+            New periods are added with ``ApodePanel.append``.
+
+        """
+        from .panel import ApodePanel
+
+        return ApodePanel.from_data(self, period_column)
+
     def __getattr__(self, aname):
         """Apply DataFrame method."""
         return getattr(self.data, aname)
@@ -94,11 +512,16 @@ class ApodeData:
     def __getitem__(self, slice):
         """Apply Slice method."""
         data = self.data.__getitem__(slice)
-        if self.income_column not in data.columns:
-            raise AttributeError(
-                f"Cannot take {self.income_column} from ApodeData object"
-            )
-        return ApodeData(data, income_column=self.income_column)
+        for column in (self.income_column, self.weight_column):
+            if column is not None and column not in data.columns:
+                raise AttributeError(
+                    f"Cannot take {column} from ApodeData object"
+                )
+        return ApodeData(
+            data,
+            income_column=self.income_column,
+            weight_column=self.weight_column,
+        )
 
     def __repr__(self):
         """Apply Display method."""
@@ -126,12 +549,93 @@ class ApodeData:
         income_column = self.income_column
         if html is True:
             income_column = f"<i>{income_column}</i>"
+        params = f"income_column='{income_column}'"
+        if self.weight_column is not None:
+            params += f", weight_column='{self.weight_column}'"
         rows = f"{self.data.shape[0]} rows"
         columns = f"{self.data.shape[1]} columns"
-        footer = f"ApodeData(income_column='{income_column}') - {rows} x \
+        footer = f"ApodeData({params}) - {rows} x \
             {columns}"
         return footer
 
     def __dir__(self):
         """Allow access to methods and attributes of the dataframe."""
         return super().__dir__() + dir(self.data)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _as_vector(values, dtype=None):
+    """Return a 1-D ndarray over ``values``, copying only if needed."""
+    if not isinstance(values, (np.ndarray, pd.Series)) and hasattr(
+        values, "to_numpy"
+    ):
+        if getattr(values, "null_count", 0):  # pyarrow.Array
+            raise ValueError(
+                f"Found {values.null_count} null values, drop or fill them"
+            )
+        try:
+            values = values.to_numpy(zero_copy_only=True)
+        except TypeError:  # no zero_copy_only argument
+            values = values.to_numpy()
+        except ValueError:  # ArrowInvalid: not contiguous in memory
+            values = values.to_numpy(zero_copy_only=False)
+    values = np.asarray(values)
+    if values.ndim != 1:
+        raise ValueError(f"Expected a 1-D array. Found {values.ndim}-D")
+    if dtype is not None and values.dtype != dtype:
+        values = values.astype(dtype)
+    return np.ascontiguousarray(values)
+
+
+def _accessor(idf, name):
+    """Import and build an accessor of an ApodeData."""
+    module, cls = _ACCESSORS[name]
+    module = importlib.import_module(f".{module}", __package__)
+    return getattr(module, cls)(idf)
+
+
+def _parse_spec(spec):
+    """Check/normalize an evaluate spec."""
+    if len(spec) == 2:
+        family, method = spec
+        kwargs = {}
+    elif len(spec) == 3:
+        family, method, kwargs = spec
+        kwargs = dict(kwargs or {})
+    else:
+        raise ValueError(
+            f"spec must be (family, method[, kwargs]). Found '{spec}'"
+        )
+    if family not in MEASURE_FAMILIES:
+        raise ValueError(
+            f"'family' must be one of {MEASURE_FAMILIES}. Found '{family}'"
+        )
+    return family, method, kwargs
+
+
+def _spec_primitives(family, method, kwargs):
+    """Return the cached primitives required by a measure."""
+    primitives = list(_PRIMITIVES[family].get(method, ("ys",)))
+    if family == "poverty":
+        pline = kwargs.get("pline")
+        if pline is None:
+            primitives.append("median")
+        elif not isinstance(pline, str):
+            pass  # absolute lines, one or an array
+        elif pline == "median":
+            primitives.append("median")
+        elif pline == "mean":
+            primitives.append("mean")
+        elif pline == "quantile":
+            q = kwargs.get("q")
+            if q is not None and 0 <= q <= 1:
+                primitives.append(("quantile", q))
+    elif family == "inequality" and method == "atkinson":
+        alpha = kwargs.get("alpha", 2)
+        if alpha != 1:
+            primitives.append(("power", 1 - alpha))
+    return primitives
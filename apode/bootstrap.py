@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Bootstrap inference for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from statistics import NormalDist
+
+import attr
+
+import numpy as np
+
+from .groupby import GroupSegments, evaluate_segments
+from .profiling import timed
+from .view import split_measure
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+INTERVALS = ("percentile", "bca")
+
+# Resampled values held in memory at a time. Each one costs 40 to 96
+# bytes at the peak of a batch (the int64 index, the resampled incomes,
+# their argsort, the sorted incomes, the resampled and sorted weights and
+# the temporaries of the measure), so a batch takes at most about 100 MB.
+_BATCH_ELEMENTS = 2 ** 20
+
+# Blocks of the delete-a-group jackknife behind the BCa acceleration.
+_JACKKNIFE_GROUPS = 100
+
+# Minimum number of tasks per worker process, so that faster workers
+# pick up the batches left by slower ones.
+_TASKS_PER_WORKER = 4
+
+# Incomes and weights of the worker process, attached to shared memory.
+_SHARED = {}
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class BootstrapResult:
+    """Bootstrap estimate of a measure.
+
+    Attributes
+    ----------
+    measure : str
+        Measure as ``"family.method"``.
+
+    estimate : float
+        Value of the measure on the data.
+
+    se : float
+        Bootstrap standard error.
+
+    low, high : float
+        Confidence interval.
+
+    ci : float
+        Confidence level of the interval.
+
+    interval : str
+        ``"percentile"`` or ``"bca"``.
+
+    replicates : ndarray
+        Value of the measure on every resample.
+
+    """
+
+    measure = attr.ib()
+    estimate = attr.ib()
+    se = attr.ib()
+    low = attr.ib()
+    high = attr.ib()
+    ci = attr.ib()
+    interval = attr.ib()
+    replicates = attr.ib()
+
+    def __repr__(self):
+        """Apply Display method."""
+        return (
+            f"BootstrapResult({self.measure}={self.estimate:.6g}, "
+            f"se={self.se:.6g}, {self.interval} {self.ci:.0%} "
+            f"ci=({self.low:.6g}, {self.high:.6g}), "
+            f"reps={len(self.replicates)})"
+        )
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def bootstrap(
+    idf,
+    measure,
+    reps=2000,
+    ci=0.95,
+    interval="percentile",
+    seed=None,
+    batch_size=None,
+    n_jobs=1,
+    **kwargs,
+):
+    """Bootstrap standard error and confidence interval of a measure.
+
+    Records (with their weights, if any) are resampled with replacement.
+    The resamples are drawn as 2-D index matrices, ``batch_size`` at a
+    time, and every batch is sorted once along its rows and evaluated as
+    one set of segments: decomposable measures (see
+    ``apode.groupby``) are computed for the whole batch with segmented
+    reductions, the rest on a view of each sorted resample. No ApodeData
+    is built per resample.
+
+    With ``n_jobs > 1`` the batches are spread over worker processes.
+    The incomes and weights are copied once to a shared memory block
+    that every worker attaches to (the data is never pickled), and the
+    batches are handed out as workers become idle. Every resample draws
+    from its own random stream spawned from ``seed``, so the replicates
+    do not depend on ``batch_size``, ``n_jobs`` or the scheduling.
+
+    Parameters
+    ----------
+    idf : ApodeData
+        Data to resample.
+
+    measure : str or tuple
+        Measure as ``"family.method"`` (e.g. ``"inequality.gini"``) or
+        ``(family, method)``.
+
+    reps : int, optional(default=2000)
+        Number of resamples.
+
+    ci : float, optional(default=0.95)
+        Confidence level of the interval.
+
+    interval : str, optional(default="percentile")
+        ``"percentile"`` or ``"bca"`` (bias corrected and accelerated,
+        with the acceleration estimated by a delete-a-group jackknife).
+
+    seed : int, optional(default=None)
+        Seed of the resampling.
+
+    batch_size : int, optional(default=None)
+        Resamples evaluated at once. By default as many as fit in about
+        100 MB (and, with several workers, at least four batches per
+        worker).
+
+    n_jobs : int, optional(default=1)
+        Worker processes; ``-1`` uses every CPU.
+
+    kwargs :
+        Parameters of the measure.
+
+    Return
+    ------
+    out: BootstrapResult
+        Estimate, standard error, interval and replicates.
+
+    """
+    family, method = split_measure(measure)
+    if reps < 2:
+        raise ValueError(f"'reps' must be >= 2. Found '{reps}'")
+    if not 0 < ci < 1:
+        raise ValueError(f"'ci' must be in (0, 1). Found '{ci}'")
+    if interval not in INTERVALS:
+        raise ValueError(
+            f"'interval' must be one of {INTERVALS}. Found '{interval}'"
+        )
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError(f"'n_jobs' must be >= 1 or -1. Found '{n_jobs}'")
+    cache = idf.cache
+    y, w, n = cache.y, cache.weights, cache.n
+    estimate = getattr(getattr(idf, family), method)(**kwargs)
+    if batch_size is None:
+        batch_size = max(1, _BATCH_ELEMENTS // max(n, 1))
+        if n_jobs > 1:
+            tasks = n_jobs * _TASKS_PER_WORKER
+            batch_size = min(batch_size, -(-reps // tasks))
+
+    *streams, jack_stream = np.random.SeedSequence(seed).spawn(reps + 1)
+    if n_jobs == 1:
+        replicates = np.concatenate(
+            [
+                _evaluate_streams(y, w, batch, family, method, kwargs)
+                for batch in _batches(streams, batch_size)
+            ]
+        )
+    else:
+        replicates = _parallel_replicates(
+            y, w, streams, batch_size, n_jobs, family, method, kwargs
+        )
+
+    alphas = np.array([(1 - ci) / 2, (1 + ci) / 2])
+    if interval == "bca":
+        rng = np.random.default_rng(jack_stream)
+        a = _acceleration(y, w, rng, batch_size, family, method, kwargs)
+        alphas = _bca_levels(replicates, estimate, a, alphas)
+    low, high = np.quantile(replicates, alphas)
+    return BootstrapResult(
+        measure=f"{family}.{method}",
+        estimate=estimate,
+        se=np.std(replicates, ddof=1),
+        low=low,
+        high=high,
+        ci=ci,
+        interval=interval,
+        replicates=replicates,
+    )
+
+
+def _evaluate_matrix(y, w, index, family, method, kwargs):
+    """Evaluate a measure on every row of an index matrix."""
+    rows, size = index.shape
+    values = y[index]
+    with timed("sort"):
+        order = np.argsort(values, axis=1, kind="stable")
+    ys = np.take_along_axis(values, order, axis=1).ravel()
+    ws = None
+    if w is not None:
+        ws = np.take_along_axis(w[index], order, axis=1).ravel()
+    segments = GroupSegments(np.arange(rows), ys, ws, np.full(rows, size))
+    return np.asarray(
+        evaluate_segments(segments, family, method, **kwargs), dtype=float
+    )
+
+
+def _evaluate_streams(y, w, streams, family, method, kwargs):
+    """Evaluate a measure on one resample per random stream."""
+    n = len(y)
+    index = np.empty((len(streams), n), dtype=np.int64)
+    for row, stream in enumerate(streams):
+        index[row] = np.random.default_rng(stream).integers(0, n, size=n)
+    return _evaluate_matrix(y, w, index, family, method, kwargs)
+
+
+def _parallel_replicates(
+    y, w, streams, batch_size, n_jobs, family, method, kwargs
+):
+    """Evaluate the resamples on worker processes sharing the data."""
+    arrays = (y,) if w is None else (y, w)
+    shape = (len(arrays), len(y))
+    shm = shared_memory.SharedMemory(
+        create=True, size=max(1, shape[0] * shape[1] * 8)
+    )
+    try:
+        buffer = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        for row, values in enumerate(arrays):
+            buffer[row] = values
+        del buffer
+        replicates = np.empty(len(streams))
+        with ProcessPoolExecutor(
+            n_jobs, initializer=_attach, initargs=(shm.name, shape)
+        ) as pool:
+            futures = {
+                pool.submit(_evaluate_shared, batch, family, method, kwargs): i
+                for i, batch in enumerate(_batches(streams, batch_size))
+            }
+            for future in as_completed(futures):
+                start = futures[future] * batch_size
+                stop = start + batch_size
+                replicates[start:stop] = future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+    return replicates
+
+
+def _attach(name, shape):
+    """Attach a worker process to the shared incomes and weights."""
+    shm = shared_memory.SharedMemory(name=name)
+    buffer = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    _SHARED["shm"] = shm
+    _SHARED["y"] = buffer[0]
+    _SHARED["w"] = buffer[1] if shape[0] > 1 else None
+
+
+def _evaluate_shared(streams, family, method, kwargs):
+    """Evaluate a batch of resamples on the shared data of the worker."""
+    return _evaluate_streams(
+        _SHARED["y"], _SHARED["w"], streams, family, method, kwargs
+    )
+
+
+def _evaluate_subsets(y, w, subsets, family, method, kwargs):
+    """Evaluate a measure on every subset of record indices."""
+    counts = np.array([len(subset) for subset in subsets])
+    index = np.concatenate(subsets)
+    codes = np.repeat(np.arange(len(subsets)), counts)
+    ws = None if w is None else w[index]
+    segments = GroupSegments.from_codes(
+        np.arange(len(subsets)), codes, y[index], ws
+    )
+    return np.asarray(
+        evaluate_segments(segments, family, method, **kwargs), dtype=float
+    )
+
+
+def _acceleration(y, w, rng, batch_size, family, method, kwargs):
+    """Estimate the BCa acceleration with a delete-a-group jackknife.
+
+    With up to ``_JACKKNIFE_GROUPS`` records it is the usual delete-one
+    jackknife.
+    """
+    n = len(y)
+    groups = min(n, _JACKKNIFE_GROUPS)
+    blocks = np.array_split(rng.permutation(n), groups)
+    keep = np.ones(n, dtype=bool)
+    subsets = []
+    for block in blocks:
+        keep[block] = False
+        subsets.append(np.flatnonzero(keep))
+        keep[block] = True
+    jack = np.concatenate(
+        [
+            _evaluate_subsets(y, w, batch, family, method, kwargs)
+            for batch in _batches(subsets, batch_size)
+        ]
+    )
+    d = np.mean(jack) - jack
+    den = 6 * np.sum(d * d) ** 1.5
+    return np.sum(d ** 3) / den if den > 0 else 0.0
+
+
+def _batches(items, size):
+    """Split a list in batches of ``size`` items."""
+    return [items[i : i + size] for i in range(0, len(items), size)]  # noqa
+
+
+def _bca_levels(replicates, estimate, a, alphas):
+    """Adjust the percentile levels for bias and acceleration."""
+    normal = NormalDist()
+    reps = len(replicates)
+    prop = np.mean(replicates < estimate)
+    prop = min(max(prop, 1 / (2 * reps)), 1 - 1 / (2 * reps))
+    z0 = normal.inv_cdf(prop)
+    levels = []
+    for alpha in alphas:
+        z = z0 + normal.inv_cdf(alpha)
+        levels.append(normal.cdf(z0 + z / (1 - a * z)))
+    return np.array(levels)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Income cache for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import attr
+
+import numpy as np
+
+from .precision import fcumsum, fsum, narrow, searchsorted
+from .profiling import count_cache, timed
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class IncomeCache:
+    """Memoized primitives of an income distribution.
+
+    Every primitive (sorted values, argsort, cumulative sums, mean,
+    quantiles) is computed lazily on first access and stored, so all
+    the measures of an ApodeData object share a single sort of the
+    income column.
+
+    float32 incomes are kept (and sorted) as float32, halving the memory
+    of the income arrays; their sums and prefix sums are accumulated in
+    float64 with compensation (see ``apode.precision``).
+
+    With sampling weights every record stands for ``w`` persons of the
+    population. Person-level primitives (mean, quantiles, prefix sums)
+    are defined so that integer weights give the same results as
+    repeating each record ``w`` times, without building that array.
+
+    Parameters
+    ----------
+    y : array_like
+        Income values in their original order.
+
+    weights : array_like, optional(default=None)
+        Sampling weights of each record, in the same order as ``y``.
+
+    Attributes
+    ----------
+    y, weights : see Parameters
+
+    """
+
+    y = attr.ib(converter=np.asarray)
+    weights = attr.ib(
+        default=None, converter=attr.converters.optional(np.asarray)
+    )
+    _store = attr.ib(init=False, factory=dict)
+
+    @classmethod
+    def from_sorted(cls, ys, weights=None):
+        """Build a cache from income values already sorted.
+
+        The arrays are used as they are (no copy) and no sort is
+        performed; ``weights`` must follow the order of ``ys``.
+        """
+        cache = cls(ys, weights)
+        cache._store["ys"] = cache.y
+        if weights is not None:
+            cache._store["ws"] = cache.weights
+        return cache
+
+    def extend(self, y, weights=None):
+        """Build the cache of these records followed by new ones.
+
+        The new records are sorted on their own (``O(k log k)``) and
+        merged into the stored sorted values, argsort, per record arrays
+        and prefix sums in ``O(n + k)``; nothing is re-sorted. Primitives
+        that change with every insertion (ranks, quantiles) are left to
+        be recomputed lazily.
+
+        Parameters
+        ----------
+        y : array_like
+            Income values of the new records.
+
+        weights : array_like, optional(default=None)
+            Sampling weights of the new records; required if, and only
+            if, the cache is weighted.
+
+        Return
+        ------
+        out: IncomeCache
+            Cache of the ``n + k`` records, in their original order.
+
+        """
+        y = np.asarray(y)
+        if (weights is not None) != self.weighted:
+            raise ValueError(
+                "New records must have weights if and only if the cache "
+                "is weighted"
+            )
+        new = IncomeCache(y, weights)
+        all_weights = None
+        if self.weighted:
+            all_weights = np.concatenate((self.weights, new.weights))
+        cache = IncomeCache(np.concatenate((self.y, new.y)), all_weights)
+        if "ys" not in self._store:
+            return cache
+
+        n, k = self.n, new.n
+        new_ys = new.ys
+        # old records go first among equal values, as in a stable sort
+        pos = np.searchsorted(self.ys, new_ys, side="right")
+        new_idx = pos + np.arange(k)
+        taken = np.searchsorted(pos, np.arange(n), side="right")
+        old_idx = np.arange(n) + taken
+
+        def gather(old, fresh):
+            merged = np.empty(n + k, dtype=np.result_type(old, fresh))
+            merged[old_idx] = old
+            merged[new_idx] = fresh
+            return merged
+
+        def accumulate(old, fresh):
+            extra = np.concatenate(([0.0], fcumsum(fresh)))
+            merged = np.empty(n + k + 1, dtype=float)
+            merged[0] = 0.0
+            merged[old_idx + 1] = old[1:] + extra[taken]
+            merged[new_idx + 1] = old[pos] + extra[1:]
+            return merged
+
+        store = cache._store
+        store["ys"] = gather(self.ys, new_ys)
+        if self.weighted:
+            store["ws"] = gather(self.ws, new.ws)
+        if "order" in self._store or self.weighted:
+            store["order"] = gather(self.order, n + new.order)
+        for key, old in self._store.items():
+            if key == "logys":
+                store[key] = gather(old, new.logys)
+            elif isinstance(key, tuple) and key[0] == "power":
+                store[key] = gather(old, new.power(key[1]))
+            elif isinstance(key, tuple) and key[0] == "prefix":
+                if key[1] != "rank":
+                    store[key] = accumulate(old, np.diff(new.prefix(key[1])))
+            elif key == "cumsum" and not self.weighted:
+                old = np.concatenate(([0.0], old))
+                store[key] = accumulate(old, new_ys)[1:]
+            elif key in ("total", "population"):
+                store[key] = old + getattr(new, key)
+        return cache
+
+    def _get(self, key, func):
+        """Return a stored primitive, computing it on first access."""
+        try:
+            value = self._store[key]
+        except KeyError:
+            value = func()
+            self._store[key] = value
+            count_cache(False, value)
+            return value
+        count_cache(True)
+        return value
+
+    def __repr__(self):
+        """Apply Display method."""
+        keys = ", ".join(sorted(str(k) for k in self._store))
+        return f"IncomeCache(n={self.n}, cached=[{keys}])"
+
+    @property
+    def n(self):
+        """Number of records."""
+        return len(self.y)
+
+    @property
+    def weighted(self):
+        """Whether the records carry sampling weights."""
+        return self.weights is not None
+
+    @property
+    def population(self):
+        """Population size, the sum of the weights if weighted."""
+        if not self.weighted:
+            return self.n
+        return self._get("population", lambda: fsum(self.weights))
+
+    @property
+    def ys(self):
+        """Income values sorted in ascending order."""
+        return self._get("ys", self._sort)
+
+    @property
+    def ws(self):
+        """Weights sorted by income, None if not weighted."""
+        if not self.weighted:
+            return None
+        return self._get("ws", lambda: self.weights[self.order])
+
+    @property
+    def order(self):
+        """Permutation that sorts the income values (stable argsort)."""
+        return self._get("order", self._argsort)
+
+    @property
+    def ranks(self):
+        """Person rank (0-based) at the middle of each sorted record.
+
+        Without weights it is ``arange(n)``. Sums of a linear function
+        of the rank over the persons of a record equal the weight times
+        the function evaluated at this rank.
+        """
+        if not self.weighted:
+            return np.arange(self.n)
+        return self._get(
+            "ranks", lambda: self.prefix(0)[:-1] + (self.ws - 1) / 2
+        )
+
+    @property
+    def cumsum(self):
+        """Cumulative sum of the sorted (weighted) income values."""
+        if self.weighted:
+            return self._get("cumsum", lambda: self.prefix(1)[1:])
+        return self._get("cumsum", lambda: fcumsum(self.ys))
+
+    @property
+    def total(self):
+        """Sum of the sorted (weighted) income values."""
+        if self.weighted:
+            return self._get("total", lambda: fsum(self.ws * self.ys))
+        return self._get("total", lambda: fsum(self.ys))
+
+    @property
+    def logys(self):
+        """Natural logarithm of the sorted income values."""
+        return self._get("logys", lambda: np.log(self.ys))
+
+    @property
+    def mean(self):
+        """Mean of the income values, accumulated in sorted order."""
+        if self.weighted:
+            return self._get("mean", lambda: self.total / self.population)
+        return self._get("mean", lambda: self._mean())
+
+    @property
+    def median(self):
+        """Median of the income values."""
+        if self.weighted:
+            return self.quantile(0.5)
+        return self._get("median", lambda: np.median(self.ys))
+
+    def quantile(self, q):
+        """Quantile ``q`` of the income values."""
+        if self.weighted:
+            return self._get(("quantile", q), lambda: self._wquantile(q))
+        return self._get(("quantile", q), lambda: np.quantile(self.ys, q=q))
+
+    def power(self, exponent):
+        """Sorted income values raised to ``exponent``."""
+        return self._get(
+            ("power", exponent), lambda: np.power(self.ys, exponent)
+        )
+
+    def prefix(self, kind):
+        """Prefix sums of the sorted income values, with a leading zero.
+
+        ``prefix(kind)[k]`` is the sum over the ``k`` lowest records,
+        multiplied by their weights if weighted.
+
+        Parameters
+        ----------
+        kind : float or str
+            A number ``e`` accumulates ``ys ** e`` (``prefix(0)`` counts
+            persons), ``"log"`` accumulates ``log(ys)`` and ``"rank"``
+            accumulates ``ranks * ys``.
+
+        """
+        return self._get(("prefix", kind), lambda: self._prefix(kind))
+
+    def lorenz(self, persons):
+        """Total income of the poorest ``persons`` of the population."""
+        return np.interp(persons, self.prefix(0), self.prefix(1))
+
+    def person(self, j):
+        """Income of the person with 0-based rank ``j``."""
+        if not self.weighted:
+            return self.ys[j]
+        idx = np.searchsorted(self.prefix(0)[1:], j, side="right")
+        return self.ys[np.minimum(idx, self.n - 1)]
+
+    def count_below(self, pline):
+        """Return the number of records strictly below ``pline``."""
+        return int(searchsorted(self.ys, pline, side="left"))
+
+    def count_below_many(self, plines):
+        """Return the number of records strictly below each line."""
+        return searchsorted(self.ys, plines, side="left")
+
+    def warm(self, names):
+        """Compute the named primitives ahead of time.
+
+        Parameters
+        ----------
+        names : iterable
+            Primitive names (``"ys"``, ``"cumsum"``, ``"mean"``...) or
+            ``(name, argument)`` tuples for the parametrized primitives
+            ``quantile``, ``power`` and ``prefix``.
+
+        """
+        for name in names:
+            if isinstance(name, tuple):
+                name, arg = name
+                getattr(self, name)(arg)
+            else:
+                getattr(self, name)
+
+    def preload(self, primitives):
+        """Store primitives computed elsewhere (e.g. read from disk).
+
+        Parameters
+        ----------
+        primitives : dict
+            Values by primitive key, ``"ys"``, ``"order"``, ``"ws"`` or
+            ``("prefix", kind)``... They must correspond to ``y`` and
+            ``weights``; they are not checked.
+
+        """
+        self._store.update(primitives)
+
+    def _sort(self):
+        if self.weighted or "order" in self._store:
+            return self.y[self.order]
+        with timed("sort"):
+            return np.sort(self.y)
+
+    def _argsort(self):
+        with timed("sort"):
+            return np.argsort(self.y, kind="mergesort")
+
+    def _prefix(self, kind):
+        if kind == 0 and not self.weighted:
+            return np.arange(self.n + 1, dtype=float)
+        if kind == 0:
+            values = self.ws
+        elif kind == 1:
+            values = self.ys
+        elif kind == "log":
+            values = self.logys
+        elif kind == "rank":
+            values = self.ranks * self.ys
+        else:
+            values = self.power(kind)
+        if self.weighted and kind != 0:
+            values = self.ws * values
+        return np.concatenate(([0.0], fcumsum(values)))
+
+    def _mean(self):
+        if self.n and narrow(self.ys):
+            return fsum(self.ys) / self.n
+        return np.mean(self.ys)
+
+    def _wquantile(self, q):
+        # same interpolation as np.quantile on the replicated persons
+        h = (self.population - 1) * q
+        lo = np.floor(h)
+        low, high = self.person(lo), self.person(np.ceil(h))
+        return low + (h - lo) * (high - low)
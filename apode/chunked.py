@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Out-of-core evaluation of measures for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import math
+import os
+
+import numpy as np
+
+import pandas as pd
+
+from .basic import _parse_spec
+from .sketch import DEFAULT_K
+from .state import State
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+_READERS = (".csv", ".parquet", ".pq")
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def iter_chunks(path, columns, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+    """Read the columns of a CSV/Parquet file (or directory) in chunks.
+
+    Only ``chunksize`` rows of the requested columns are in memory at a
+    time, so the peak memory is about ``chunksize * len(columns) * 8``
+    bytes whatever the size of the file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        CSV or Parquet file, or a directory whose ``.csv`` / ``.parquet``
+        files are read in name order.
+
+    columns : list
+        Columns to read.
+
+    chunksize : int, optional(default=1_000_000)
+        Number of rows per chunk.
+
+    kwargs :
+        Extra arguments of ``pandas.read_csv`` (CSV files only).
+
+    Yields
+    ------
+    DataFrame
+        Chunk with the requested columns.
+
+    """
+    if chunksize <= 0:
+        raise ValueError(f"'chunksize' must be > 0. Found '{chunksize}'")
+    for fname in _list_files(path):
+        if fname.lower().endswith(".csv"):
+            reader = pd.read_csv(
+                fname, usecols=columns, chunksize=chunksize, **kwargs
+            )
+            with reader:
+                yield from reader
+        else:
+            yield from _iter_parquet(fname, columns, chunksize)
+
+
+def read_state(
+    path,
+    income_column,
+    weight_column=None,
+    chunksize=DEFAULT_CHUNKSIZE,
+    exponents=(),
+    plines=(),
+    sketch=None,
+    keep_values=False,
+    **kwargs,
+):
+    """Summarize an income file by streaming it in chunks.
+
+    Parameters
+    ----------
+    path : str or path-like
+        CSV or Parquet file, or a directory of them.
+
+    income_column : str
+        Column with the incomes.
+
+    weight_column : str, optional(default=None)
+        Column with the sampling weights.
+
+    chunksize : int, optional(default=1_000_000)
+        Number of rows in memory at a time.
+
+    exponents, plines, sketch, keep_values :
+        Extra statistics to keep, see ``State.from_array``.
+        ``keep_values=True`` holds every income in memory; the chunk
+        states are merged pairwise, so sorting them costs
+        ``O(N log(N / chunksize))`` rather than ``O(N^2 / chunksize)``.
+
+    kwargs :
+        Extra arguments of ``pandas.read_csv``.
+
+    Return
+    ------
+    out: State
+        Merged state of all the chunks.
+
+    """
+    columns = [income_column]
+    if weight_column is not None:
+        columns.append(weight_column)
+    # states of 1, 2, 4, ... chunks: every row is merged O(log chunks)
+    # times instead of once per later chunk
+    stack = []
+    for chunk in iter_chunks(path, columns, chunksize, **kwargs):
+        weights = None
+        if weight_column is not None:
+            weights = chunk[weight_column].values
+        part = State.from_array(
+            chunk[income_column].values,
+            weights,
+            exponents=exponents,
+            plines=plines,
+            keep_values=keep_values,
+            sketch=sketch,
+        )
+        size = 1
+        while stack and stack[-1][0] == size:
+            size += stack[-1][0]
+            part = stack.pop()[1].merge(part)
+        stack.append((size, part))
+    if not stack:
+        raise ValueError(f"No rows found in '{path}'")
+    state = stack.pop()[1]
+    while stack:
+        state = stack.pop()[1].merge(state)
+    return state
+
+
+def evaluate_file(
+    path,
+    specs,
+    income_column,
+    weight_column=None,
+    chunksize=DEFAULT_CHUNKSIZE,
+    sketch=DEFAULT_K,
+    keep_values=False,
+    **kwargs,
+):
+    """Evaluate several measures on a file larger than memory.
+
+    The file is read once, in chunks, and every measure is evaluated on
+    the merged ``State``. Only the measures that a state computes from
+    its statistics are supported (see ``State``). Poverty measures with
+    relative lines (``None``, ``'median'``, ``'mean'`` or
+    ``'quantile'``) are approximated on a ``QuantileSketch`` built in
+    the same pass. Rank-based measures (Gini, Sen, Thon, Kakwani...)
+    need ``keep_values=True``, which keeps every income in memory and
+    makes all the measures exact.
+
+    Parameters
+    ----------
+    path : str or path-like
+        CSV or Parquet file, or a directory of them.
+
+    specs : iterable
+        Measures, as in ``ApodeData.evaluate``.
+
+    income_column, weight_column, chunksize, kwargs :
+        See ``read_state``.
+
+    sketch : int, optional(default=200)
+        ``k`` of the quantile sketch, used only if a poverty measure has
+        a relative line.
+
+    keep_values : bool, optional(default=False)
+        Keep the sorted incomes to evaluate any measure exactly; memory
+        grows with the file.
+
+    Return
+    ------
+    out: DataFrame
+        One row per spec with columns ``family``, ``method``,
+        ``params`` and ``value``.
+
+    """
+    specs = [_parse_spec(spec) for spec in specs]
+    exponents, plines, relative = set(), set(), False
+    for family, method, params in specs:
+        exponent = _spec_exponent(family, method, params)
+        if exponent is not None:
+            exponents.add(exponent)
+        if family == "poverty":
+            pline = params.get("pline")
+            if pline is None or isinstance(pline, str):
+                relative = True
+            else:
+                plines.update(np.ravel(pline))
+    state = read_state(
+        path,
+        income_column,
+        weight_column,
+        chunksize=chunksize,
+        exponents=exponents,
+        plines=plines,
+        sketch=sketch if relative and not keep_values else None,
+        keep_values=keep_values,
+        **kwargs,
+    )
+    rows = []
+    for family, method, params in specs:
+        rows.append(
+            {
+                "family": family,
+                "method": method,
+                "params": ", ".join(
+                    f"{k}={v!r}" for k, v in sorted(params.items())
+                ),
+                "value": state.finalize((family, method), **params),
+            }
+        )
+    return pd.DataFrame(rows, columns=["family", "method", "params", "value"])
+
+
+def _spec_exponent(family, method, params):
+    """Return the power sum required by a measure, if any."""
+    if family == "inequality" and method == "entropy":
+        return params.get("alpha", 0)
+    if family == "inequality" and method == "atkinson":
+        return 1 - params.get("alpha", 2)
+    if family == "welfare" and method == "isoelastic":
+        alpha = params.get("alpha")
+        if alpha is not None and alpha != math.inf:
+            return 1 - alpha
+    return None
+
+
+def _list_files(path):
+    """Return the data files of a path (a file or a directory)."""
+    path = os.fspath(path)
+    if not os.path.isdir(path):
+        return [path]
+    files = [
+        os.path.join(path, fname)
+        for fname in sorted(os.listdir(path))
+        if fname.lower().endswith(_READERS)
+    ]
+    if not files:
+        raise ValueError(f"No CSV or Parquet files found in '{path}'")
+    return files
+
+
+def _iter_parquet(fname, columns, chunksize):
+    """Yield the row batches of a Parquet file as DataFrames."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow")
+    pfile = pq.ParquetFile(fname)
+    for batch in pfile.iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
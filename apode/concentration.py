@@ -21,12 +21,16 @@ import attr
 
 import numpy as np
 
+from .precision import fsum
+from .profiling import instrument
+
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
 
+@instrument("concentration")
 @attr.s(frozen=True)
 class ConcentrationMeasures:
     """Concentration Measures.
@@ -77,17 +81,21 @@ class ConcentrationMeasures:
            American Economic Review, 54 (5), 761.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        w = y / sum(y)
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
+        elif cache.weighted:
+            n = cache.population
+            h = np.sum(cache.ws * np.square(cache.ys / cache.total))
+        else:
+            w = y / fsum(y, sum)
+            h = fsum(np.square(w))
+        if normalized:
+            return (h - 1.0 / n) / (1.0 - 1.0 / n)
         else:
-            h = np.square(w).sum()
-            if normalized:
-                return (h - 1.0 / n) / (1.0 - 1.0 / n)
-            else:
-                return h
+            return h
 
     def rosenbluth(self):
         """Rosenbluth index.
@@ -107,8 +115,7 @@ class ConcentrationMeasures:
            Research. Special Conference Series No. 5. Princeton, 57–89.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        n = self.idf.cache.population
         g = self.idf.inequality.gini()
         return 1 / (n * (1 - g))
 
@@ -131,12 +138,14 @@ class ConcentrationMeasures:
             Index measure.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        n = cache.population
         if k < 0 or k > n:
             raise ValueError(
                 "n must be an positive integer " "smaller than the data size"
             )
+        elif cache.weighted:
+            return (cache.total - cache.lorenz(n - k)) / cache.total
         else:
-            ys = np.sort(y)[::-1]
+            ys = cache.ys[::-1]
             return ys[:k].sum() / ys.sum()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Several income concepts of the same records for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+from functools import cached_property
+
+import attr
+
+import numpy as np
+
+import pandas as pd
+
+from .groupby import GroupSegments, GroupedMeasures, segments_views
+from .profiling import timed
+from .variance import linearized_se
+from .view import split_measure
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class ApodeConcepts:
+    """Several income columns of an ApodeData measured side by side.
+
+    The columns (market, disposable, per capita or equivalized income,
+    imputation draws...) are extracted as one ``(n, p)`` matrix and
+    sorted in one 2-D pass; every column becomes a segment of a
+    ``GroupSegments``, so decomposable measures are computed for all the
+    columns at once with segmented reductions and the rest on a view of
+    each sorted column. Every measure returns a Series indexed by column,
+    e.g. ``idf.concepts(["market", "disposable"]).inequality.gini()``.
+
+    Parameters
+    ----------
+    idf : ApodeData
+        Data with the income columns (and the weights, if any).
+
+    columns : list
+        Income columns to measure.
+
+    """
+
+    idf = attr.ib()
+    columns = attr.ib(converter=list)
+    poverty = attr.ib(init=False)
+    inequality = attr.ib(init=False)
+    polarization = attr.ib(init=False)
+    concentration = attr.ib(init=False)
+    welfare = attr.ib(init=False)
+
+    @columns.validator
+    def _validate_columns(self, name, value):
+        missing = [c for c in value if c not in self.idf.data.columns]
+        if missing:
+            raise ValueError(f"Columns not found in the data: {missing}")
+        if not value:
+            raise ValueError("At least one income column is needed")
+
+    @poverty.default
+    def _poverty_default(self):
+        return GroupedMeasures(self, "poverty")
+
+    @inequality.default
+    def _inequality_default(self):
+        return GroupedMeasures(self, "inequality")
+
+    @polarization.default
+    def _polarization_default(self):
+        return GroupedMeasures(self, "polarization")
+
+    @concentration.default
+    def _concentration_default(self):
+        return GroupedMeasures(self, "concentration")
+
+    @welfare.default
+    def _welfare_default(self):
+        return GroupedMeasures(self, "welfare")
+
+    def __repr__(self):
+        """Apply Display method."""
+        return f"ApodeConcepts(columns={self.columns!r})"
+
+    def __len__(self):
+        """Return the number of income columns."""
+        return len(self.columns)
+
+    @cached_property
+    def segments(self):
+        """Incomes of every column, sorted column-wise in one pass."""
+        idf = self.idf
+        with timed("extract"):
+            matrix = idf.data[self.columns].to_numpy(dtype=float)
+        with timed("sort"):
+            order = np.argsort(matrix, axis=0, kind="stable")
+        ys = np.take_along_axis(matrix, order, axis=0).T.ravel()
+        ws = None
+        if idf.weight_column is not None:
+            weights = idf.data[idf.weight_column].values
+            ws = weights[order].T.ravel()
+        n, p = matrix.shape
+        return GroupSegments(pd.Index(self.columns), ys, ws, np.full(p, n))
+
+    def views(self):
+        """Yield an IncomeView over the sorted incomes of each column."""
+        return segments_views(self.segments)
+
+    def standard_error(self, measure, **kwargs):
+        """Linearized standard error of a measure in every column.
+
+        Parameters
+        ----------
+        measure : str or tuple
+            Measure as ``"family.method"``; see
+            ``apode.variance.linearized_se``.
+
+        kwargs :
+            Parameters of the measure.
+
+        Return
+        ------
+        out: Series
+            Standard error of every column.
+
+        """
+        family, method = split_measure(measure)
+        values = [
+            linearized_se(view.cache, (family, method), **kwargs)
+            for view in self.views()
+        ]
+        return pd.Series(values, index=self.segments.keys, name=method)
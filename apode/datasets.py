@@ -57,7 +57,7 @@ def make_pareto(seed=None, a=5, size=100, c=200, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_uniform(seed=None, size=100, mu=100, nbin=None):
@@ -86,7 +86,7 @@ def make_uniform(seed=None, size=100, mu=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_lognormal(seed=None, size=100, sigma=1.0, nbin=None):
@@ -115,7 +115,7 @@ def make_lognormal(seed=None, size=100, sigma=1.0, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_chisquare(seed=None, size=100, df=5, c=10, nbin=None):
@@ -146,7 +146,7 @@ def make_chisquare(seed=None, size=100, df=5, c=10, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_gamma(seed=None, size=100, shape=1, scale=50.0, nbin=None):
@@ -177,7 +177,7 @@ def make_gamma(seed=None, size=100, shape=1, scale=50.0, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_weibull(seed=None, size=100, a=1.5, c=50, nbin=None):
@@ -208,7 +208,7 @@ def make_weibull(seed=None, size=100, a=1.5, c=50, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_exponential(seed=None, size=100, scale=1, c=50, nbin=None):
@@ -239,7 +239,7 @@ def make_exponential(seed=None, size=100, scale=1, c=50, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_constant(size=100, nbin=None):
@@ -262,7 +262,7 @@ def make_constant(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_linear(size=100, nbin=None):
@@ -285,7 +285,7 @@ def make_linear(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_squared(size=100, nbin=None):
@@ -308,7 +308,7 @@ def make_squared(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_extreme(size=100, nbin=None):
@@ -331,7 +331,7 @@ def make_extreme(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_unimodal(size=100, nbin=None):
@@ -359,7 +359,7 @@ def make_unimodal(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 def make_bimodal(size=100, nbin=None):
@@ -387,7 +387,7 @@ def make_bimodal(size=100, nbin=None):
         return ApodeData(df, income_column="x")
     else:
         df = binning(df, nbin=nbin)
-        return ApodeData(df, income_column="x")
+        return ApodeData(df, income_column="x", weight_column="weight")
 
 
 # generalizar columnanme?
@@ -0,0 +1,642 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Grouped measures for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+from functools import cached_property
+
+import attr
+
+import numpy as np
+
+import pandas as pd
+
+from .cache import IncomeCache
+from .polarization import _ray_alpha
+from .poverty import _get_pline
+from .profiling import measure_call, timed
+from .variance import linearized_se
+from .view import IncomeView, MEASURES, split_measure
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+_DEFAULT_METHODS = {
+    "poverty": "headcount",
+    "inequality": "gini",
+    "polarization": "ray",
+    "concentration": "herfindahl",
+    "welfare": "utilitarian",
+}
+
+
+# =============================================================================
+# SEGMENTS
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class GroupSegments:
+    """Incomes sorted by (group, income), one contiguous segment per group.
+
+    Group statistics are computed with segmented reductions
+    (``np.add.reduceat``) over the whole array, so their cost does not
+    grow with the number of groups.
+
+    Parameters
+    ----------
+    keys : Index
+        Group labels, in the order of the segments.
+
+    ys : ndarray
+        Income values sorted by group and then by income.
+
+    ws : ndarray or None
+        Weights in the order of ``ys``, None if not weighted.
+
+    counts : ndarray
+        Number of records of each group, all of them positive (the
+        segmented reductions have no value for an empty segment).
+
+    """
+
+    keys = attr.ib()
+    ys = attr.ib()
+    ws = attr.ib()
+    counts = attr.ib()
+
+    @counts.validator
+    def _validate_counts(self, name, value):
+        if np.any(np.asarray(value) <= 0):
+            empty = list(self.keys[np.asarray(value) <= 0])
+            raise ValueError(f"Groups without records: {empty}")
+
+    @classmethod
+    def from_codes(cls, keys, codes, y, weights=None):
+        """Sort the incomes by group code and income.
+
+        Records with a negative code (missing group) are dropped.
+        """
+        valid = codes >= 0
+        codes, y = codes[valid], y[valid]
+        with timed("sort"):
+            order = np.lexsort((y, codes))
+        ws = None if weights is None else weights[valid][order]
+        counts = np.bincount(codes, minlength=len(keys))
+        return cls(keys, y[order], ws, counts)
+
+    def __repr__(self):
+        """Apply Display method."""
+        return f"GroupSegments(groups={len(self)}, n={len(self.ys)})"
+
+    def __len__(self):
+        """Return the number of groups."""
+        return len(self.keys)
+
+    @property
+    def weighted(self):
+        """Whether the records carry sampling weights."""
+        return self.ws is not None
+
+    @cached_property
+    def starts(self):
+        """Index of the first record of each group."""
+        return np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+
+    @cached_property
+    def codes(self):
+        """Group number of each sorted record."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    @cached_property
+    def population(self):
+        """Population of each group, the sum of the weights if weighted."""
+        if not self.weighted:
+            return self.counts
+        return self.reduce(self.ws)
+
+    @cached_property
+    def persons(self):
+        """Cumulative population over the sorted records, from zero."""
+        if not self.weighted:
+            return np.arange(len(self.ys) + 1, dtype=float)
+        return np.concatenate(([0.0], np.cumsum(self.ws)))
+
+    @cached_property
+    def ranks(self):
+        """Person rank (0-based) of each record within its group.
+
+        Weighted records take the rank at the middle of their persons,
+        as in ``IncomeCache.ranks``.
+        """
+        first = self.persons[self.starts][self.codes]
+        if not self.weighted:
+            return np.arange(len(self.ys)) - first
+        return self.persons[:-1] + (self.ws - 1) / 2 - first
+
+    @cached_property
+    def mean(self):
+        """Mean income of each group."""
+        return self.wsum(self.ys) / self.population
+
+    @property
+    def median(self):
+        """Median income of each group."""
+        return self.quantile(0.5)
+
+    def quantile(self, q):
+        """Quantile ``q`` of the income of each group.
+
+        Same linear interpolation over the persons of the group as
+        ``IncomeCache.quantile``.
+        """
+        h = (self.population - 1) * q
+        lo = np.floor(h)
+        low, high = self._person(lo), self._person(np.ceil(h))
+        return low + (h - lo) * (high - low)
+
+    def reduce(self, values):
+        """Sum ``values`` over the records of each group."""
+        return np.add.reduceat(values, self.starts)
+
+    def wsum(self, values):
+        """Sum ``values`` over the persons of each group."""
+        if self.weighted:
+            values = self.ws * values
+        return self.reduce(values)
+
+    def before(self, values):
+        """Sum ``values`` over the previous records of the same group."""
+        total = np.concatenate(([0.0], np.cumsum(values)))
+        return total[:-1] - self.expand(total[self.starts])
+
+    def expand(self, values):
+        """Broadcast one value per group to every record of the group."""
+        values = np.asarray(values)
+        if values.ndim == 0:
+            return values
+        return values[self.codes]
+
+    def cache(self, i):
+        """Income cache of the ``i``-th group, without sorting or copying."""
+        s = slice(self.starts[i], self.starts[i] + self.counts[i])
+        ws = None if self.ws is None else self.ws[s]
+        return IncomeCache.from_sorted(self.ys[s], ws)
+
+    def _person(self, j):
+        """Income of the person with rank ``j`` of every group."""
+        last = self.starts + self.counts - 1
+        if not self.weighted:
+            return self.ys[self.starts + j.astype(int)]
+        target = self.persons[self.starts] + j
+        idx = np.searchsorted(self.persons[1:], target, side="right")
+        return self.ys[np.minimum(idx, last)]
+
+
+# =============================================================================
+# GROUPED MEASURES
+# =============================================================================
+
+
+@attr.s(frozen=True)
+class GroupedMeasures:
+    """Measures of one family evaluated on every group.
+
+    ``grouped.inequality.gini()`` (or ``grouped.inequality("gini")``)
+    returns a Series indexed by group. Decomposable measures are
+    computed with segmented reductions over all the groups at once; the
+    rest are evaluated on a view of each group's sorted segment.
+
+    Parameters
+    ----------
+    groupby : ApodeGroupBy or ApodeConcepts
+        Grouped data (anything with sorted ``segments``).
+
+    family : str
+        Measure family (``"poverty"``, ``"inequality"``...).
+
+    """
+
+    groupby = attr.ib()
+    family = attr.ib()
+
+    def __call__(self, method=None, *args, **kwargs):
+        """Return the measure of every group."""
+        method = _DEFAULT_METHODS[self.family] if method is None else method
+        return getattr(self, method)(*args, **kwargs)
+
+    def __getattr__(self, method):
+        """Return a function evaluating ``method`` on every group."""
+        if method.startswith("_") or not hasattr(
+            MEASURES[self.family], method
+        ):
+            raise AttributeError(
+                f"'{self.family}' has no measure named '{method}'"
+            )
+
+        def grouped(*args, **kwargs):
+            return self._evaluate(method, args, kwargs)
+
+        grouped.__name__ = method
+        grouped.__doc__ = getattr(MEASURES[self.family], method).__doc__
+        return grouped
+
+    def _evaluate(self, method, args, kwargs):
+        """Evaluate a measure on every group as a Series."""
+        with measure_call(f"{self.family}.{method}", kwargs):
+            segments = self.groupby.segments
+            values = evaluate_segments(
+                segments, self.family, method, *args, **kwargs
+            )
+        return pd.Series(
+            values, index=segments.keys, name=method, dtype=object
+        ).infer_objects()
+
+
+# =============================================================================
+# GROUPBY
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class ApodeGroupBy:
+    """ApodeData grouped by one or more columns.
+
+    The incomes are sorted once by (group, income); no DataFrame is
+    copied or rebuilt per group.
+
+    Parameters
+    ----------
+    idf : ApodeData
+        Data to group.
+
+    by : str or list
+        Column (or columns) defining the groups. Records with a missing
+        group are dropped.
+
+    """
+
+    idf = attr.ib()
+    by = attr.ib()
+    poverty = attr.ib(init=False)
+    inequality = attr.ib(init=False)
+    polarization = attr.ib(init=False)
+    concentration = attr.ib(init=False)
+    welfare = attr.ib(init=False)
+
+    @poverty.default
+    def _poverty_default(self):
+        return GroupedMeasures(self, "poverty")
+
+    @inequality.default
+    def _inequality_default(self):
+        return GroupedMeasures(self, "inequality")
+
+    @polarization.default
+    def _polarization_default(self):
+        return GroupedMeasures(self, "polarization")
+
+    @concentration.default
+    def _concentration_default(self):
+        return GroupedMeasures(self, "concentration")
+
+    @welfare.default
+    def _welfare_default(self):
+        return GroupedMeasures(self, "welfare")
+
+    def __repr__(self):
+        """Apply Display method."""
+        return f"ApodeGroupBy(by={self.by!r}, groups={len(self)})"
+
+    def __len__(self):
+        """Return the number of groups."""
+        return len(self.segments)
+
+    @cached_property
+    def segments(self):
+        """Incomes of every group, sorted once by (group, income)."""
+        idf = self.idf
+        with timed("extract"):
+            grouped = idf.data.groupby(self.by, sort=True, observed=True)
+            keys = grouped.size().index
+            codes = grouped.ngroup().fillna(-1).values.astype(int)
+            weights = None
+            if idf.weight_column is not None:
+                weights = idf.data[idf.weight_column].values
+            y = idf.data[idf.income_column].values
+        return GroupSegments.from_codes(keys, codes, y, weights)
+
+    def views(self):
+        """Yield an IncomeView over the sorted segment of each group."""
+        return segments_views(self.segments)
+
+    def standard_error(self, measure, **kwargs):
+        """Linearized standard error of a measure in every group.
+
+        Parameters
+        ----------
+        measure : str or tuple
+            Measure as ``"family.method"``; see
+            ``apode.variance.linearized_se``.
+
+        kwargs :
+            Parameters of the measure.
+
+        Return
+        ------
+        out: Series
+            Standard error of every group.
+
+        """
+        family, method = split_measure(measure)
+        values = [
+            linearized_se(view.cache, (family, method), **kwargs)
+            for view in self.views()
+        ]
+        return pd.Series(values, index=self.segments.keys, name=method)
+
+    def fgt_decomposition(self, pline=None, alpha=0, factor=1.0, q=None):
+        """Additive decomposition of the FGT index by group.
+
+        The FGT index of the population is the sum over the groups of
+        their population share times their FGT index, with a common
+        poverty line. Relative lines are computed on the whole data.
+
+        Parameters
+        ----------
+        pline, alpha, factor, q :
+            See ``PovertyMeasures.fgt``. ``pline`` must be a scalar.
+
+        Return
+        ------
+        out: DataFrame
+            One row per group with columns ``population_share``, ``fgt``
+            (index of the group), ``contribution`` (share times index,
+            they add up to the FGT of the population) and ``relative``
+            (contribution over the total).
+
+        """
+        pline = _get_pline(self.idf.cache, pline, factor, q)
+        values = _fgt(self.segments, pline=pline, alpha=alpha)
+        return _decomposition_frame(self.segments, "fgt", values)
+
+    def watts_decomposition(self, pline=None, factor=1.0, q=None):
+        """Additive decomposition of the Watts index by group.
+
+        Same as ``fgt_decomposition`` for the Watts index.
+
+        Parameters
+        ----------
+        pline, factor, q :
+            See ``PovertyMeasures.watts``. ``pline`` must be a scalar.
+
+        Return
+        ------
+        out: DataFrame
+            One row per group with columns ``population_share``,
+            ``watts``, ``contribution`` and ``relative``.
+
+        """
+        pline = _get_pline(self.idf.cache, pline, factor, q)
+        values = _watts(self.segments, pline=pline)
+        return _decomposition_frame(self.segments, "watts", values)
+
+    def entropy_decomposition(self, alpha=0):
+        """Within/between decomposition of the generalized entropy index.
+
+        ``GE(a) = sum_g s_g**a v_g**(1 - a) GE_g(a) + GE_B(a)``, where
+        ``v_g`` and ``s_g`` are the population and income shares of each
+        group and ``GE_B`` is the index of the distribution that gives
+        every person the mean income of their group.
+
+        Parameters
+        ----------
+        alpha: float, optional(default=0)
+            See ``InequalityMeasures.entropy``.
+
+        Return
+        ------
+        out: Series
+            ``within``, ``between`` and ``total`` (their sum).
+
+        """
+        a = alpha
+        segments = self.segments
+        index = _entropy(segments, alpha=a)
+        v = segments.population / np.sum(segments.population)
+        u_g = segments.mean
+        r = u_g / np.sum(v * u_g)
+        s = v * r
+        if a == 0.0:
+            within = np.sum(v * index)
+            between = -np.sum(v * np.log(r))
+        elif a == 1.0:
+            within = np.sum(s * index)
+            between = np.sum(v * r * np.log(r))
+        else:
+            within = np.sum(pow(s, a) * pow(v, 1 - a) * index)
+            between = (1 / (a * (a - 1))) * (np.sum(v * pow(r, a)) - 1)
+        return pd.Series(
+            [within, between, within + between],
+            index=["within", "between", "total"],
+            name="entropy",
+        )
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def segments_views(segments):
+    """Yield an IncomeView over every segment."""
+    for i in range(len(segments)):
+        yield IncomeView(segments.cache(i))
+
+
+def evaluate_segments(segments, family, method, *args, **kwargs):
+    """Evaluate a measure on every segment.
+
+    Measures with a segmented kernel are computed for all the segments
+    at once; the rest are evaluated on a view of each segment.
+
+    Parameters
+    ----------
+    segments : GroupSegments
+        Sorted segments.
+
+    family, method : str
+        Measure to evaluate.
+
+    args, kwargs :
+        Parameters of the measure.
+
+    Return
+    ------
+    out: ndarray or list
+        Value of the measure on every segment.
+
+    """
+    values = None
+    kernel = _SEGMENTED.get((family, method))
+    if kernel is not None:
+        values = kernel(segments, *args, **kwargs)
+    if values is None:
+        values = [
+            getattr(getattr(view, family), method)(*args, **kwargs)
+            for view in segments_views(segments)
+        ]
+    return values
+
+
+# =============================================================================
+# SEGMENTED KERNELS
+# =============================================================================
+
+
+def _decomposition_frame(segments, name, values):
+    """Table of the additive contribution of every group."""
+    share = segments.population / np.sum(segments.population)
+    contribution = share * values
+    total = np.sum(contribution)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = contribution / total
+    return pd.DataFrame(
+        {
+            "population_share": share,
+            name: values,
+            "contribution": contribution,
+            "relative": relative,
+        },
+        index=segments.keys,
+    )
+
+
+def _fgt(segments, pline=None, alpha=0, factor=1.0, q=None):
+    """FGT index of every group."""
+    if alpha < 0:
+        raise ValueError(f"'alpha' must be >= 0. Found '{alpha}'")
+    if np.ndim(pline):
+        return None
+    ys = segments.ys
+    z = segments.expand(_get_pline(segments, pline, factor, q))
+    poor = ys < z
+    if alpha == 0:
+        term = poor.astype(float)
+    else:
+        term = np.power(np.where(poor, (z - ys) / z, 0.0), alpha)
+    return segments.wsum(term) / segments.population
+
+
+def _headcount(segments, pline=None, factor=1.0, q=None):
+    """Headcount index of every group."""
+    return _fgt(segments, pline=pline, alpha=0, factor=factor, q=q)
+
+
+def _gap(segments, pline=None, factor=1.0, q=None):
+    """Poverty gap index of every group."""
+    return _fgt(segments, pline=pline, alpha=1, factor=factor, q=q)
+
+
+def _severity(segments, pline=None, factor=1.0, q=None):
+    """Poverty severity index of every group."""
+    return _fgt(segments, pline=pline, alpha=2, factor=factor, q=q)
+
+
+def _watts(segments, pline=None, factor=1.0, q=None):
+    """Watts index of every group."""
+    if np.ndim(pline):
+        return None
+    ys = segments.ys
+    z = segments.expand(_get_pline(segments, pline, factor, q))
+    poor = ys < z
+    with np.errstate(divide="ignore"):
+        term = np.log(z / np.where(poor, ys, z))
+    return segments.wsum(term) / segments.population
+
+
+def _gini(segments):
+    """Gini coefficient of every group."""
+    n = segments.population
+    u = segments.mean
+    a = segments.wsum((segments.expand(n) - segments.ranks) * segments.ys)
+    return (n + 1) / n - 2 / (n * n * u) * a
+
+
+def _cv(segments):
+    """Coefficient of variation of every group."""
+    u = segments.mean
+    d2 = np.square(segments.ys - segments.expand(u))
+    return np.sqrt(segments.wsum(d2) / segments.population) / u
+
+
+def _entropy(segments, alpha=0):
+    """Generalized entropy index of every group."""
+    a = alpha
+    n = segments.population
+    r = segments.ys / segments.expand(segments.mean)
+    if a == 0.0:
+        return segments.wsum(-np.log(r)) / n
+    elif a == 1.0:
+        return segments.wsum(r * np.log(r)) / n
+    return (1 / (a * (a - 1))) * (segments.wsum(pow(r, a)) / n - 1)
+
+
+def _atkinson(segments, alpha=2):
+    """Atkinson index of every group."""
+    if alpha <= 0:
+        raise ValueError("Alpha must be strictly positive (>0.0)")
+    if alpha == 1:
+        return None
+    with np.errstate(divide="ignore"):
+        power = np.power(segments.ys, 1 - alpha)
+        a1 = segments.wsum(power) / segments.population
+        return 1 - np.power(a1, 1 / (1 - alpha)) / segments.mean
+
+
+def _ray(segments, alpha=1):
+    """Esteban and Ray index of every group."""
+    alphas = _ray_alpha(alpha)
+    if alphas.ndim:
+        return None
+    ys = segments.ys
+    persons = segments.persons[:-1]
+    persons = persons - segments.expand(persons[segments.starts])
+    income = ys if segments.ws is None else segments.ws * ys
+    d = 2 * segments.wsum(ys * persons - segments.before(income))
+    return d * np.power(1 / segments.population, 2 + alphas)
+
+
+def _utilitarian(segments):
+    """Utilitarian welfare of every group."""
+    return segments.mean
+
+
+_SEGMENTED = {
+    ("poverty", "headcount"): _headcount,
+    ("poverty", "gap"): _gap,
+    ("poverty", "severity"): _severity,
+    ("poverty", "fgt"): _fgt,
+    ("poverty", "watts"): _watts,
+    ("inequality", "gini"): _gini,
+    ("inequality", "cv"): _cv,
+    ("inequality", "entropy"): _entropy,
+    ("inequality", "atkinson"): _atkinson,
+    ("polarization", "ray"): _ray,
+    ("welfare", "utilitarian"): _utilitarian,
+}
@@ -21,12 +21,17 @@ import attr
 
 import numpy as np
 
+from .backends import get_backend
+from .precision import fsum
+from .profiling import instrument
+
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
 
+@instrument("inequality")
 @attr.s(frozen=True)
 class InequalityMeasures:
     """Inequality measures for Apode.
@@ -74,12 +79,13 @@ class InequalityMeasures:
             Index measure.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
-        return (max(y) - min(y)) / u
+        ys = cache.ys
+        u = cache.mean
+        return (ys[-1] - ys[0]) / u
 
     def rad(self):
         """Relative average deviation.
@@ -99,12 +105,16 @@ class InequalityMeasures:
            Journal of Economic Theory, 2 (3), pp. 244–263.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
-        return sum(abs(y - u)) / (2 * n * u)
+        u = cache.mean
+        if cache.weighted:
+            n = cache.population
+            return np.sum(cache.ws * abs(cache.ys - u)) / (2 * n * u)
+        return fsum(abs(y - u), sum) / (2 * n * u)
 
     def cv(self):
         """Coefficient of variation.
@@ -122,11 +132,15 @@ class InequalityMeasures:
            Journal of Economic Theory, 2 (3), pp. 244–263.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
+        u = cache.mean
+        if cache.weighted:
+            var = np.sum(cache.ws * np.square(cache.ys - u)) / cache.population
+            return np.sqrt(var) / u
         return np.std(y) / u
 
     def sdlog(self):
@@ -145,12 +159,16 @@ class InequalityMeasures:
            Journal of Economic Theory, 2 (3), pp. 244–263.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
-        return np.sqrt(sum(pow((np.log(u) - np.log(y)), 2)) / n)
+        u = cache.mean
+        if cache.weighted:
+            dev = np.square(np.log(u) - cache.logys)
+            return np.sqrt(np.sum(cache.ws * dev) / cache.population)
+        return np.sqrt(fsum(pow((np.log(u) - np.log(y)), 2), sum) / n)
 
     def ratio(self, alpha):
         """Dispersion Ratio (Kuznets Ratio).
@@ -174,13 +192,19 @@ class InequalityMeasures:
            and inequality. Washington, DC: World Bank.
 
         """
-        y = self.idf.data[self.idf.income_column].values
         if (alpha < 0) or (alpha > 1):
             raise ValueError(f"'alpha' must be in [0,1]. Found '{alpha}'")
-        y = np.sort(y)
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.ys
+        n = cache.n
         if n == 0:
             return 0
+        if cache.weighted:
+            n = cache.population
+            k = np.floor(alpha * n)
+            low = cache.lorenz(k)
+            high = cache.total - cache.lorenz(n - k)
+            return low / high
         k = int(np.floor(alpha * n))
         return np.mean(y[:k]) / np.mean(y[n - k :])  # noqa
 
@@ -201,12 +225,16 @@ class InequalityMeasures:
            Scienze, Lettere ed Arti 73, 1203-1248.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.ys
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
+        u = cache.mean
+        if cache.weighted:
+            n = cache.population
+            a = np.sum(cache.ws * (n - cache.ranks) * y)
+            return (n + 1) / n - 2 / (n * n * u) * a
         ii = np.arange(n)
         a = np.sum(np.dot(n - ii, y))
         g = (n + 1) / (n - 1) - 2 / (n * (n - 1) * u) * a
@@ -229,19 +257,13 @@ class InequalityMeasures:
            July.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
+        cache = self.idf.cache
+        n = cache.n
         if n == 0:
             return 0
-        f = 1.0 / (n * np.mean(y))
-        pi = np.arange(n - 1) / n
-        pi[0] = 1 / n
-        qi = f * np.cumsum(y[:-1])
-        p_q = pi - qi
-        pi[0] = 0
-        # print(np.sum(np.dot(1 - pi, p_q)) * 6 / n)
-        return np.sum(np.dot(1 - pi, p_q)) * 6 / n
+        if cache.weighted:
+            return _merhan_weighted(cache)
+        return get_backend().merhan(cache.cumsum, n, cache.mean)
 
     def piesch(self):
         """Piesch Coefficient.
@@ -260,18 +282,13 @@ class InequalityMeasures:
            (Paul Siebeck), Tübingen.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
+        cache = self.idf.cache
+        n = cache.n
         if n == 0:
             return 0
-        f = 1.0 / (n * np.mean(y))
-        pi = np.arange(n - 1) / n
-        pi[0] = 1 / n
-        qi = f * np.cumsum(y[:-1])
-        p_q = pi - qi
-        pi[0] = 1
-        return np.sum(np.dot(pi, p_q)) * 3 / n
+        if cache.weighted:
+            return _piesch_weighted(cache)
+        return get_backend().piesch(cache.cumsum, n, cache.mean)
 
     def bonferroni(self):
         """Bonferroni Coefficient.
@@ -289,17 +306,13 @@ class InequalityMeasures:
            Seeber, Firenze.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
+        cache = self.idf.cache
+        n = cache.n
         if n == 0:
             return 0
-        ii = np.arange(n - 1)
-        ii[0] = 1
-        x = np.cumsum(y[:-1])
-        s = np.sum(x / ii)
-        u = (x[-1] + y[-1]) / n
-        return 1 - (1 / ((n - 1) * u)) * s
+        if cache.weighted:
+            return _bonferroni_weighted(cache)
+        return get_backend().bonferroni(cache.cumsum, n)
 
     def kolm(self, alpha):
         """Kolm Coefficient.
@@ -321,13 +334,17 @@ class InequalityMeasures:
            Economic Theory.
 
         """
-        y = self.idf.data[self.idf.income_column].values
         if alpha <= 0:
             raise ValueError("Alpha must be strictly positive (>0.0)")
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
+        u = cache.mean
+        if cache.weighted:
+            su = np.sum(cache.ws * np.exp(alpha * (u - cache.ys)))
+            return (1 / alpha) * np.log(su / cache.population)
         return (1 / alpha) * (
             np.log((1.0 / n) * np.sum(np.exp(alpha * (u - y))))
         )
@@ -350,16 +367,25 @@ class InequalityMeasures:
 
         """
         a = alpha
-        y = self.idf.data[self.idf.income_column].values
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
-        u = np.mean(y)
+        u = cache.mean
+        if cache.weighted:
+            ws, ys, n = cache.ws, cache.ys, cache.population
+            if a == 0.0:
+                return np.sum(ws * np.log(u / ys)) / n
+            elif a == 1.0:
+                return np.sum(ws * (ys / u) * np.log(ys / u)) / n
+            su = np.sum(ws * pow(ys / u, a)) / n
+            return (1 / (a * (a - 1))) * (su - 1)
         if a == 0.0:
-            return np.sum(np.log(u / y)) / n
+            return fsum(np.log(u / y)) / n
         elif a == 1.0:
-            return np.sum((y / u) * np.log(y / u)) / n
-        return (1 / (a * (a - 1))) * (np.sum(pow(y / u, a)) / n - 1)
+            return fsum((y / u) * np.log(y / u)) / n
+        return (1 / (a * (a - 1))) * (fsum(pow(y / u, a)) / n - 1)
 
     def atkinson(self, alpha=2):
         """Atkinson index.
@@ -382,18 +408,109 @@ class InequalityMeasures:
            Journal of Economic Theory, 2 (3), pp. 244–263.
 
         """
-        y = self.idf.data[self.idf.income_column].values
         if alpha <= 0:
             raise ValueError("Alpha must be strictly positive (>0.0)")
-        n = len(y)
+        cache = self.idf.cache
+        y = cache.y
+        n = cache.n
         if n == 0:
             return 0
+        if cache.weighted:
+            ws = cache.ws
+            if alpha == 1:
+                nz = cache.ys != 0
+                w_nz = ws[nz]
+                h = np.sum(w_nz * cache.logys[nz]) / np.sum(w_nz)
+                u_nz = np.sum(w_nz * cache.ys[nz]) / np.sum(w_nz)
+                return 1 - np.exp(h) / u_nz
+            with np.errstate(divide="ignore"):
+                a1 = np.sum(ws * cache.power(1 - alpha)) / cache.population
+                return 1 - np.power(a1, 1 / (1 - alpha)) / cache.mean
         if alpha == 1:
             y_nz = y[y != 0]
             ylog = np.log(y_nz)
-            h = np.mean(ylog)
-            return 1 - np.exp(h) / np.mean(y_nz)
+            h = fsum(ylog) / len(ylog)
+            return 1 - np.exp(h) / (fsum(y_nz) / len(y_nz))
         else:
             with np.errstate(divide="ignore"):
-                a1 = np.sum(np.power(y, 1 - alpha)) / n
-                return 1 - np.power(a1, 1 / (1 - alpha)) / np.mean(y)
+                a1 = fsum(cache.power(1 - alpha)) / n
+                return 1 - np.power(a1, 1 / (1 - alpha)) / cache.mean
+
+
+def _block_sums(w):
+    """Return the sums of t**0, t**1 and t**2 for t = 0, ..., w - 1."""
+    return w, w * (w - 1) / 2, (w - 1) * w * (2 * w - 1) / 6
+
+
+def _lorenz_blocks(cache):
+    """Per record terms of the person level Lorenz sums.
+
+    Inside a record of weight w the persons have ranks j = a + t for
+    t = 0, ..., w - 1 and cumulative income C_j = b + (t + 1) * y, so
+    p_j = j / n and p_j - q_j = j / n - C_j / total are linear in t.
+    """
+    n, total = cache.population, cache.total
+    a = cache.prefix(0)[:-1]
+    b = cache.prefix(1)[:-1]
+    ys = cache.ys
+    # p - q = d0 + d1 * t
+    d0 = a / n - (b + ys) / total
+    d1 = 1 / n - ys / total
+    return a, d0, d1, _block_sums(cache.ws)
+
+
+def _merhan_weighted(cache):
+    """Merhan index as if every record were repeated weight times."""
+    n = cache.population
+    a, d0, d1, (s0, s1, s2) = _lorenz_blocks(cache)
+    # (1 - p) * (p - q) with 1 - p = c0 - t / n
+    c0 = 1 - a / n
+    su = np.sum(c0 * d0 * s0 + (c0 * d1 - d0 / n) * s1 - d1 / n * s2)
+    # first person uses p = 1 / n and the last one is left out
+    return (su + 1 / n + 1 / (n * n)) * 6 / n
+
+
+def _piesch_weighted(cache):
+    """Piesch index as if every record were repeated weight times."""
+    n, total = cache.population, cache.total
+    a, d0, d1, (s0, s1, s2) = _lorenz_blocks(cache)
+    # p * (p - q) with p = a / n + t / n
+    c0 = a / n
+    su = np.sum(c0 * d0 * s0 + (c0 * d1 + d0 / n) * s1 + d1 / n * s2)
+    # first person uses weight 1 and p = 1 / n, the last one is left out
+    first = 1 / n - cache.ys[0] / total
+    return (su + first + (n - 1) / (n * n)) * 3 / n
+
+
+def _bonferroni_weighted(cache):
+    """Bonferroni index as if every record were repeated weight times."""
+    n, total = cache.population, cache.total
+    ys, ws = cache.ys, cache.ws
+    a = cache.prefix(0)[:-1]
+    b = cache.prefix(1)[:-1]
+    # sum over the persons j >= 1 of C_j / j, with C_j = b - a * y + y + j * y
+    start = np.maximum(a, 1)
+    count = a + ws - start
+    harmonic = _harmonic(a + ws - 1) - _harmonic(start - 1)
+    su = np.sum(ys * count + (b - a * ys + ys) * harmonic)
+    # first person divides by 1 and the last one is left out
+    s = ys[0] + su - total / (n - 1)
+    u = total / n
+    return 1 - (1 / ((n - 1) * u)) * s
+
+
+def _harmonic(x):
+    """Harmonic number H(x) = digamma(x + 1) + euler_gamma."""
+    x = np.asarray(x, dtype=float) + 1
+    shift = np.zeros_like(x)
+    while np.any(x < 6):
+        small = x < 6
+        shift[small] -= 1 / x[small]
+        x = np.where(small, x + 1, x)
+    inv2 = 1 / (x * x)
+    psi = (
+        np.log(x)
+        - 0.5 / x
+        - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 * (1 / 252 - inv2 / 240)))
+    )
+    return psi + shift + np.euler_gamma
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Multi-period income distributions for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import attr
+
+import numpy as np
+
+import pandas as pd
+
+from .cache import IncomeCache
+from .groupby import GroupSegments, GroupedMeasures, evaluate_segments
+from .profiling import measure_call
+from .view import IncomeView
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _as_caches(distributions):
+    """Return the income cache of every period."""
+    return {
+        period: dist if isinstance(dist, IncomeCache) else dist.cache
+        for period, dist in dict(distributions).items()
+    }
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True)
+class PanelMeasures(GroupedMeasures):
+    """Measures of one family evaluated on every period of a panel.
+
+    Values already computed for a period are taken from the results of
+    the panel; the remaining periods are evaluated together in one
+    segmented pass.
+
+    Parameters
+    ----------
+    groupby : ApodePanel
+        Panel of income distributions.
+
+    family : str
+        Measure family (``"poverty"``, ``"inequality"``...).
+
+    """
+
+    def _evaluate(self, method, args, kwargs):
+        """Evaluate a measure on every period as a Series."""
+        panel = self.groupby
+        key = (self.family, method, args, tuple(sorted(kwargs.items())))
+        try:
+            known = panel.results.setdefault(key, {})
+        except TypeError:  # unhashable parameters, e.g. arrays
+            known = {}
+        missing = [p for p in panel.periods if p not in known]
+        if missing:
+            with measure_call(f"{self.family}.{method}", kwargs):
+                segments = panel.segments(missing)
+                values = evaluate_segments(
+                    segments, self.family, method, *args, **kwargs
+                )
+            known.update(zip(missing, values))
+        values = [known[p] for p in panel.periods]
+        return pd.Series(
+            values, index=pd.Index(panel.periods), name=method, dtype=object
+        ).infer_objects()
+
+
+@attr.s(frozen=True, repr=False)
+class ApodePanel:
+    """Income distributions of several periods (survey waves).
+
+    Every measure returns a time series, a Series indexed by period,
+    e.g. ``panel.poverty.headcount(pline=1.0)``. The results are kept
+    per period: a panel extended with ``append`` only evaluates the new
+    periods and reuses the values of the earlier ones.
+
+    Use ``ApodePanel.from_data`` or ``ApodeData.panel`` to split the
+    records of an ApodeData by a period column.
+
+    Parameters
+    ----------
+    distributions : dict
+        Income cache (or ApodeData) of every period, in time order.
+
+    results : dict, optional
+        Values already computed, by measure and period. Copied to the
+        panels created with ``append``.
+
+    """
+
+    distributions = attr.ib(converter=_as_caches)
+    results = attr.ib(factory=dict, kw_only=True)
+    poverty = attr.ib(init=False)
+    inequality = attr.ib(init=False)
+    polarization = attr.ib(init=False)
+    concentration = attr.ib(init=False)
+    welfare = attr.ib(init=False)
+
+    @poverty.default
+    def _poverty_default(self):
+        return PanelMeasures(self, "poverty")
+
+    @inequality.default
+    def _inequality_default(self):
+        return PanelMeasures(self, "inequality")
+
+    @polarization.default
+    def _polarization_default(self):
+        return PanelMeasures(self, "polarization")
+
+    @concentration.default
+    def _concentration_default(self):
+        return PanelMeasures(self, "concentration")
+
+    @welfare.default
+    def _welfare_default(self):
+        return PanelMeasures(self, "welfare")
+
+    @classmethod
+    def from_data(cls, idf, period_column):
+        """Split the records of an ApodeData by period.
+
+        The incomes are sorted once by (period, income).
+
+        Parameters
+        ----------
+        idf : ApodeData
+            Data of every period.
+
+        period_column : str
+            Column with the period of each record.
+
+        Return
+        ------
+        out: ApodePanel
+            One distribution per period, in sorted period order.
+
+        """
+        segments = idf.groupby(period_column).segments
+        return cls(
+            {key: segments.cache(i) for i, key in enumerate(segments.keys)}
+        )
+
+    def __repr__(self):
+        """Apply Display method."""
+        periods = self.periods
+        span = f"{periods[0]!r}..{periods[-1]!r}" if periods else "empty"
+        return f"ApodePanel(periods={len(self)}, {span})"
+
+    def __len__(self):
+        """Return the number of periods."""
+        return len(self.distributions)
+
+    def __getitem__(self, period):
+        """Return an IncomeView of a period."""
+        return IncomeView(self.distributions[period])
+
+    @property
+    def periods(self):
+        """Periods of the panel, in time order."""
+        return list(self.distributions)
+
+    def append(self, period, data):
+        """Add the distribution of a new period.
+
+        Parameters
+        ----------
+        period : hashable
+            New period, placed after the existing ones.
+
+        data : ApodeData or IncomeCache
+            Incomes of the new period.
+
+        Return
+        ------
+        out: ApodePanel
+            Panel with the new period. The values computed for the
+            earlier periods are reused.
+
+        """
+        if period in self.distributions:
+            raise ValueError(f"Period {period!r} already in the panel")
+        distributions = dict(self.distributions)
+        distributions[period] = data
+        results = {key: dict(values) for key, values in self.results.items()}
+        return ApodePanel(distributions, results=results)
+
+    def segments(self, periods=None):
+        """Sorted incomes of some periods as one set of segments.
+
+        Parameters
+        ----------
+        periods : list, optional(default=None)
+            Periods to include, all of them by default.
+
+        Return
+        ------
+        out: GroupSegments
+            One segment per period.
+
+        """
+        periods = self.periods if periods is None else list(periods)
+        caches = [self.distributions[p] for p in periods]
+        ys = np.concatenate([c.ys for c in caches] or [np.empty(0)])
+        ws = None
+        if any(c.weighted for c in caches):
+            ws = np.concatenate(
+                [c.ws if c.weighted else np.ones(c.n) for c in caches]
+            )
+        counts = np.array([c.n for c in caches], dtype=int)
+        return GroupSegments(pd.Index(periods), ys, ws, counts)
@@ -24,6 +24,8 @@ import numpy as np
 
 import pandas as pd
 
+from .backends import get_backend
+
 
 # =============================================================================
 # CONSTANTS
@@ -68,34 +70,48 @@ class PlotAccsessor:
     # ver n=0,1
     def _lorenz_data(self, alpha="r"):
         """Lorenz Curve data."""
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
-        z = np.cumsum(y) / y.sum()
+        cache = self.idf.cache
+        if cache.weighted:
+            return self._lorenz_data_weighted(alpha)
+        n = cache.n
+        mu = cache.mean
+        z = get_backend().lorenz(cache.ys, cache.cumsum, alpha, mu)
         q = np.arange(0, n + 1) / n
         qd = q
-        if alpha == "r":
-            pass
-        elif alpha == "g":
-            mu = np.mean(y)
+        if alpha == "g":
+            qd = q * mu
+        elif alpha == "a":
+            qd = q * 0
+        return pd.DataFrame({"population": q, "variable": z, "line": qd})
+
+    def _lorenz_data_weighted(self, alpha="r"):
+        """Lorenz Curve data with sampling weights."""
+        cache = self.idf.cache
+        persons = cache.prefix(0)
+        income = cache.prefix(1)
+        q = persons / cache.population
+        z = income / cache.total
+        qd = q
+        if alpha == "g":
+            mu = cache.mean
             z = z * mu
             qd = q * mu
         elif alpha == "a":
-            mu = np.mean(y)
             qd = q * 0
-            z = np.cumsum(y - mu)
-        z = np.insert(z, 0, 0)
+            z = income - cache.mean * persons
         return pd.DataFrame({"population": q, "variable": z, "line": qd})
 
     # ver n=0,1
     def _pen_data(self, pline=None):
         """Pen Parade Curve data."""
-        y = self.idf.data[self.idf.income_column].values
-        y = np.sort(y)
-        n = len(y)
-        me = np.median(y)
+        cache = self.idf.cache
+        y = cache.ys
+        n = cache.n
+        me = cache.median
         q = np.arange(0, n + 1) / n
-        mu = np.mean(y)
+        if cache.weighted:
+            q = cache.prefix(0) / cache.population
+        mu = cache.mean
         qd = np.ones(n + 1) * mu / me
         z = np.copy(y) / me
         z = np.insert(z, 0, 0)
@@ -106,16 +122,20 @@ class PlotAccsessor:
         """TIP Curve data."""
         if pline < 0:
             raise ValueError(f"'pline' must be >= 0. Found '{pline}'")
-        y = self.idf.data[self.idf.income_column].values
-        ys = np.sort(y)
-        n = len(ys)
-        q = sum(ys < pline)
+        cache = self.idf.cache
+        ys = cache.ys
+        n = cache.n
+        q = cache.count_below(pline)
+        if not cache.weighted:
+            z = get_backend().tip(ys, n, q, pline)
+            p = np.arange(0, n + 1) / n
+            return pd.DataFrame({"population": p, "variable": z})
         ygap = np.zeros(n)
-        ygap[0:q] = (pline - ys[0:q]) / pline
-
+        ygap[0:q] = cache.ws[0:q] * ((pline - ys[0:q]) / pline)
+        n = cache.population
+        p = cache.prefix(0) / n
         z = np.cumsum(ygap) / n
         z = np.insert(z, 0, 0)
-        p = np.arange(0, n + 1) / n
         return pd.DataFrame({"population": p, "variable": z})
 
     def lorenz(self, alpha="r", ax=None, **kwargs):
@@ -20,12 +20,15 @@ import attr
 
 import numpy as np
 
+from .profiling import instrument
+
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
 
+@instrument("polarization")
 @attr.s(frozen=True)
 class PolarizationMeasures:
     """Polarization Measures.
@@ -50,11 +53,22 @@ class PolarizationMeasures:
         method_func = getattr(self, method)
         return method_func(**kwargs)
 
-    # generalizar parametro
-    def ray(self):
+    def ray(self, alpha=1):
         """Esteban and Ray index of polarization.
 
-        Esteban and Ray index of polarization.
+        Esteban and Ray index of polarization, with every person taken as
+        a group of population share ``1/n``:
+        ``ER = sum_i sum_j (1/n) ** (2 + alpha) |y_i - y_j|``.
+
+        The double sum is computed over the sorted incomes with prefix
+        sums, in O(n) after the (cached) sort.
+
+        Parameters
+        ----------
+        alpha: float or array_like, optional(default=1)
+            Polarization sensitivity, in (0, 1.6]. If alpha is an array
+            the index is computed for every value and an array is
+            returned.
 
         Return
         ------
@@ -68,14 +82,10 @@ class PolarizationMeasures:
            819-851.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pij = 1 / len(y)
-        alpha = 1  # (0,1.6]
-        p_er = 0
-        for yi in y:
-            for yj in y:
-                p_er += np.power(pij, 1 + alpha) * pij * abs(yi - yj)
-        return p_er
+        alphas = _ray_alpha(alpha)
+        cache = self.idf.cache
+        pij = 1 / cache.population
+        return _ray_sum(cache) * np.power(pij, 2 + alphas)
 
     def wolfson(self):
         """Wolfson index of bipolarization.
@@ -93,18 +103,44 @@ class PolarizationMeasures:
            The American Economic Review 84 (2): 353–58.
 
         """
-        ys = np.sort(self.idf.data[self.idf.income_column].values)
-        ysa = np.cumsum(ys) / np.sum(ys)
-        n = len(ys)
+        cache = self.idf.cache
+        ysa = cache.cumsum / cache.total
+        n = cache.n
         # if (n % 2) == 0:
         #     i = int(n / 2)
         #     L = (ysa[i - 1] + ysa[i]) / 2
         # else:
         #     i = int((n + 1) / 2)
         #     L = ysa[i - 1]
-        i = int(n / 2)  # criterio de R
-        L = ysa[i - 1]
+        if cache.weighted:
+            L = cache.lorenz(np.floor(cache.population / 2)) / cache.total
+        else:
+            i = int(n / 2)  # criterio de R
+            L = ysa[i - 1]
         g = self.idf.inequality.gini()
         # p_w = (np.mean(ys) / np.median(ys)) * (0.5 - L - g)
-        p_w = 4 * (0.5 - L - g / 2) * (np.mean(ys) / np.median(ys))
+        p_w = 4 * (0.5 - L - g / 2) * (cache.mean / cache.median)
         return p_w
+
+
+def _ray_alpha(alpha):
+    """Check the Esteban and Ray alpha (or array of alphas)."""
+    alphas = np.asarray(alpha, dtype=float)
+    if np.any((alphas <= 0) | (alphas > 1.6)):
+        raise ValueError(f"'alpha' must be in (0, 1.6]. Found '{alpha}'")
+    return alphas
+
+
+def _ray_sum(cache):
+    """Return the sum of |yi - yj| over all the pairs of persons.
+
+    Over the sorted incomes every record is above all the previous ones,
+    so its pairs with them add ``y_k * P0_k - P1_k``, where P0 and P1 are
+    the persons and the income of the previous records.
+    """
+    ys = cache.ys
+    below = cache.prefix(1)[:-1]
+    if cache.weighted:
+        persons = cache.prefix(0)[:-1]
+        return 2 * np.sum(cache.ws * (ys * persons - below))
+    return 2 * np.sum(ys * np.arange(cache.n) - below)
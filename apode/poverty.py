@@ -20,12 +20,19 @@ import attr
 
 import numpy as np
 
+import pandas as pd
+
+from .backends import get_backend
+from .precision import fsum
+from .profiling import instrument
+
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
 
+@instrument("poverty")
 @attr.s(frozen=True)
 class PovertyMeasures:
     """Poverty Measures.
@@ -47,6 +54,9 @@ class PovertyMeasures:
     - hagenaars: Hagenaars Index
     - chakravarty: Chakravarty Indices
 
+    The FGT indices can also be computed as curves over a range of poverty
+    lines (fgt_curve, deficit_curve) and compared with dominance.
+
     Parameters
     ----------
     method : String
@@ -76,6 +86,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -94,11 +106,14 @@ class PovertyMeasures:
            and inequality. Washington, DC: World Bank.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _fgt_lines(cache, _get_plines(pline, factor, q), 0)
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _fgt_lines(cache, pline, 0)
+        n = cache.n
+        q = cache.count_below(pline)
         return q / n
 
     def gap(self, pline=None, factor=1.0, q=None):
@@ -114,6 +129,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -132,14 +149,18 @@ class PovertyMeasures:
            and inequality. Washington, DC: World Bank.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _fgt_lines(cache, _get_plines(pline, factor, q), 1)
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _fgt_lines(cache, pline, 1)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         yp = ys[0:q]
         br = (pline - yp) / pline
-        return np.sum(br) / n
+        return fsum(br) / n
 
     def severity(self, pline=None, factor=1.0, q=None):
         """Squared Poverty Gap (Poverty Severity) Index.
@@ -156,6 +177,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -174,14 +197,18 @@ class PovertyMeasures:
            and inequality. Washington, DC: World Bank.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _fgt_lines(cache, _get_plines(pline, factor, q), 2)
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _fgt_lines(cache, pline, 2)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         yp = ys[0:q]
         br = np.power((pline - yp) / pline, 2)
-        return np.sum(br) / n
+        return fsum(br) / n
 
     def fgt(self, pline=None, alpha=0, factor=1.0, q=None):
         """Foster–Greer–Thorbecke Indices.
@@ -199,6 +226,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -221,21 +250,25 @@ class PovertyMeasures:
            pp.761–766.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
-        yp = ys[0:q]
         if alpha < 0:
             raise ValueError(f"'alpha' must be >= 0. Found '{alpha}'")
-        elif alpha == 0:
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _fgt_lines(cache, _get_plines(pline, factor, q), alpha)
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _fgt_lines(cache, pline, alpha)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
+        yp = ys[0:q]
+        if alpha == 0:
             return q / n
         elif alpha == 1:
             br = (pline - yp) / pline
-            return np.sum(br) / n
+            return fsum(br) / n
         br = np.power((pline - yp) / pline, alpha)
-        return np.sum(br) / n
+        return fsum(br) / n
 
     def sen(self, pline=None, factor=1.0, q=None):
         """Sen Index.
@@ -324,6 +357,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -343,13 +378,17 @@ class PovertyMeasures:
            pp.316–329.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _watts_lines(cache, _get_plines(pline, factor, q))
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _watts_lines(cache, pline)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         yp = ys[0:q]
-        return sum(np.log(pline / yp)) / n
+        return fsum(np.log(pline / yp), sum) / n
 
     def cuh(self, pline=None, alpha=0, factor=1.0, q=None):
         """Clark, Ulph and Hemming index.
@@ -386,20 +425,27 @@ class PovertyMeasures:
            pp.515–526.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        pline = _get_pline(cache, pline, factor, q)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         yp = ys[0:q]
         if (alpha < 0) or (alpha > 1):
             raise ValueError(f"'alpha' must be in [0,1]. Found '{alpha}'")
+        if cache.weighted:
+            n = cache.population
+            wp = cache.ws[:q]
+            if alpha == 0:
+                prod = np.product(np.power(yp / pline, wp))
+                return 1 - np.power(prod / n, 1 / n)
+            su = np.sum(wp * np.power(yp / pline, alpha))
+            return 1 - np.power((su + (n - wp.sum())) / n, 1 / alpha)
         if alpha == 0:
             return 1 - np.power(np.product(yp / pline) / n, 1 / n)
         else:
-            return 1 - np.power(
-                (sum(np.power(yp / pline, alpha)) + (n - q)) / n, 1 / alpha
-            )
+            su = fsum(np.power(yp / pline, alpha), sum)
+            return 1 - np.power((su + (n - q)) / n, 1 / alpha)
 
     def takayama(self, pline=None, factor=1.0, q=None):
         """Takayama Index.
@@ -413,6 +459,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -432,23 +480,14 @@ class PovertyMeasures:
            Econometrica. Vol. 47, n 3, pp.747–759.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
-        if q == 0:
-            return 0  # CHECK THIS!!
-        yp = ys[0:q]
-        u = (yp.sum() + (n - q) * pline) / n
-        if u * n * n == 0:
-            return 0  # to avoid NaNs for zero division error
-        i_0q = np.arange(q)
-        i_qn = np.arange(q, n)
-        a = np.sum(np.dot(n - i_0q + 1, ys[:q])) + np.sum(
-            (n - i_qn + 1) * pline
-        )  # )
-        return 1 + 1 / n - (2 / (u * n * n)) * a
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _takayama_lines(cache, _get_plines(pline, factor, q))
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _takayama_lines(cache, pline)
+        q = cache.count_below(pline)
+        return get_backend().takayama(cache.ys, cache.n, q, pline)
 
     # Kakwani Index
     def kakwani(self, pline=None, alpha=2, factor=1.0, q=None):
@@ -486,18 +525,34 @@ class PovertyMeasures:
            Econometrica, vol.48, n.2, pp.437-446
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
-        ii = np.arange(q)
-        f = np.power(q - ii + 2, alpha)
-        a = np.float(np.sum(f))
-        u = np.sum(np.dot(f, pline - ys[:q]))
-        if u == 0:
-            return 0  # to avoid NaNs for zero division error
-        return (q / (n * pline * a)) * u
+        cache = self.idf.cache
+        pline = _get_pline(cache, pline, factor, q)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
+        if cache.weighted:
+            # rank weights (q - j + 2) ** alpha summed over the persons j
+            # of each record: exact for alpha in {0, 1, 2}, evaluated at
+            # the middle rank of the record otherwise
+            qw = cache.prefix(0)[q]
+            wp = cache.ws[:q]
+            c = qw - cache.prefix(0)[:q] + 2
+            s1 = wp * (wp - 1) / 2
+            if alpha == 0:
+                f = wp
+            elif alpha == 1:
+                f = c * wp - s1
+            elif alpha == 2:
+                s2 = (wp - 1) * wp * (2 * wp - 1) / 6
+                f = c * c * wp - 2 * c * s1 + s2
+            else:
+                f = wp * np.power(qw - cache.ranks[:q] + 2, alpha)
+            a = np.sum(f)
+            u = np.sum(np.dot(f, pline - ys[:q]))
+            if u == 0:
+                return 0
+            return (qw / (cache.population * pline * a)) * u
+        return get_backend().kakwani(ys, n, q, pline, alpha)
 
     def thon(self, pline=None, factor=1.0, q=None):
         """Thon Index.
@@ -513,6 +568,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -531,14 +588,14 @@ class PovertyMeasures:
            and Wealth. Vol. 25, pp.429–439.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
-        ii = np.arange(q)
-        u = np.sum(np.dot(n - ii + 1, pline - ys[:q]))
-        return (2 / (n * (n + 1) * pline)) * u
+        cache = self.idf.cache
+        if np.ndim(pline):
+            return _thon_lines(cache, _get_plines(pline, factor, q))
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _thon_lines(cache, pline)
+        q = cache.count_below(pline)
+        return get_backend().thon(cache.ys, cache.n, q, pline)
 
     def bd(self, pline=None, alpha=2, factor=1.0, q=None):
         """Blackorby and Donaldson Indices.
@@ -574,15 +631,20 @@ class PovertyMeasures:
            pp.1053–1060.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        pline = _get_pline(cache, pline, factor, q)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         if q == 0:
             return 0  # CHECK IF CORRECT
         yp = ys[0:q]
         u = yp.sum() / q
+        if cache.weighted:
+            qw = cache.prefix(0)[q]
+            n = cache.population
+            u = cache.prefix(1)[q] / qw
+            q = qw
         # atkp = atkinson(yp, alpha)
         # gp = self.idf.inequality.gini()
         atkp = self.idf.inequality.atkinson(alpha=alpha)
@@ -619,15 +681,20 @@ class PovertyMeasures:
            for Research in Public Economics. Leyden University.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        pline = _get_pline(cache, pline, factor, q)
+        n = cache.n
+        q = cache.count_below(pline)
         if q == 0:
             return 0  # check this!!
-        yp = ys[0:q]
-        ug = np.exp(sum(np.log(yp)) / q)  # o normalizar con el maximo
+        if cache.weighted:
+            qw = cache.prefix(0)[q]
+            ug = np.exp(cache.prefix("log")[q] / qw)
+            n = cache.population
+            q = qw
+        else:
+            # o normalizar con el maximo
+            ug = np.exp(fsum(cache.logys[:q], sum) / q)
         return (q / n) * ((np.log(pline) - np.log(ug)) / np.log(pline))
 
     def chakravarty(self, pline=None, alpha=0.5, factor=1.0, q=None):
@@ -643,6 +710,8 @@ class PovertyMeasures:
             Absolute poverty line if pline is float.
             Relative poverty line if pline is 'median', 'quantile' or 'mean'
             If pline is None then pline = 0.5*median(y).
+            If pline is an array of absolute lines, the index is computed
+            for every line and an array is returned.
 
         factor : float, optional(default=1.0)
             Factor in pline = factor*stat
@@ -664,32 +733,266 @@ class PovertyMeasures:
            Social Sciences. Vol. 6, pp.307–313.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        pline = _get_pline(y, pline, factor, q)
         if (alpha <= 0) or (alpha >= 1):
             raise ValueError(f"'alpha' must be in (0,1). Found '{alpha}'")
-        n = len(y)
-        ys = np.sort(y)
-        q = np.sum(ys < pline)
+        cache = self.idf.cache
+        if np.ndim(pline):
+            plines = _get_plines(pline, factor, q)
+            return _chakravarty_lines(cache, plines, alpha)
+        pline = _get_pline(cache, pline, factor, q)
+        if cache.weighted:
+            return _chakravarty_lines(cache, pline, alpha)
+        n = cache.n
+        ys = cache.ys
+        q = cache.count_below(pline)
         yp = ys[0:q]
-        return sum(1 - np.power(yp / pline, alpha)) / n
+        return fsum(1 - np.power(yp / pline, alpha), sum) / n
+
+    def fgt_curve(self, zmin, zmax, alpha=0):
+        """FGT curve over a range of poverty lines.
+
+        Evaluates the FGT index for every poverty line in [zmin, zmax]
+        where the curve can change its form: both ends of the interval
+        and every observed income inside it. Between two breakpoints
+        the index is a known function of the line (constant for alpha=0,
+        ``(k - S1/z) / n`` for alpha=1 and ``(k - 2 S1/z + S2/z^2) / n``
+        for alpha=2, with k, S1 and S2 fixed), so the curve is exact.
+
+        Parameters
+        ----------
+        zmin : float
+            Lowest poverty line, must be > 0.
 
+        zmax : float
+            Highest poverty line, must be > zmin.
 
-def _get_pline(y, pline, factor, q):
+        alpha: float, optional(default=0)
+            Aversion poverty parameter. For alpha in {0, 1, 2} the whole
+            curve costs O(n log n); other values sum over the poor of
+            each breakpoint.
+
+        Return
+        ------
+        out: DataFrame
+            Columns ``pline`` (breakpoints) and ``fgt``.
+
+        References
+        ----------
+        .. Foster, J.E. and Shorrocks, A.F. (1988). “Poverty orderings”.
+           Econometrica. Vol. 56, n 1, pp.173–177.
+
+        """
+        if alpha < 0:
+            raise ValueError(f"'alpha' must be >= 0. Found '{alpha}'")
+        cache = self.idf.cache
+        plines = _curve_plines(cache, zmin, zmax)
+        fgt = _fgt_lines(cache, plines, alpha)
+        return pd.DataFrame({"pline": plines, "fgt": fgt})
+
+    def deficit_curve(self, zmin, zmax):
+        """Poverty deficit curve.
+
+        The poverty deficit curve D(z) is the area under the distribution
+        function up to the poverty line z, i.e. the mean of max(z - y, 0).
+        It is piecewise linear between the observed incomes, so linear
+        interpolation between the returned breakpoints is exact.
+
+        Parameters
+        ----------
+        zmin : float
+            Lowest poverty line, must be > 0.
+
+        zmax : float
+            Highest poverty line, must be > zmin.
+
+        Return
+        ------
+        out: DataFrame
+            Columns ``pline`` (breakpoints) and ``deficit``.
+
+        References
+        ----------
+        .. Atkinson, A.B. (1987). “On the measurement of poverty”.
+           Econometrica. Vol. 55, n 4, pp.749–764.
+
+        """
+        cache = self.idf.cache
+        plines = _curve_plines(cache, zmin, zmax)
+        deficit = plines * _fgt_lines(cache, plines, 1)
+        return pd.DataFrame({"pline": plines, "deficit": deficit})
+
+    def dominance(self, other, zmin, zmax, alpha=0):
+        """Poverty dominance over a range of poverty lines.
+
+        Checks whether this distribution has no more poverty than
+        ``other`` for every poverty line in [zmin, zmax]. With alpha=0
+        this is first order (headcount) dominance and with alpha=1 it is
+        second order (poverty gap / deficit) dominance. Both curves are
+        compared on the union of their breakpoints, which is exact for
+        these two orders.
+
+        Parameters
+        ----------
+        other : ApodeData
+            Distribution to compare with.
+
+        zmin : float
+            Lowest poverty line, must be > 0.
+
+        zmax : float
+            Highest poverty line, must be > zmin.
+
+        alpha: int, optional(default=0)
+            Dominance order minus one, 0 or 1.
+
+        Return
+        ------
+        out: bool
+            True if FGT(alpha) of this distribution is lower or equal
+            than the one of other for every line in [zmin, zmax].
+
+        References
+        ----------
+        .. Foster, J.E. and Shorrocks, A.F. (1988). “Poverty orderings”.
+           Econometrica. Vol. 56, n 1, pp.173–177.
+
+        """
+        if alpha not in (0, 1):
+            raise ValueError(f"'alpha' must be 0 or 1. Found '{alpha}'")
+        cache = self.idf.cache
+        other_cache = other.cache
+        plines = np.union1d(
+            _curve_plines(cache, zmin, zmax),
+            _curve_plines(other_cache, zmin, zmax),
+        )
+        mine = _fgt_lines(cache, plines, alpha)
+        theirs = _fgt_lines(other_cache, plines, alpha)
+        return bool(np.all(mine <= theirs))
+
+
+def _get_pline(cache, pline, factor, q):
     """Check/calcule poverty line."""
     if pline is None:
-        return 0.5 * np.median(y)
+        return 0.5 * cache.median
     if factor < 0:
         raise ValueError(f"'factor' must be <=0. Found '{factor}'")
     if pline == "median":
-        return factor * np.median(y)
+        return factor * cache.median
     elif pline == "mean":
-        return factor * np.mean(y)
+        return factor * cache.mean
     elif pline == "quantile":
         if (q < 0) or (q > 1):
             raise ValueError(f"Quantile 'q' must be in [0,1]. Found '{q}'")
-        return factor * np.quantile(y, q=q)
+        return factor * cache.quantile(q)
     elif pline <= 0:
         raise ValueError(f"'pline' must be >= 0. Found '{pline}'")
     else:
         return pline
+
+
+def _curve_plines(cache, zmin, zmax):
+    """Breakpoints of the poverty curves in [zmin, zmax]."""
+    if zmin <= 0:
+        raise ValueError(f"'zmin' must be > 0. Found '{zmin}'")
+    if zmax <= zmin:
+        raise ValueError(f"'zmax' must be > zmin. Found '{zmax}'")
+    ys = cache.ys
+    i = np.searchsorted(ys, zmin, side="right")
+    j = np.searchsorted(ys, zmax, side="left")
+    inner = ys[i:j]
+    if len(inner):
+        inner = inner[np.concatenate(([True], inner[1:] != inner[:-1]))]
+    return np.concatenate(([zmin], inner, [zmax])).astype(float)
+
+
+def _get_plines(pline, factor, q):
+    """Check an array of absolute poverty lines."""
+    if factor != 1.0 or q is not None:
+        raise ValueError(
+            "'factor' and 'q' only apply to a relative 'pline'. "
+            "Scale the array of poverty lines instead"
+        )
+    plines = np.asarray(pline, dtype=float)
+    if np.any(plines <= 0):
+        raise ValueError("All the values of 'pline' must be > 0")
+    return plines
+
+
+def _persons_below(cache, k):
+    """Return the number of persons in the k poorest records."""
+    if cache.weighted:
+        return cache.prefix(0)[k]
+    return k
+
+
+def _fgt_lines(cache, plines, alpha):
+    """FGT index for an array of poverty lines.
+
+    For alpha in {0, 1, 2} the index only depends on the number of poor
+    and on the prefix sums of y and y**2, so each line costs a binary
+    search. Other values of alpha sum over the poor of each line, so
+    they cost O(n) per line (O(n * len(plines)) in total).
+    """
+    n = cache.population
+    k = cache.count_below_many(plines)
+    p = _persons_below(cache, k)
+    if alpha == 0:
+        return p / n
+    if alpha in (1, 2):
+        s1 = cache.prefix(1)[k] / plines
+        if alpha == 1:
+            return (p - s1) / n
+        s2 = cache.prefix(2)[k] / np.square(plines)
+        return (p - 2 * s1 + s2) / n
+    plines = np.asarray(plines)
+    ys, ws = cache.ys, cache.ws
+    br = [
+        np.power((z - ys[:q]) / z, alpha)
+        for z, q in zip(plines.ravel(), np.ravel(k))
+    ]
+    if ws is not None:
+        br = [ws[: len(b)] * b for b in br]
+    return np.array([fsum(b) for b in br]).reshape(plines.shape) / n
+
+
+def _watts_lines(cache, plines):
+    """Watts index for an array of poverty lines."""
+    k = cache.count_below_many(plines)
+    p = _persons_below(cache, k)
+    return (p * np.log(plines) - cache.prefix("log")[k]) / cache.population
+
+
+def _chakravarty_lines(cache, plines, alpha):
+    """Chakravarty index for an array of poverty lines."""
+    k = cache.count_below_many(plines)
+    p = _persons_below(cache, k)
+    su = cache.prefix(alpha)[k] / np.power(plines, alpha)
+    return (p - su) / cache.population
+
+
+def _thon_lines(cache, plines):
+    """Thon index for an array of poverty lines."""
+    n = cache.population
+    k = cache.count_below_many(plines)
+    p = _persons_below(cache, k)
+    # sum_{i<p} (n - i + 1) * (z - y_i)
+    weights = p * (n + 1) - p * (p - 1) / 2
+    wy = (n + 1) * cache.prefix(1)[k] - cache.prefix("rank")[k]
+    u = plines * weights - wy
+    return (2 / (n * (n + 1) * plines)) * u
+
+
+def _takayama_lines(cache, plines):
+    """Takayama index for an array of poverty lines."""
+    n = cache.population
+    k = cache.count_below_many(plines)
+    p = _persons_below(cache, k)
+    s1 = cache.prefix(1)[k]
+    u = (s1 + (n - p) * plines) / n
+    # sum_{i<p} (n - i + 1) * y_i + sum_{i>=p} (n - i + 1) * z
+    m = n - p
+    a = (n + 1) * s1 - cache.prefix("rank")[k]
+    a = a + plines * ((m + 1) * (m + 2) / 2 - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 1 + 1 / n - (2 / (u * n * n)) * a
+    return np.where((k == 0) | (u * n * n == 0), 0.0, result)[()]
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Profiling of the measure calls of Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import contextvars
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import attr
+
+import numpy as np
+
+import pandas as pd
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True)
+class CallStats:
+    """Statistics of one measure call.
+
+    Attributes
+    ----------
+    measure : str
+        Measure as ``"family.method"``.
+
+    params : dict
+        Parameters of the call.
+
+    wall_time : float
+        Seconds spent in the call.
+
+    sorts : int
+        Sorts of incomes performed (argsort, sort, lexsort).
+
+    sort_time : float
+        Seconds spent sorting.
+
+    extract_time : float
+        Seconds spent extracting the columns from the DataFrame.
+
+    cache_hits, cache_misses : int
+        Primitives of the income cache reused and computed.
+
+    cached_bytes : int
+        Bytes of the arrays added to the income cache.
+
+    peak_bytes : int or None
+        Peak of the memory allocated during the call (temporaries
+        included), if the profile traces memory.
+
+    """
+
+    measure = attr.ib()
+    params = attr.ib()
+    wall_time = attr.ib()
+    sorts = attr.ib()
+    sort_time = attr.ib()
+    extract_time = attr.ib()
+    cache_hits = attr.ib()
+    cache_misses = attr.ib()
+    cached_bytes = attr.ib()
+    peak_bytes = attr.ib(default=None)
+
+    def as_dict(self):
+        """Return the statistics as a plain dict (a structured event)."""
+        return attr.asdict(self)
+
+
+@attr.s(repr=False)
+class Profile:
+    """Statistics of the measure calls made inside ``profile()``.
+
+    Attributes
+    ----------
+    calls : list
+        ``CallStats`` of every measure call, in call order.
+
+    trace_memory : bool
+        Whether the peak memory of each call is traced.
+
+    """
+
+    trace_memory = attr.ib(default=False)
+    calls = attr.ib(factory=list)
+
+    def __repr__(self):
+        """Apply Display method."""
+        total = sum(call.wall_time for call in self.calls)
+        return f"Profile(calls={len(self.calls)}, wall_time={total:.6f})"
+
+    def to_frame(self):
+        """Return one row per call as a DataFrame."""
+        return pd.DataFrame([call.as_dict() for call in self.calls])
+
+
+@attr.s
+class _State:
+    """Active profiles and hooks, shared by every thread."""
+
+    profiles = attr.ib(factory=list)
+    hooks = attr.ib(factory=list)
+
+    @property
+    def active(self):
+        return bool(self.profiles or self.hooks)
+
+
+_STATE = _State()
+
+# Counters of the measure call running in the current thread (or task),
+# None outside of a call.
+_COUNTERS = contextvars.ContextVar("apode_counters", default=None)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+@contextmanager
+def profile(trace_memory=False):
+    """Record the statistics of the measure calls made in the block.
+
+    Every outermost measure call (``idf.poverty.fgt(...)``, grouped
+    calls included) adds a ``CallStats`` to the profile; calls made by
+    another measure are counted in the outer one. Calls running in other
+    threads are recorded too, each with its own counters.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional(default=False)
+        Trace the peak memory of each call with ``tracemalloc``
+        (slower).
+
+    Return
+    ------
+    out: Profile
+        Profile filled while the block runs.
+
+    Examples
+    --------
+    >>> with profile() as prof:
+    ...     idf.inequality.gini()
+    >>> prof.to_frame()
+
+    """
+    prof = Profile(trace_memory=trace_memory)
+    _STATE.profiles.append(prof)
+    try:
+        yield prof
+    finally:
+        _STATE.profiles.remove(prof)
+
+
+def add_hook(hook):
+    """Send the ``CallStats.as_dict()`` of every measure call to ``hook``.
+
+    Hooks run for every outermost measure call, with or without an
+    active ``profile()``, e.g. to forward the events to a metrics
+    pipeline.
+
+    Parameters
+    ----------
+    hook : callable
+        Function of one dict.
+
+    """
+    _STATE.hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Stop sending events to a hook added with ``add_hook``."""
+    _STATE.hooks.remove(hook)
+
+
+def instrument(family):
+    """Class decorator recording the calls of the public measures.
+
+    Parameters
+    ----------
+    family : str
+        Measure family of the class, used to name the calls.
+
+    """
+
+    def decorator(cls):
+        for name, func in list(vars(cls).items()):
+            if not name.startswith("_") and callable(func):
+                setattr(cls, name, _wrap(f"{family}.{name}", func))
+        return cls
+
+    return decorator
+
+
+def _wrap(measure, func):
+    """Record the calls of a measure method."""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not _STATE.active or _COUNTERS.get() is not None:
+            return func(self, *args, **kwargs)
+        with measure_call(measure, kwargs):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def measure_call(measure, params):
+    """Count the work of an outermost measure call."""
+    if not _STATE.active or _COUNTERS.get() is not None:
+        yield
+        return
+    trace = any(p.trace_memory for p in _STATE.profiles)
+    started_tracing = trace and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace:
+        if not started_tracing and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()  # python >= 3.9
+        base = tracemalloc.get_traced_memory()[0]
+    counters = dict.fromkeys(
+        ("sorts", "cache_hits", "cache_misses", "cached_bytes"), 0
+    )
+    counters.update(sort_time=0.0, extract_time=0.0)
+    token = _COUNTERS.set(counters)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter() - start
+        _COUNTERS.reset(token)
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1] - base
+            if started_tracing:
+                tracemalloc.stop()
+        stats = CallStats(
+            measure=measure,
+            params=dict(params),
+            wall_time=wall_time,
+            peak_bytes=peak,
+            **counters,
+        )
+        for prof in _STATE.profiles:
+            prof.calls.append(stats)
+        for hook in list(_STATE.hooks):
+            hook(stats.as_dict())
+
+
+@contextmanager
+def timed(kind):
+    """Time a ``"sort"`` or an ``"extract"`` step of the current call."""
+    counters = _COUNTERS.get()
+    if counters is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        counters[f"{kind}_time"] += time.perf_counter() - start
+        if kind == "sort":
+            counters["sorts"] += 1
+
+
+def count_cache(hit, value=None):
+    """Count a hit or a miss of the income cache."""
+    counters = _COUNTERS.get()
+    if counters is None:
+        return
+    if hit:
+        counters["cache_hits"] += 1
+    else:
+        counters["cache_misses"] += 1
+        if isinstance(value, np.ndarray):
+            counters["cached_bytes"] += value.nbytes
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Streaming quantile sketch for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import attr
+
+import numpy as np
+
+from .cache import IncomeCache
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_K = 200
+
+# Capacity decay between consecutive levels (c in Karnin, Lang and
+# Liberty, 2016).
+_DECAY = 2 / 3
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class QuantileSketch:
+    """Mergeable quantile sketch (KLL).
+
+    The sketch keeps a hierarchy of compactors: the items of level ``h``
+    stand for ``2**h`` persons each. When the sketch grows over its
+    capacity, a full level is sorted and every other item (starting at a
+    random offset) is promoted to the next level. Memory is
+    ``O(k log(n / k))`` and two sketches merge by concatenating their
+    levels.
+
+    Error bound: the rank of a quantile returned by the sketch differs
+    from the exact rank by at most ``epsilon * population`` with high
+    probability, with ``epsilon`` about ``1.7 / k`` (0.85% for the
+    default ``k=200``; Karnin, Lang and Liberty, 2016). Poverty measures
+    bounded in [0, 1] and monotone in the income (headcount and FGT)
+    evaluated on the sketch share the same bound at a fixed line, and
+    about twice that with a relative line estimated by the sketch.
+
+    Use ``QuantileSketch.from_array`` to build a sketch.
+
+    Parameters
+    ----------
+    k : int, optional(default=200)
+        Capacity of the top level; the error decreases as ``1/k``.
+
+    levels : tuple
+        Items of every level.
+
+    seed : int, optional(default=None)
+        Seed of the random compaction offsets.
+
+    References
+    ----------
+    .. Karnin, Z.; Lang, K. y Liberty, E. (2016). "Optimal Quantile
+       Approximation in Streams". IEEE 57th Annual Symposium on
+       Foundations of Computer Science, pp. 71-78.
+
+    """
+
+    k = attr.ib(default=DEFAULT_K)
+    levels = attr.ib(default=(), converter=tuple)
+    seed = attr.ib(default=None)
+
+    @k.validator
+    def _validate_k(self, name, value):
+        if value < 8:
+            raise ValueError(f"'k' must be >= 8. Found '{value}'")
+
+    @classmethod
+    def from_array(cls, values, weights=None, k=DEFAULT_K, seed=None):
+        """Sketch an array of incomes.
+
+        Parameters
+        ----------
+        values : array_like
+            Income values.
+
+        weights : array_like, optional(default=None)
+            Integer sampling weights; a weight ``w`` is split over the
+            levels of its binary digits.
+
+        k : int, optional(default=200)
+            Capacity of the sketch.
+
+        seed : int, optional(default=None)
+            Seed of the random compaction offsets.
+
+        Return
+        ------
+        out: QuantileSketch
+            Sketch of the values.
+
+        """
+        values = np.asarray(values, dtype=float)
+        if weights is None:
+            levels = [values]
+        else:
+            w = np.asarray(weights)
+            if np.any(w < 0) or np.any(w != np.round(w)):
+                raise ValueError("Sketch weights must be integers >= 0")
+            w = w.astype(np.int64)
+            bits = int(w.max()).bit_length() if len(w) else 0
+            levels = [values[(w >> b) & 1 == 1] for b in range(bits)]
+        return cls(k, seed=seed)._compress(levels)
+
+    def __repr__(self):
+        """Apply Display method."""
+        return (
+            f"QuantileSketch(k={self.k}, population={self.population}, "
+            f"items={self.size})"
+        )
+
+    @property
+    def epsilon(self):
+        """Approximate bound of the normalized rank error."""
+        return 1.7 / self.k
+
+    @property
+    def size(self):
+        """Number of items kept."""
+        return sum(len(level) for level in self.levels)
+
+    @property
+    def population(self):
+        """Number of persons summarized (exact)."""
+        return sum(len(level) * 2 ** h for h, level in enumerate(self.levels))
+
+    def merge(self, other):
+        """Combine with the sketch of another chunk.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch of another chunk, with the same ``k``.
+
+        Return
+        ------
+        out: QuantileSketch
+            Sketch of the union of both chunks.
+
+        """
+        if other.k != self.k:
+            raise ValueError("Sketches with different k cannot be merged")
+        height = max(len(self.levels), len(other.levels))
+        empty = np.empty(0)
+        levels = [
+            np.concatenate(
+                (
+                    self.levels[h] if h < len(self.levels) else empty,
+                    other.levels[h] if h < len(other.levels) else empty,
+                )
+            )
+            for h in range(height)
+        ]
+        return self._compress(levels)
+
+    def cache(self):
+        """Income cache of the weighted items of the sketch."""
+        values = np.concatenate(self.levels or (np.empty(0),))
+        weights = [
+            np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)
+        ]
+        weights = np.concatenate(weights or (np.empty(0),))
+        order = np.argsort(values, kind="mergesort")
+        return IncomeCache.from_sorted(values[order], weights[order])
+
+    def quantile(self, q):
+        """Approximate quantile ``q`` of the incomes."""
+        if (q < 0) or (q > 1):
+            raise ValueError(f"Quantile 'q' must be in [0,1]. Found '{q}'")
+        return self.cache().quantile(q)
+
+    def rank(self, value):
+        """Approximate number of persons with income below ``value``."""
+        cache = self.cache()
+        return cache.prefix(0)[cache.count_below(value)]
+
+    def _capacity(self, h, height):
+        """Return the capacity of level ``h`` in a sketch of ``height``."""
+        return int(np.ceil(_DECAY ** (height - h - 1) * self.k)) + 1
+
+    def _compress(self, levels):
+        """Compact the levels until the sketch is within its capacity.
+
+        A compaction keeps the last item of an odd level in place, so the
+        population is preserved exactly.
+        """
+        levels = list(levels)
+        rng = np.random.default_rng(
+            None if self.seed is None else [self.seed, self.size]
+        )
+        while True:
+            height = len(levels)
+            caps = [self._capacity(h, height) for h in range(height)]
+            if sum(len(level) for level in levels) < sum(caps):
+                break
+            for h in range(height):
+                if len(levels[h]) < caps[h]:
+                    continue
+                if h + 1 == len(levels):
+                    levels.append(np.empty(0))
+                buf = np.sort(levels[h])
+                cut = len(buf) - (len(buf) % 2)
+                keep, buf = buf[cut:], buf[:cut]
+                promoted = buf[rng.integers(2) :: 2]  # noqa
+                levels[h] = keep
+                levels[h + 1] = np.concatenate((levels[h + 1], promoted))
+                break
+        return QuantileSketch(self.k, levels, self.seed)
@@ -0,0 +1,427 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Mergeable summary states for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import attr
+
+import numpy as np
+
+from .cache import IncomeCache
+from .sketch import QuantileSketch
+from .view import IncomeView, split_measure
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class State:
+    """Mergeable sufficient statistics of an income distribution.
+
+    A state summarizes a chunk of incomes (and weights) so that chunks
+    can be processed independently, even on different machines, and
+    combined with ``merge``. ``finalize`` evaluates a measure on the
+    merged state.
+
+    Decomposable measures are evaluated from counts, sums, power sums
+    and log sums: utilitarian, rawlsian, isoelastic, theill and theilt
+    welfare; rrange, cv, entropy and atkinson inequality; herfindahl
+    concentration; and headcount, gap, severity, fgt (alpha in
+    {0, 1, 2}) and watts poverty for the absolute lines given to
+    ``from_array``. A state built with ``keep_values=True`` also holds
+    the sorted run of incomes and evaluates every measure exactly.
+
+    A state built with ``sketch=k`` holds a ``QuantileSketch`` instead
+    of the values: poverty measures with relative lines (or with lines
+    not given to ``from_array``) are then approximated on the sketch,
+    within the error bound documented in ``QuantileSketch``.
+
+    Use ``State.from_array`` to build a state.
+
+    Attributes
+    ----------
+    count : int
+        Number of records.
+
+    population : float
+        Number of persons, the sum of the weights if weighted.
+
+    minimum, maximum : float
+        Lowest and highest income.
+
+    sums : dict
+        Weighted sum of ``y ** e`` for every exponent ``e`` (always
+        includes 1 and 2).
+
+    log_sum, ylog_sum : float
+        Weighted sums of ``log(y)`` and ``y * log(y)``.
+
+    poor : dict
+        For every absolute poverty line ``z``, the persons below ``z``
+        and their weighted sums of ``y``, ``y ** 2`` and ``log(y)``.
+
+    values : tuple or None
+        Sorted incomes and their weights (None if not weighted), or None
+        if the state does not keep the values.
+
+    sketch : QuantileSketch or None
+        Quantile sketch of the incomes, if any.
+
+    """
+
+    count = attr.ib()
+    population = attr.ib()
+    minimum = attr.ib()
+    maximum = attr.ib()
+    sums = attr.ib()
+    log_sum = attr.ib()
+    ylog_sum = attr.ib()
+    poor = attr.ib()
+    values = attr.ib(default=None)
+    sketch = attr.ib(default=None)
+
+    @classmethod
+    def from_array(
+        cls,
+        y,
+        weights=None,
+        exponents=(),
+        plines=(),
+        keep_values=False,
+        sketch=None,
+    ):
+        """Summarize a chunk of incomes.
+
+        Parameters
+        ----------
+        y : array_like
+            Income values.
+
+        weights : array_like, optional(default=None)
+            Sampling weights of each income.
+
+        exponents : iterable, optional(default=())
+            Extra power sums to keep, e.g. ``1 - alpha`` for the
+            Atkinson index or ``alpha`` for the entropy index.
+
+        plines : iterable, optional(default=())
+            Absolute poverty lines of the poverty measures.
+
+        keep_values : bool, optional(default=False)
+            Keep the sorted incomes, so that every measure can be
+            evaluated exactly (memory grows with the data).
+
+        sketch : int, optional(default=None)
+            Keep a ``QuantileSketch`` with this ``k`` (bounded memory) to
+            approximate relative poverty lines. Weights must be integers.
+
+        Return
+        ------
+        out: State
+            Summary of the chunk.
+
+        """
+        y = np.asarray(y, dtype=float)
+        w = np.ones(len(y)) if weights is None else np.asarray(weights)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logy = np.log(y)
+            ylogy = np.where(y == 0, 0.0, y * logy)
+        exponents = sorted({1, 2, *exponents})
+        sums = {e: np.sum(w * np.power(y, e)) for e in exponents}
+        poor = {}
+        for z in plines:
+            if z <= 0:
+                raise ValueError(f"'pline' must be > 0. Found '{z}'")
+            below = y < z
+            wb = w[below]
+            yb = y[below]
+            poor[z] = np.array(
+                [
+                    np.sum(wb),
+                    np.sum(wb * yb),
+                    np.sum(wb * yb * yb),
+                    np.sum(wb * logy[below]),
+                ]
+            )
+        values = None
+        if keep_values:
+            order = np.argsort(y, kind="mergesort")
+            ws = None if weights is None else w[order]
+            values = (y[order], ws)
+        if sketch is not None:
+            sketch = QuantileSketch.from_array(y, weights, k=sketch)
+        return cls(
+            count=len(y),
+            population=np.sum(w),
+            minimum=np.min(y) if len(y) else np.inf,
+            maximum=np.max(y) if len(y) else -np.inf,
+            sums=sums,
+            log_sum=np.sum(w * logy),
+            ylog_sum=np.sum(w * ylogy),
+            poor=poor,
+            values=values,
+            sketch=sketch,
+        )
+
+    def __repr__(self):
+        """Apply Display method."""
+        exact = ", exact" if self.values is not None else ""
+        return f"State(n={self.count}, population={self.population}{exact})"
+
+    @property
+    def mean(self):
+        """Mean income."""
+        return self.sums[1] / self.population
+
+    def merge(self, other):
+        """Combine with the state of another chunk.
+
+        Both states must keep the same statistics (exponents, poverty
+        lines, values and sketch).
+
+        Parameters
+        ----------
+        other : State
+            State of another chunk.
+
+        Return
+        ------
+        out: State
+            State of the union of both chunks.
+
+        """
+        if (
+            self.sums.keys() != other.sums.keys()
+            or self.poor.keys() != other.poor.keys()
+            or (self.values is None) != (other.values is None)
+            or (self.sketch is None) != (other.sketch is None)
+        ):
+            raise ValueError(
+                "States with different statistics cannot be merged"
+            )
+        values = None
+        if self.values is not None:
+            values = _merge_runs(self.values, other.values)
+        sketch = None
+        if self.sketch is not None:
+            sketch = self.sketch.merge(other.sketch)
+        return State(
+            count=self.count + other.count,
+            population=self.population + other.population,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum),
+            sums={e: s + other.sums[e] for e, s in self.sums.items()},
+            log_sum=self.log_sum + other.log_sum,
+            ylog_sum=self.ylog_sum + other.ylog_sum,
+            poor={z: p + other.poor[z] for z, p in self.poor.items()},
+            values=values,
+            sketch=sketch,
+        )
+
+    def finalize(self, measure, **kwargs):
+        """Evaluate a measure on the summarized data.
+
+        Parameters
+        ----------
+        measure : str or tuple
+            Measure as ``"family.method"`` (e.g. ``"inequality.gini"``)
+            or ``(family, method)``.
+
+        kwargs :
+            Parameters of the measure.
+
+        Return
+        ------
+        out: float
+            Value of the measure.
+
+        """
+        family, method = split_measure(measure)
+        if self.values is not None:
+            view = IncomeView(IncomeCache.from_sorted(*self.values))
+            return getattr(getattr(view, family), method)(**kwargs)
+        func = _FINALIZERS.get((family, method))
+        pline = kwargs.get("pline")
+        if func is not None and family == "poverty" and np.ndim(pline):
+            lines = np.asarray(pline, dtype=float)
+            if all(z in self.poor for z in lines.ravel()):
+                params = {k: v for k, v in kwargs.items() if k != "pline"}
+                values = [func(self, pline=z, **params) for z in lines.ravel()]
+                return np.reshape(values, lines.shape)
+        if self.sketch is not None and family == "poverty":
+            pline = kwargs.get("pline")
+            if func is None or np.ndim(pline) or pline not in self.poor:
+                return self._finalize_sketch(method, **kwargs)
+        if func is None:
+            raise ValueError(
+                f"'{family}.{method}' needs the sorted values, build the "
+                "state with keep_values=True"
+            )
+        return func(self, **kwargs)
+
+    def _finalize_sketch(self, method, **kwargs):
+        """Approximate a poverty measure on the quantile sketch."""
+        if kwargs.get("pline") == "mean":
+            kwargs["pline"] = kwargs.pop("factor", 1.0) * self.mean
+        view = IncomeView(self.sketch.cache())
+        return getattr(view.poverty, method)(**kwargs)
+
+    def power_sum(self, exponent):
+        """Weighted sum of ``y ** exponent``."""
+        if exponent == 0:
+            return self.population
+        try:
+            return self.sums[exponent]
+        except KeyError:
+            raise ValueError(
+                f"State has no power sum of order {exponent}, build it "
+                f"with exponents=({exponent},)"
+            )
+
+    def below(self, pline):
+        """Persons below ``pline`` and their sums of y, y**2 and log(y)."""
+        if np.ndim(pline) or pline not in self.poor:
+            raise ValueError(
+                f"State has no statistics for pline={pline!r}, build it "
+                f"with plines=({pline!r},)"
+            )
+        return self.poor[pline]
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _merge_runs(a, b):
+    """Merge two sorted runs of incomes and weights.
+
+    The records of ``b`` are placed with a binary search into ``a``, as
+    in ``IncomeCache.extend``, so nothing is re-sorted; records of ``a``
+    go first among equal values, as in a stable sort.
+    """
+    na, nb = len(a[0]), len(b[0])
+    pos = np.searchsorted(a[0], b[0], side="right")
+    b_idx = pos + np.arange(nb)
+    a_idx = np.arange(na) + np.searchsorted(pos, np.arange(na), side="right")
+
+    def gather(x, y):
+        merged = np.empty(na + nb, dtype=np.result_type(x, y))
+        merged[a_idx] = x
+        merged[b_idx] = y
+        return merged
+
+    ys = gather(a[0], b[0])
+    if a[1] is None and b[1] is None:
+        return ys, None
+    wa = np.ones(na) if a[1] is None else a[1]
+    wb = np.ones(nb) if b[1] is None else b[1]
+    return ys, gather(wa, wb)
+
+
+def _fgt(state, pline=None, alpha=0):
+    """FGT index from a state."""
+    if alpha not in (0, 1, 2):
+        raise ValueError(
+            f"'alpha' must be 0, 1 or 2 without values. Found '{alpha}'"
+        )
+    p, s1, s2, _ = state.below(pline)
+    if alpha == 0:
+        value = p
+    elif alpha == 1:
+        value = p - s1 / pline
+    else:
+        value = p - 2 * s1 / pline + s2 / (pline * pline)
+    return value / state.population
+
+
+def _watts(state, pline=None):
+    """Watts index from a state."""
+    p, _, _, slog = state.below(pline)
+    return (p * np.log(pline) - slog) / state.population
+
+
+def _entropy(state, alpha=0):
+    """Generalized entropy index from a state."""
+    a = alpha
+    n = state.population
+    u = state.mean
+    if a == 0.0:
+        return np.log(u) - state.log_sum / n
+    elif a == 1.0:
+        return state.ylog_sum / (n * u) - np.log(u)
+    return (1 / (a * (a - 1))) * (state.power_sum(a) / (n * u ** a) - 1)
+
+
+def _atkinson(state, alpha=2):
+    """Atkinson index from a state."""
+    if alpha <= 0:
+        raise ValueError("Alpha must be strictly positive (>0.0)")
+    n = state.population
+    if alpha == 1:
+        return 1 - np.exp(state.log_sum / n) / state.mean
+    a1 = state.power_sum(1 - alpha) / n
+    return 1 - np.power(a1, 1 / (1 - alpha)) / state.mean
+
+
+def _cv(state):
+    """Coefficient of variation from a state."""
+    u = state.mean
+    var = state.sums[2] / state.population - u * u
+    return np.sqrt(max(var, 0.0)) / u
+
+
+def _herfindahl(state, normalized=True):
+    """Herfindahl-Hirschman index from a state."""
+    n = state.population
+    h = state.sums[2] / (state.sums[1] * state.sums[1])
+    if normalized:
+        return (h - 1.0 / n) / (1.0 - 1.0 / n)
+    return h
+
+
+def _isoelastic(state, alpha):
+    """Isoelastic welfare from a state."""
+    n = state.population
+    if alpha == 0:
+        return state.mean
+    elif alpha == np.inf:
+        return state.minimum
+    elif alpha == 1:
+        return state.log_sum / n
+    return state.power_sum(1 - alpha) / n / (1 - alpha)
+
+
+_FINALIZERS = {
+    ("poverty", "headcount"): lambda s, pline=None: _fgt(s, pline, 0),
+    ("poverty", "gap"): lambda s, pline=None: _fgt(s, pline, 1),
+    ("poverty", "severity"): lambda s, pline=None: _fgt(s, pline, 2),
+    ("poverty", "fgt"): _fgt,
+    ("poverty", "watts"): _watts,
+    ("inequality", "rrange"): lambda s: (s.maximum - s.minimum) / s.mean,
+    ("inequality", "cv"): _cv,
+    ("inequality", "entropy"): _entropy,
+    ("inequality", "atkinson"): _atkinson,
+    ("concentration", "herfindahl"): _herfindahl,
+    ("welfare", "utilitarian"): lambda s: s.mean,
+    ("welfare", "rawlsian"): lambda s: s.minimum,
+    ("welfare", "isoelastic"): _isoelastic,
+    ("welfare", "theill"): lambda s: s.mean * np.exp(-_entropy(s, 0)),
+    ("welfare", "theilt"): lambda s: s.mean * np.exp(-_entropy(s, 1)),
+}
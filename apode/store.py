@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Pre-sorted binary income stores for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import json
+import os
+
+import numpy as np
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+STORE_VERSION = 1
+
+_METADATA = "apode.json"
+
+# Arrays of a store: file name and IncomeCache primitive.
+_ARRAYS = {
+    "ys": "ys",
+    "order": "order",
+    "ws": "ws",
+    "prefix0": ("prefix", 0),
+    "prefix1": ("prefix", 1),
+}
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def save_store(idf, path):
+    """Write the incomes of an ApodeData to a pre-sorted store.
+
+    A store is a directory of ``.npy`` files: the incomes (and weights)
+    in their original order, the sorted incomes (and weights), the
+    sorting permutation and the prefix sums of persons and incomes, plus
+    an ``apode.json`` file with the metadata. Only the income and weight
+    columns are stored; integer incomes are stored as float64.
+
+    Parameters
+    ----------
+    idf : ApodeData
+        Data to store. Its cache is used (the sort is done now if it was
+        not done before).
+
+    path : str or path-like
+        Directory of the store, created if needed. Existing files of a
+        store are overwritten.
+
+    """
+    os.makedirs(path, exist_ok=True)
+    cache = idf.cache
+    # incomes are stored as float64, or float32 if they are float32, as
+    # ApodeData.from_array keeps them
+    dtype = np.float32 if cache.y.dtype == np.float32 else np.float64
+    arrays = {
+        "y": cache.y.astype(dtype, copy=False),
+        "ys": cache.ys.astype(dtype, copy=False),
+        "order": cache.order,
+    }
+    arrays["prefix1"] = cache.prefix(1)
+    if cache.weighted:
+        arrays.update(
+            weights=cache.weights, ws=cache.ws, prefix0=cache.prefix(0)
+        )
+    for name, values in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), values)
+    metadata = {
+        "version": STORE_VERSION,
+        "n": int(cache.n),
+        "income_column": idf.income_column,
+        "weight_column": idf.weight_column,
+        "arrays": sorted(arrays),
+    }
+    with open(os.path.join(path, _METADATA), "w") as fp:
+        json.dump(metadata, fp, indent=2)
+
+
+def open_store(path, mmap_mode="r"):
+    """Open a store written by ``save_store``.
+
+    The arrays are memory mapped (nothing is read until a measure needs
+    it) and the sorted values, permutation and prefix sums are loaded in
+    the income cache, so no measure sorts the incomes again.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Directory of the store.
+
+    mmap_mode : str, optional(default="r")
+        Memory map mode of ``np.load``; ``None`` reads the arrays in
+        memory.
+
+    Return
+    ------
+    out: ApodeData
+        Data over the stored incomes and weights.
+
+    """
+    from .basic import ApodeData
+
+    with open(os.path.join(path, _METADATA)) as fp:
+        metadata = json.load(fp)
+    if metadata.get("version") != STORE_VERSION:
+        raise ValueError(
+            f"Unsupported store version {metadata.get('version')!r}"
+        )
+
+    def load(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    weight_column = metadata["weight_column"]
+    y = load("y")
+    idf = ApodeData._from_vectors(
+        y,
+        None if weight_column is None else load("weights"),
+        metadata["income_column"],
+        weight_column,
+    )
+    primitives = {
+        key: load(name)
+        for name, key in _ARRAYS.items()
+        if name in metadata["arrays"]
+    }
+    primitives["cumsum"] = primitives[("prefix", 1)][1:]
+    idf.cache.preload(primitives)
+    return idf
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Linearized variance estimators for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import numpy as np
+
+from .poverty import _get_pline
+from .view import IncomeView, split_measure
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def influence(cache, measure, **kwargs):
+    """Empirical influence function of a measure.
+
+    The linearization ``theta_hat - theta ~ sum_i w_i z_i / N`` of the
+    measure, where ``z_i`` is the influence of the ``i``-th sorted
+    record. Relative poverty lines add the influence of the line: the
+    mean for ``'mean'`` and the quantile (with a Gaussian kernel density
+    at the line) for ``'median'``, ``'quantile'`` and ``None``.
+
+    Available for poverty ``headcount``, ``gap``, ``severity``, ``fgt``,
+    ``watts`` and ``sen``; inequality ``gini``, ``entropy`` and
+    ``atkinson``; and welfare ``utilitarian``.
+
+    Parameters
+    ----------
+    cache : IncomeCache
+        Income cache of the data (``ApodeData.cache``).
+
+    measure : str or tuple
+        Measure as ``"family.method"`` or ``(family, method)``.
+
+    kwargs :
+        Parameters of the measure.
+
+    Return
+    ------
+    out: ndarray
+        Influence of every record, in the order of ``cache.ys``.
+
+    """
+    family, method = split_measure(measure)
+    try:
+        func = _INFLUENCE[(family, method)]
+    except KeyError:
+        raise ValueError(f"No linearized variance for '{family}.{method}'")
+    return func(cache, **kwargs)
+
+
+def linearized_se(cache, measure, **kwargs):
+    """Linearized (Taylor) standard error of a measure.
+
+    Records are taken as independent draws (with replacement) carrying
+    their sampling weights, so the variance is the weighted variance of
+    the influence values over ``n`` records. The cost is that of the
+    point estimate: a pass over the sorted values and their prefix sums.
+
+    Parameters
+    ----------
+    cache : IncomeCache
+        Income cache of the data (``ApodeData.cache``).
+
+    measure : str or tuple
+        Measure as ``"family.method"``; see ``influence``.
+
+    kwargs :
+        Parameters of the measure.
+
+    Return
+    ------
+    out: float
+        Standard error.
+
+    """
+    z = influence(cache, measure, **kwargs)
+    n = cache.n
+    if n < 2:
+        return np.nan
+    w = 1.0 if not cache.weighted else cache.ws
+    total = cache.population
+    zbar = np.sum(w * z) / total
+    var = np.sum(w * w * np.square(z - zbar)) / (total * total)
+    return np.sqrt(var * n / (n - 1))
+
+
+def _wmean(cache, values):
+    """Return the (weighted) mean of per record values."""
+    if cache.weighted:
+        return np.sum(cache.ws * values) / cache.population
+    return np.mean(values)
+
+
+def _density(cache, x):
+    """Gaussian kernel density of the incomes at ``x``.
+
+    Silverman's rule of thumb bandwidth.
+    """
+    ys = cache.ys
+    sd = np.sqrt(_wmean(cache, np.square(ys - cache.mean)))
+    iqr = cache.quantile(0.75) - cache.quantile(0.25)
+    spread = min(sd, iqr / 1.34) if iqr > 0 else sd
+    h = 0.9 * spread * cache.population ** (-0.2)
+    u = (x - ys) / h
+    return _wmean(cache, np.exp(-0.5 * u * u)) / (h * np.sqrt(2 * np.pi))
+
+
+def _quantile_influence(cache, q):
+    """Influence function of the quantile ``q``."""
+    value = cache.quantile(q)
+    return (q - (cache.ys <= value)) / _density(cache, value)
+
+
+def _line_influence(cache, pline, factor, q):
+    """Influence function of the poverty line."""
+    if pline is None:
+        return 0.5 * _quantile_influence(cache, 0.5)
+    if pline == "median":
+        return factor * _quantile_influence(cache, 0.5)
+    if pline == "mean":
+        return factor * (cache.ys - cache.mean)
+    if pline == "quantile":
+        return factor * _quantile_influence(cache, q)
+    return 0.0
+
+
+def _fgt_terms(ys, z, alpha):
+    """Return the FGT term of every record for the line ``z``."""
+    poor = ys < z
+    if alpha == 0:
+        return poor.astype(float)
+    gap = np.where(poor, (z - ys) / z, 1.0)
+    with np.errstate(divide="ignore"):
+        return np.where(poor, np.power(gap, alpha), 0.0)
+
+
+def _fgt_influence(cache, pline=None, alpha=0, factor=1.0, q=None):
+    """Influence function of the FGT index."""
+    if alpha < 0:
+        raise ValueError(f"'alpha' must be >= 0. Found '{alpha}'")
+    z = _get_pline(cache, pline, factor, q)
+    ys = cache.ys
+    terms = _fgt_terms(ys, z, alpha)
+    value = _wmean(cache, terms)
+    if alpha == 0:
+        dz = _density(cache, z)
+    else:
+        lower = _wmean(cache, _fgt_terms(ys, z, alpha - 1))
+        dz = alpha / z * (lower - value)
+    return terms - value + dz * _line_influence(cache, pline, factor, q)
+
+
+def _watts_influence(cache, pline=None, factor=1.0, q=None):
+    """Influence function of the Watts index."""
+    z = _get_pline(cache, pline, factor, q)
+    ys = cache.ys
+    poor = ys < z
+    with np.errstate(divide="ignore"):
+        terms = np.where(poor, np.log(z / np.where(poor, ys, z)), 0.0)
+    value = _wmean(cache, terms)
+    dz = _wmean(cache, poor) / z
+    return terms - value + dz * _line_influence(cache, pline, factor, q)
+
+
+def _sen_influence(cache, pline=None, factor=1.0, q=None):
+    """Influence function of the Sen index (p0 * G + p1 * (1 - G))."""
+    poverty = IncomeView(cache).poverty
+    p0 = poverty.headcount(pline=pline, factor=factor, q=q)
+    p1 = poverty.gap(pline=pline, factor=factor, q=q)
+    g = IncomeView(cache).inequality.gini()
+    z0 = _fgt_influence(cache, pline, 0, factor, q)
+    z1 = _fgt_influence(cache, pline, 1, factor, q)
+    return z0 * g + z1 * (1 - g) + (p0 - p1) * _gini_influence(cache)
+
+
+def _gini_influence(cache):
+    """Influence function of the Gini coefficient.
+
+    With ``G = E[y (2 F(y) - 1)] / mean``, the influence of the
+    numerator ``A`` at ``x`` is
+    ``x (2 F(x) - 1) - A + 2 E[y 1(y >= x)] - (A + mean)``.
+    """
+    ys = cache.ys
+    u = cache.mean
+    n = cache.population
+    g = IncomeView(cache).inequality.gini()
+    w = 1.0 if not cache.weighted else cache.ws
+    f = (cache.prefix(0)[:-1] + w / 2) / n
+    above = (cache.prefix(1)[-1] - cache.prefix(1)[:-1]) / n
+    a = g * u
+    ia = ys * (2 * f - 1) - a + 2 * above - (a + u)
+    return ia / u - g * (ys - u) / u
+
+
+def _entropy_influence(cache, alpha=0):
+    """Influence function of the generalized entropy index."""
+    a = alpha
+    ys = cache.ys
+    u = cache.mean
+    if a == 0.0:
+        logs = cache.logys
+        return (ys - u) / u - (logs - _wmean(cache, logs))
+    elif a == 1.0:
+        ylogy = ys * cache.logys
+        m = _wmean(cache, ylogy)
+        return (ylogy - m) / u - m * (ys - u) / u ** 2 - (ys - u) / u
+    power = cache.power(a)
+    m = _wmean(cache, power)
+    return ((power - m) / u ** a - a * m * (ys - u) / u ** (a + 1)) / (
+        a * (a - 1)
+    )
+
+
+def _atkinson_influence(cache, alpha=2):
+    """Influence function of the Atkinson index."""
+    if alpha <= 0:
+        raise ValueError("Alpha must be strictly positive (>0.0)")
+    ys = cache.ys
+    u = cache.mean
+    if alpha == 1:
+        logs = cache.logys
+        ede = np.exp(_wmean(cache, logs))
+        iede = ede * (logs - _wmean(cache, logs))
+    else:
+        e = 1 - alpha
+        power = cache.power(e)
+        m = _wmean(cache, power)
+        ede = np.power(m, 1 / e)
+        iede = np.power(m, 1 / e - 1) * (power - m) / e
+    return -(iede / u - ede * (ys - u) / u ** 2)
+
+
+_INFLUENCE = {
+    ("poverty", "headcount"): lambda c, pline=None, factor=1.0, q=None: (
+        _fgt_influence(c, pline, 0, factor, q)
+    ),
+    ("poverty", "gap"): lambda c, pline=None, factor=1.0, q=None: (
+        _fgt_influence(c, pline, 1, factor, q)
+    ),
+    ("poverty", "severity"): lambda c, pline=None, factor=1.0, q=None: (
+        _fgt_influence(c, pline, 2, factor, q)
+    ),
+    ("poverty", "fgt"): _fgt_influence,
+    ("poverty", "watts"): _watts_influence,
+    ("poverty", "sen"): _sen_influence,
+    ("inequality", "gini"): _gini_influence,
+    ("inequality", "entropy"): _entropy_influence,
+    ("inequality", "atkinson"): _atkinson_influence,
+    ("welfare", "utilitarian"): lambda c: c.ys - c.mean,
+}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Lightweight measure views for Apode."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+from functools import cached_property
+
+import attr
+
+from .concentration import ConcentrationMeasures
+from .inequality import InequalityMeasures
+from .polarization import PolarizationMeasures
+from .poverty import PovertyMeasures
+from .welfare import WelfareMeasures
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MEASURES = {
+    "poverty": PovertyMeasures,
+    "inequality": InequalityMeasures,
+    "polarization": PolarizationMeasures,
+    "concentration": ConcentrationMeasures,
+    "welfare": WelfareMeasures,
+}
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attr.s(frozen=True, repr=False)
+class IncomeView:
+    """Measures over an IncomeCache, without a DataFrame.
+
+    The measure accessors only read the income cache of the object they
+    are bound to, so a view can evaluate them on a subgroup, a resample
+    or a single income column without building an ApodeData (and
+    copying its DataFrame).
+
+    Parameters
+    ----------
+    cache : IncomeCache
+        Income cache to evaluate the measures on.
+
+    """
+
+    cache = attr.ib()
+
+    def __repr__(self):
+        """Apply Display method."""
+        return f"IncomeView({self.cache!r})"
+
+    @cached_property
+    def poverty(self):
+        """Poverty measures."""
+        return PovertyMeasures(self)
+
+    @cached_property
+    def inequality(self):
+        """Inequality measures."""
+        return InequalityMeasures(self)
+
+    @cached_property
+    def polarization(self):
+        """Polarization measures."""
+        return PolarizationMeasures(self)
+
+    @cached_property
+    def concentration(self):
+        """Concentration measures."""
+        return ConcentrationMeasures(self)
+
+    @cached_property
+    def welfare(self):
+        """Welfare measures."""
+        return WelfareMeasures(self)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def split_measure(measure):
+    """Check/split a measure given as ``"family.method"`` or a tuple.
+
+    Parameters
+    ----------
+    measure : str or tuple
+        Measure as ``"family.method"`` (e.g. ``"inequality.gini"``) or
+        ``(family, method)``.
+
+    Return
+    ------
+    out: tuple
+        ``(family, method)``.
+
+    """
+    if isinstance(measure, str):
+        measure = tuple(measure.split("."))
+    if len(measure) != 2 or measure[0] not in MEASURES:
+        raise ValueError(
+            "measure must be 'family.method' with family in "
+            f"{tuple(MEASURES)}. Found '{measure}'"
+        )
+    family, method = measure
+    if method.startswith("_") or not hasattr(MEASURES[family], method):
+        raise AttributeError(f"'{family}' has no measure named '{method}'")
+    return family, method
@@ -20,12 +20,16 @@ import attr
 
 import numpy as np
 
+from .precision import fsum
+from .profiling import instrument
+
 
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
 
 
+@instrument("welfare")
 @attr.s(frozen=True)
 class WelfareMeasures:
     """Welfare Measures.
@@ -67,8 +71,7 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        return np.mean(y)
+        return self.idf.cache.mean
 
     def rawlsian(self):
         """Rawlsian utility function.
@@ -81,8 +84,8 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        return min(y)
+        cache = self.idf.cache
+        return cache.ys[0]
 
     def isoelastic(self, alpha):
         """Isoelastic utility function.
@@ -95,14 +98,21 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
+        cache = self.idf.cache
+        y = cache.y
         if alpha == 0:
-            return np.mean(y)
+            return cache.mean
         elif alpha == np.Inf:
-            return np.min(y)
+            return cache.ys[0]
+        elif cache.weighted:
+            n = cache.population
+            if alpha == 1:
+                return np.sum(cache.ws * cache.logys) / n
+            su = np.sum(cache.ws * cache.power(1 - alpha))
+            return su / n / (1 - alpha)
         elif alpha == 1:
-            return (1 / len(y)) * np.sum(np.log(y))
-        return (1 / len(y)) * np.sum(np.power(y, 1 - alpha)) / (1 - alpha)
+            return (1 / len(y)) * fsum(np.log(y))
+        return (1 / len(y)) * fsum(np.power(y, 1 - alpha)) / (1 - alpha)
 
     def sen(self):
         """Sen utility function.
@@ -115,8 +125,7 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        u = np.mean(y)
+        u = self.idf.cache.mean
         g = self.idf.inequality.gini()
         return u * (1 - g)
 
@@ -131,8 +140,7 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        u = np.mean(y)
+        u = self.idf.cache.mean
         tl = self.idf.inequality.entropy(alpha=0)
         return u * np.exp(-tl)
 
@@ -147,7 +155,6 @@ class WelfareMeasures:
             Utility value.
 
         """
-        y = self.idf.data[self.idf.income_column].values
-        u = np.mean(y)
+        u = self.idf.cache.mean
         tt = self.idf.inequality.entropy(alpha=1)
         return u * np.exp(-tt)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+"""Scaling benchmarks of every measure (airspeed velocity).
+
+Every benchmark builds a fresh ApodeData over the income array, so the
+time and the peak memory include the sort and the cached primitives
+that a first query pays. Run with ``asv run`` (see ``asv.conf.json``);
+set ``APODE_BENCH_MAX_SIZE`` to skip the largest inputs, e.g. on CI.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import os
+
+from apode import ApodeData, datasets
+
+import numpy as np
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MAX_SIZE = int(float(os.environ.get("APODE_BENCH_MAX_SIZE", "1e8")))
+
+SIZES = [10 ** e for e in range(3, 9) if 10 ** e <= MAX_SIZE]
+
+DISTRIBUTIONS = {
+    "lognormal": lambda n: datasets.make_lognormal(seed=42, size=n),
+    "pareto": lambda n: datasets.make_pareto(seed=42, size=n),
+    "uniform": lambda n: datasets.make_uniform(seed=42, size=n),
+    "bimodal": lambda n: datasets.make_bimodal(size=n),
+}
+
+
+def _band(y):
+    """Poverty lines from half to one and a half times the median."""
+    median = np.median(y[y > 0])
+    return {"zmin": 0.5 * median, "zmax": 1.5 * median}
+
+
+def _other(y):
+    """Parameters of a comparison with another distribution."""
+    params = _band(y)
+    params["other"] = ApodeData.from_array(1.1 * y)
+    return params
+
+
+# Parameters of every measure; a callable builds them from the incomes.
+MEDIAN = {"pline": "median", "factor": 0.6}
+MEASURES = {
+    "poverty": {
+        "headcount": MEDIAN,
+        "gap": MEDIAN,
+        "severity": MEDIAN,
+        "fgt": dict(MEDIAN, alpha=1.5),
+        "sen": MEDIAN,
+        "sst": MEDIAN,
+        "watts": MEDIAN,
+        "cuh": dict(MEDIAN, alpha=0.5),
+        "takayama": MEDIAN,
+        "kakwani": MEDIAN,
+        "thon": MEDIAN,
+        "bd": MEDIAN,
+        "hagenaars": MEDIAN,
+        "chakravarty": MEDIAN,
+        "fgt_curve": _band,
+        "deficit_curve": _band,
+        "dominance": _other,
+    },
+    "inequality": {
+        "rrange": {},
+        "rad": {},
+        "cv": {},
+        "sdlog": {},
+        "ratio": {"alpha": 0.1},
+        "gini": {},
+        "merhan": {},
+        "piesch": {},
+        "bonferroni": {},
+        "kolm": {"alpha": 0.5},
+        "entropy": {"alpha": 0.5},
+        "atkinson": {"alpha": 2},
+    },
+    "welfare": {
+        "utilitarian": {},
+        "rawlsian": {},
+        "isoelastic": {"alpha": 2},
+        "sen": {},
+        "theill": {},
+        "theilt": {},
+    },
+    "polarization": {"ray": {}, "wolfson": {}},
+    "concentration": {
+        "herfindahl": {},
+        "rosenbluth": {},
+        "concentration_ratio": {"k": 10},
+    },
+    "plot": {
+        "_lorenz_data": {},
+        "_pen_data": lambda y: {"pline": np.median(y)},
+        "_tip_data": lambda y: {"pline": np.median(y)},
+    },
+}
+
+_DATA = {}
+
+
+def _incomes(distribution, size):
+    """Income array of a dataset, generated once per process."""
+    key = (distribution, size)
+    if key not in _DATA:
+        idf = DISTRIBUTIONS[distribution](size)
+        _DATA[key] = np.ascontiguousarray(idf.data[idf.income_column])
+    return _DATA[key]
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+class _Family:
+    """Time and peak memory of every method of an accessor."""
+
+    family = None
+    param_names = ["method", "size", "distribution"]
+    timeout = 600
+
+    def setup(self, method, size, distribution):
+        self.y = _incomes(distribution, size)
+        params = MEASURES[self.family][method]
+        self.kwargs = params(self.y) if callable(params) else params
+
+    def _run(self, method):
+        idf = ApodeData.from_array(self.y)
+        return getattr(getattr(idf, self.family), method)(**self.kwargs)
+
+    def time_measure(self, method, size, distribution):
+        self._run(method)
+
+    def peakmem_measure(self, method, size, distribution):
+        self._run(method)
+
+
+def _family(name, family):
+    """Benchmark class of a measure family."""
+    params = [list(MEASURES[family]), SIZES, list(DISTRIBUTIONS)]
+    return type(name, (_Family,), {"family": family, "params": params})
+
+
+Poverty = _family("Poverty", "poverty")
+Inequality = _family("Inequality", "inequality")
+Welfare = _family("Welfare", "welfare")
+Polarization = _family("Polarization", "polarization")
+Concentration = _family("Concentration", "concentration")
+PlotData = _family("PlotData", "plot")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/ngrion/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+"""Empirical complexity of every measure.
+
+Each measure is timed over a geometric ladder of input sizes (fresh
+ApodeData every call, so the sort is included) and the scaling exponent
+is the slope of ``log(time)`` against ``log(n)``. ``O(n log n)`` gives
+about 1.1 over the default ladder; a quadratic path gives about 2.
+Run ``python -m benchmarks.complexity`` for the table; wall-clock fits
+are noisy on shared machines, so the unit suite runs them only with
+``pytest --run-complexity``.
+
+``measure_work`` counts the work of a call instead (sorts, cached bytes
+and traced peak memory, see ``apode.profiling``), which is deterministic
+and is what the default test suite checks across ``WORK_SIZES``. The
+suite also checks ``sort_ratio`` over ``SORT_SIZES``: the time of the
+measure relative to a ``np.sort`` of the same size timed in the same
+process, which catches quadratic time with linear memory.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import time
+
+from apode import ApodeData
+from apode.profiling import measure_call, profile
+
+import numpy as np
+
+from .bench_measures import MEASURES
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+LADDER = [10_000 * 2 ** k for k in range(5)]
+
+# Largest exponent accepted: O(n log n) plus timing noise.
+MAX_EXPONENT = 1.3
+
+# Sizes of the work counts, ``WORK_SIZES[1] / WORK_SIZES[0]`` apart.
+WORK_SIZES = [5_000, 20_000]
+
+# Sizes of ``sort_ratio``, far enough apart for a quadratic path to stand
+# out of the noise.
+SORT_SIZES = [5_000, 40_000]
+
+# Largest growth accepted by ``sort_ratio``: measures give about 0.8 over
+# SORT_SIZES, a quadratic path (even a loop with linear memory) about 4.
+MAX_SORT_RATIO = 2.0
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def scaling_exponent(func, sizes=LADDER, repeats=3):
+    """Fit the empirical scaling exponent of ``func(n)``.
+
+    Parameters
+    ----------
+    func : callable
+        Function of the input size; ``func(n)`` returns the callable to
+        time (setup work stays out of the timing).
+
+    sizes : list, optional(default=LADDER)
+        Input sizes, ideally a geometric ladder.
+
+    repeats : int, optional(default=3)
+        Timings per size; the fastest one is kept.
+
+    Return
+    ------
+    out: float
+        Slope of ``log(time)`` against ``log(size)``.
+
+    """
+    times = [_best_time(func(n), repeats) for n in sizes]
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return slope
+
+
+def sort_ratio(func, sizes=SORT_SIZES, repeats=5):
+    """Growth of the time of ``func(n)`` relative to ``np.sort``.
+
+    Every size is timed against a sort of ``n`` floats in the same
+    process, so the speed (and load) of the machine cancels out. Between
+    ``sizes[0]`` and ``sizes[1]`` an ``O(n log n)`` measure gives about 1
+    (less if fixed costs dominate) and a quadratic one about
+    ``sizes[1] / sizes[0]``.
+
+    Parameters
+    ----------
+    func : callable
+        Function of the input size, as in ``scaling_exponent``.
+
+    sizes : list, optional(default=SORT_SIZES)
+        Smallest and largest input sizes.
+
+    repeats : int, optional(default=5)
+        Timings per size; the fastest one is kept.
+
+    Return
+    ------
+    out: float
+        Time of ``func`` over the time of the sort at ``sizes[-1]``,
+        divided by the same quotient at ``sizes[0]``.
+
+    """
+    quotients = []
+    for n in (sizes[0], sizes[-1]):
+        y = np.random.default_rng(0).random(n)
+        reference = _best_time(lambda: np.sort(y), repeats)
+        quotients.append(_best_time(func(n), repeats) / reference)
+    return quotients[1] / quotients[0]
+
+
+def _best_time(run, repeats):
+    """Fastest of ``repeats`` timings of ``run()``."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_runner(family, method, seed=42):
+    """Return ``func(n)`` timing a measure on ``n`` lognormal incomes."""
+    params = MEASURES[family][method]
+
+    def func(n):
+        y = np.random.default_rng(seed).lognormal(size=n)
+        kwargs = params(y) if callable(params) else params
+
+        def run():
+            idf = ApodeData.from_array(y)
+            return getattr(getattr(idf, family), method)(**kwargs)
+
+        return run
+
+    return func
+
+
+def measure_work(family, method, n, seed=42):
+    """Count the work of a measure on ``n`` lognormal incomes.
+
+    Parameters
+    ----------
+    family, method : str
+        Measure, as in ``benchmarks.bench_measures.MEASURES``.
+
+    n : int
+        Number of incomes (a fresh ApodeData, so the sort is counted).
+
+    seed : int, optional(default=42)
+        Seed of the incomes.
+
+    Return
+    ------
+    out: CallStats
+        Sorts, cached bytes and peak memory of the call.
+
+    """
+    params = MEASURES[family][method]
+    y = np.random.default_rng(seed).lognormal(size=n)
+    kwargs = params(y) if callable(params) else params
+    with profile(trace_memory=True) as prof:
+        with measure_call(f"{family}.{method}", kwargs):
+            idf = ApodeData.from_array(y)
+            getattr(getattr(idf, family), method)(**kwargs)
+    return prof.calls[0]
+
+
+def main():
+    """Print the scaling exponent of every measure."""
+    for family, methods in MEASURES.items():
+        for method in methods:
+            exponent = scaling_exponent(measure_runner(family, method))
+            flag = "  <-- super-linear" if exponent > MAX_EXPONENT else ""
+            name = f"{family}.{method}"
+            print(f"{name:<36} {exponent:5.2f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@
 import os
 import pathlib
 
+from apode import ApodeData
+
+import numpy as np
+
 import pandas as pd
 
 import pytest
@@ -19,6 +23,29 @@ PATH = pathlib.Path(os.path.abspath(os.path.dirname((__file__))))
 TEST_DATA_PATH = PATH / "test_data"
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-complexity",
+        action="store_true",
+        help="run the wall-clock complexity fits (noisy on shared boxes)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "complexity: wall-clock scaling fit, see --run-complexity"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-complexity"):
+        return
+    skip = pytest.mark.skip(reason="needs --run-complexity")
+    for item in items:
+        if item.get_closest_marker("complexity"):
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope="session")
 def income_arrays():
     return pd.read_csv(TEST_DATA_PATH / "income.csv")
@@ -27,3 +54,42 @@ def income_arrays():
 @pytest.fixture(scope="session")
 def inequality_results():
     return pd.read_csv(TEST_DATA_PATH / "test_ineq.csv")
+
+
+@pytest.fixture(scope="session")
+def weighted_data():
+    """Weighted ApodeData and the same data with replicated rows."""
+    random = np.random.RandomState(seed=42)
+    y = random.lognormal(mean=3.3, sigma=1.0, size=50)
+    w = random.randint(1, 5, size=50)
+    df = pd.DataFrame({"x": y, "w": w})
+    weighted = ApodeData(df, income_column="x", weight_column="w")
+    df_rep = pd.DataFrame({"x": np.repeat(y, w)})
+    replicated = ApodeData(df_rep, income_column="x")
+    return weighted, replicated
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["plain", "weights"])
+def maybe_weighted(request):
+    """Build lognormal ApodeData, without and then with weights.
+
+    ``make(size, high=5, income_column="x", **columns)`` draws the
+    incomes, then every extra column as ``func(random, incomes)`` and,
+    for the weighted run, integer weights in ``[1, high)`` as ``"w"``.
+    """
+
+    def make(size, high=5, income_column="x", **columns):
+        random = np.random.RandomState(seed=42)
+        y = random.lognormal(size=size)
+        df = pd.DataFrame({income_column: y})
+        for name, func in columns.items():
+            df[name] = func(random, y)
+        weight_column = None
+        if request.param:
+            df["w"] = random.randint(1, high, size=size)
+            weight_column = "w"
+        return ApodeData(
+            df, income_column=income_column, weight_column=weight_column
+        )
+
+    return make
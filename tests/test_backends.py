@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from apode import backends, datasets
+from apode.backends import (
+    Backend,
+    get_backend,
+    register_backend,
+    set_backend,
+    use_backend,
+)
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS BACKENDS
+# =============================================================================
+
+
+def _kernel_calls(data, pline):
+    cache = data.cache
+    ys, n, cumsum, mean = cache.ys, cache.n, cache.cumsum, cache.mean
+    q = cache.count_below(pline)
+    return {
+        "kakwani": (ys, n, q, pline, 2),
+        "thon": (ys, n, q, pline),
+        "takayama": (ys, n, q, pline),
+        "merhan": (cumsum, n, mean),
+        "piesch": (cumsum, n, mean),
+        "bonferroni": (cumsum, n),
+        "tip": (ys, n, q, pline),
+        "lorenz": (ys, cumsum, "g", mean),
+    }
+
+
+def test_numpy_is_default():
+    assert get_backend().name == "numpy"
+    assert get_backend() is backends.NUMPY
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend("fortran")
+    with pytest.raises(ValueError):
+        with use_backend("fortran"):
+            pass
+    assert get_backend().name == "numpy"
+
+
+@pytest.mark.parametrize("alpha", ["r", "g", "a"])
+def test_loop_kernels(alpha):
+    # the kernels compiled by numba, run as plain python
+    data = datasets.make_lognormal(seed=42, size=300, nbin=None)
+    pline = data.cache.median * 0.6
+    for name, args in _kernel_calls(data, pline).items():
+        if name == "lorenz":
+            args = args[:2] + (alpha,) + args[3:]
+        expected = getattr(backends.NUMPY, name)(*args)
+        result = backends._LOOPS[name](*args)
+        np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+
+def test_loop_kernels_no_poor():
+    data = datasets.make_uniform(seed=42, size=300, nbin=None)
+    pline = data.cache.ys[0] / 2
+    for name, args in _kernel_calls(data, pline).items():
+        expected = getattr(backends.NUMPY, name)(*args)
+        np.testing.assert_allclose(backends._LOOPS[name](*args), expected)
+
+
+def test_use_backend():
+    data = datasets.make_lognormal(seed=42, size=300, nbin=None)
+    expected = data.inequality.bonferroni()
+    calls = []
+
+    def bonferroni(cumsum, n):
+        calls.append(n)
+        return backends.NUMPY.bonferroni(cumsum, n)
+
+    fields = {k: getattr(backends.NUMPY, k) for k in backends._LOOPS}
+    fields["bonferroni"] = bonferroni
+    register_backend("spy", lambda: Backend(name="spy", **fields))
+    try:
+        with use_backend("spy") as backend:
+            assert backend.name == "spy"
+            assert data.inequality.bonferroni() == expected
+        assert get_backend().name == "numpy"
+        data.inequality.bonferroni()
+        assert calls == [300]
+    finally:
+        backends._FACTORIES.pop("spy")
+        backends._BACKENDS.pop("spy")
+
+
+def test_numba_backend():
+    pytest.importorskip("numba")
+    data = datasets.make_lognormal(seed=42, size=300, nbin=None)
+    measures = [
+        ("poverty", "kakwani", {"pline": "median", "factor": 0.6}),
+        ("poverty", "thon", {"pline": "median", "factor": 0.6}),
+        ("poverty", "takayama", {"pline": "median", "factor": 0.6}),
+        ("inequality", "merhan", {}),
+        ("inequality", "piesch", {}),
+        ("inequality", "bonferroni", {}),
+    ]
+    expected = [
+        getattr(getattr(data, family), method)(**kwargs)
+        for family, method, kwargs in measures
+    ]
+    tip = data.plot._tip_data(1.0)
+    lorenz = data.plot._lorenz_data("a")
+    with use_backend("numba"):
+        for (family, method, kwargs), value in zip(measures, expected):
+            result = getattr(getattr(data, family), method)(**kwargs)
+            np.testing.assert_allclose(result, value, rtol=1e-10)
+        np.testing.assert_allclose(data.plot._tip_data(1.0), tip)
+        np.testing.assert_allclose(data.plot._lorenz_data("a"), lorenz)
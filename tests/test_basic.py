@@ -91,3 +91,136 @@ def test_getitem_column_slice():
         data["y"]
     with pytest.raises(KeyError):
         data["income_column"]
+
+
+def test_evaluate():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    specs = [
+        ("poverty", "fgt", {"alpha": 2, "pline": 0.3}),
+        ("poverty", "headcount", {"pline": "quantile", "q": 0.2}),
+        ("inequality", "gini"),
+        ("inequality", "atkinson", {"alpha": 0.5}),
+        ("welfare", "sen", {}),
+    ]
+    result = data.evaluate(specs)
+    assert list(result.columns) == ["family", "method", "params", "value"]
+    assert list(result.method) == [
+        "fgt",
+        "headcount",
+        "gini",
+        "atkinson",
+        "sen",
+    ]
+    assert result.value[0] == data.poverty.fgt(alpha=2, pline=0.3)
+    assert result.value[1] == data.poverty.headcount(pline="quantile", q=0.2)
+    assert result.value[2] == data.inequality.gini()
+    assert result.value[3] == data.inequality.atkinson(alpha=0.5)
+    assert result.value[4] == data.welfare.sen()
+    assert result.params[0] == "alpha=2, pline=0.3"
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_evaluate_array_pline():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    plines = np.array([0.2, 0.4])
+    result = data.evaluate(
+        [
+            ("poverty", "fgt", {"alpha": 1, "pline": plines}),
+            ("poverty", "headcount", {"pline": [0.2, 0.4]}),
+        ]
+    )
+    np.testing.assert_array_equal(
+        result.value[0], data.poverty.fgt(alpha=1, pline=plines)
+    )
+    np.testing.assert_array_equal(
+        result.value[1], data.poverty.headcount(pline=plines)
+    )
+
+
+def test_evaluate_invalid_spec():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    with pytest.raises(ValueError):
+        data.evaluate([("data", "sum")])
+    with pytest.raises(ValueError):
+        data.evaluate([("inequality",)])
+    with pytest.raises(AttributeError):
+        data.evaluate([("inequality", "foo")])
+
+
+def test_weight_column_validator():
+    df = pd.DataFrame({"x": [1.0, 2.0], "w": [1, -1]})
+    with pytest.raises(ValueError):
+        ApodeData(df, income_column="x", weight_column="y")
+    with pytest.raises(ValueError):
+        ApodeData(df, income_column="x", weight_column="w")
+
+
+def test_weight_column_getitem():
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0], "w": [1, 2, 3]})
+    data = ApodeData(df, income_column="x", weight_column="w")
+    assert data[1:].weight_column == "w"
+    assert data[1:].cache.population == 5
+    with pytest.raises(AttributeError):
+        data[["x"]]
+
+
+def test_binned_datasets_are_weighted():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=10)
+    assert data.weight_column == "weight"
+    assert data.cache.population == 300
+
+
+def test_from_array_zero_copy():
+    y = np.random.RandomState(seed=42).lognormal(size=200)
+    data = ApodeData.from_array(y)
+    assert np.shares_memory(data.data["x"].values, y)
+    assert np.shares_memory(data.cache.y, y)
+    expected = ApodeData(pd.DataFrame({"x": y}), income_column="x")
+    assert data.inequality.gini() == expected.inequality.gini()
+
+
+def test_from_array_memmap(tmp_path):
+    y = np.random.RandomState(seed=42).lognormal(size=200)
+    w = np.arange(200) % 3 + 1
+    y.tofile(tmp_path / "y.bin")
+    mm = np.memmap(tmp_path / "y.bin", dtype=np.float64, mode="r")
+    data = ApodeData.from_array(mm, weights=w, income_column="income")
+    assert np.shares_memory(data.cache.y, mm)
+    assert np.shares_memory(data.cache.weights, w)
+    assert data.weight_column == "w"
+    expected = ApodeData(
+        pd.DataFrame({"income": y, "w": w}),
+        income_column="income",
+        weight_column="w",
+    )
+    np.testing.assert_allclose(
+        data.poverty.fgt(pline=1.0, alpha=2),
+        expected.poverty.fgt(pline=1.0, alpha=2),
+    )
+
+
+def test_from_array_arrow():
+    pa = pytest.importorskip("pyarrow")
+    y = np.random.RandomState(seed=42).lognormal(size=200)
+    array = pa.array(y)
+    data = ApodeData.from_array(array)
+    assert np.shares_memory(data.cache.y, array.to_numpy())
+
+
+def test_from_array_arrow_nulls():
+    pa = pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        ApodeData.from_array(pa.array([1.0, None, 3.0]))
+    chunked = pa.chunked_array([[3.0, 1.0], [2.0]])
+    data = ApodeData.from_array(chunked)
+    np.testing.assert_array_equal(data.cache.ys, [1.0, 2.0, 3.0])
+
+
+def test_from_array_converts():
+    data = ApodeData.from_array([3, 1, 2])
+    assert data.cache.y.dtype == np.float64
+    np.testing.assert_array_equal(data.cache.ys, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        ApodeData.from_array(np.ones((2, 2)))
+    with pytest.raises(ValueError):
+        ApodeData.from_array([1.0, 2.0], weights=[1])
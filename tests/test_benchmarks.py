@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from apode import basic
+
+from benchmarks import bench_measures
+
+import pytest
+
+
+# =============================================================================
+# TESTS BENCHMARKS
+# =============================================================================
+
+BENCHMARKS = [
+    bench_measures.Poverty,
+    bench_measures.Inequality,
+    bench_measures.Welfare,
+    bench_measures.Polarization,
+    bench_measures.Concentration,
+    bench_measures.PlotData,
+]
+
+
+def test_benchmarks_cover_every_method():
+    for family in basic.MEASURE_FAMILIES:
+        accessor = basic._accessor(None, family)
+        methods = {
+            name
+            for name in type(accessor).__dict__
+            if not name.startswith("_") and callable(getattr(accessor, name))
+        }
+        assert methods == set(bench_measures.MEASURES[family])
+
+
+@pytest.mark.parametrize("benchmark", BENCHMARKS, ids=lambda b: b.__name__)
+def test_benchmarks_run(benchmark):
+    methods, sizes, distributions = benchmark.params
+    assert sizes[0] == 1000
+    for method in methods:
+        for distribution in distributions:
+            bench = benchmark()
+            bench.setup(method, sizes[0], distribution)
+            bench.time_measure(method, sizes[0], distribution)
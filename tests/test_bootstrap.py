@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+import tracemalloc
+from unittest import mock
+
+from apode import ApodeData, datasets
+from apode.bootstrap import BootstrapResult, _evaluate_matrix
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS BOOTSTRAP
+# =============================================================================
+
+
+def test_bootstrap_result():
+    data = datasets.make_lognormal(seed=42, size=500, sigma=1.0, nbin=None)
+    result = data.bootstrap("inequality.gini", reps=300, ci=0.9, seed=1)
+    assert isinstance(result, BootstrapResult)
+    assert result.estimate == data.inequality.gini()
+    assert len(result.replicates) == 300
+    assert result.low < result.estimate < result.high
+    np.testing.assert_allclose(
+        [result.low, result.high], np.quantile(result.replicates, [0.05, 0.95])
+    )
+    assert result.se == np.std(result.replicates, ddof=1)
+
+
+def test_bootstrap_seed_and_batches():
+    data = datasets.make_lognormal(seed=42, size=300, sigma=1.0, nbin=None)
+    a = data.bootstrap("poverty.fgt", reps=50, seed=3, pline=1.0, alpha=2)
+    b = data.bootstrap(
+        "poverty.fgt", reps=50, seed=3, batch_size=7, pline=1.0, alpha=2
+    )
+    np.testing.assert_allclose(a.replicates, b.replicates)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_bootstrap_batch_memory(weighted):
+    rng = np.random.default_rng(42)
+    y = rng.lognormal(0, 1, 4096)
+    weights = rng.integers(1, 5, 4096).astype(float) if weighted else None
+    data = ApodeData.from_array(y, weights)
+    data.cache.ys
+    elements = 2 ** 17
+    tracemalloc.start()
+    try:
+        with mock.patch("apode.bootstrap._BATCH_ELEMENTS", elements):
+            data.bootstrap("polarization.ray", reps=64, seed=0)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # about 100 bytes per resampled value at the peak of a batch
+    assert peak <= 128 * elements
+
+
+@pytest.mark.parametrize(
+    "measure, kwargs",
+    [
+        ("inequality.gini", {}),
+        ("inequality.rad", {}),
+        ("poverty.headcount", {"pline": "median", "factor": 0.6}),
+        ("poverty.sen", {"pline": 1.0}),
+        ("polarization.wolfson", {}),
+    ],
+)
+@pytest.mark.parametrize("weight_column", [None, "w"])
+def test_bootstrap_replicates_match_resamples(
+    weighted_data, measure, kwargs, weight_column
+):
+    weighted, _ = weighted_data
+    df = weighted.data
+    y, w = df["x"].values, df["w"].values
+    index = np.random.default_rng(7).integers(0, len(df), size=(4, len(df)))
+    family, method = measure.split(".")
+    result = _evaluate_matrix(
+        y, w if weight_column else None, index, family, method, kwargs
+    )
+    expected = [
+        getattr(
+            ApodeData(
+                df.iloc[row], income_column="x", weight_column=weight_column
+            ),
+            family,
+        )(method, **kwargs)
+        for row in index
+    ]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_bootstrap_se_close_to_loop():
+    data = datasets.make_lognormal(seed=42, size=400, sigma=1.0, nbin=None)
+    result = data.bootstrap("inequality.gini", reps=400, seed=5)
+    rng = np.random.default_rng(11)
+    resamples = [data.data.iloc[rng.integers(0, 400, 400)] for _ in range(200)]
+    loop = [
+        ApodeData(df, income_column="x").inequality.gini() for df in resamples
+    ]
+    np.testing.assert_allclose(result.se, np.std(loop, ddof=1), rtol=0.25)
+
+
+def test_bootstrap_no_apodedata_per_resample():
+    data = datasets.make_lognormal(seed=42, size=200, sigma=1.0, nbin=None)
+    with mock.patch.object(ApodeData, "__getitem__") as getitem:
+        data.bootstrap("inequality.bonferroni", reps=20, seed=1)
+    getitem.assert_not_called()
+
+
+def test_bootstrap_bca():
+    data = datasets.make_lognormal(seed=42, size=300, sigma=1.0, nbin=None)
+    pct = data.bootstrap("inequality.entropy", reps=500, seed=2, alpha=2)
+    bca = data.bootstrap(
+        "inequality.entropy", reps=500, seed=2, interval="bca", alpha=2
+    )
+    np.testing.assert_allclose(bca.replicates, pct.replicates)
+    assert bca.interval == "bca"
+    assert bca.low < bca.high
+    # skewed statistic: BCa moves the interval to the right
+    assert bca.high > pct.high
+
+
+def test_bootstrap_invalid():
+    data = datasets.make_uniform(seed=42, size=100, mu=1, nbin=None)
+    with pytest.raises(ValueError):
+        data.bootstrap("inequality.gini", reps=1)
+    with pytest.raises(ValueError):
+        data.bootstrap("inequality.gini", ci=1.5)
+    with pytest.raises(ValueError):
+        data.bootstrap("inequality.gini", interval="foo")
+    with pytest.raises(ValueError):
+        data.bootstrap("foo.gini")
+    with pytest.raises(AttributeError):
+        data.bootstrap("inequality.foo")
+
+
+def test_bootstrap_n_jobs():
+    data = datasets.make_lognormal(seed=42, size=300, sigma=1.0, nbin=None)
+    serial = data.bootstrap("inequality.gini", reps=40, seed=4)
+    parallel = data.bootstrap("inequality.gini", reps=40, seed=4, n_jobs=2)
+    np.testing.assert_array_equal(serial.replicates, parallel.replicates)
+    bca = data.bootstrap(
+        "inequality.bonferroni", reps=40, seed=4, n_jobs=2, interval="bca"
+    )
+    assert len(bca.replicates) == 40
+    df = data.data.assign(w=np.arange(300) % 3 + 1)
+    weighted = ApodeData(
+        df, income_column=data.income_column, weight_column="w"
+    )
+    np.testing.assert_array_equal(
+        weighted.bootstrap(
+            "poverty.watts", reps=20, seed=1, pline=1.0
+        ).replicates,
+        weighted.bootstrap(
+            "poverty.watts", reps=20, seed=1, n_jobs=2, pline=1.0
+        ).replicates,
+    )
+    with pytest.raises(ValueError):
+        data.bootstrap("inequality.gini", reps=40, n_jobs=0)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from unittest import mock
+
+from apode import ApodeData, datasets
+from apode.cache import IncomeCache
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS CACHE
+# =============================================================================
+
+
+def test_cache_primitives():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    y = data.data["x"].values
+    cache = data.cache
+    np.testing.assert_array_equal(cache.ys, np.sort(y))
+    np.testing.assert_array_equal(cache.y[cache.order], np.sort(y))
+    np.testing.assert_allclose(cache.cumsum, np.cumsum(np.sort(y)))
+    np.testing.assert_allclose(cache.mean, np.mean(y))
+    assert cache.median == np.median(y)
+    assert cache.quantile(0.2) == np.quantile(y, 0.2)
+    assert cache.n == 300
+
+
+def test_cache_is_shared():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    assert data.cache is data.cache
+    assert data.poverty.idf.cache is data.inequality.idf.cache
+
+
+def test_cache_sorts_once():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    with mock.patch("numpy.sort", wraps=np.sort) as sort:
+        data.poverty.sen(pline=0.3)
+        data.poverty.fgt(pline=0.3, alpha=2)
+        data.inequality.gini()
+        data.polarization.wolfson()
+    assert sort.call_count == 1
+
+
+def test_cache_argsort_before_sort():
+    y = np.array([3.0, 1.0, 2.0])
+    cache = IncomeCache(y)
+    np.testing.assert_array_equal(cache.order, [1, 2, 0])
+    np.testing.assert_array_equal(cache.ys, [1.0, 2.0, 3.0])
+
+
+def test_cache_count_below():
+    cache = IncomeCache(np.array([1.0, 2.0, 2.0, 5.0]))
+    assert cache.count_below(2.0) == 1
+    assert cache.count_below(2.5) == 3
+    assert cache.count_below(0.5) == 0
+
+
+def test_cache_slice_has_own_cache():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    sub = data[:100]
+    assert sub.cache is not data.cache
+    assert sub.cache.n == 100
+
+
+def test_cache_weighted_primitives():
+    y = np.array([3.0, 1.0, 2.0, 5.0])
+    w = np.array([2, 1, 3, 1])
+    cache = IncomeCache(y, w)
+    replicated = np.repeat(y, w)
+    assert cache.weighted
+    assert cache.population == 7
+    np.testing.assert_array_equal(cache.ws, [1, 3, 2, 1])
+    np.testing.assert_allclose(cache.mean, np.mean(replicated))
+    for q in [0, 0.1, 0.25, 0.5, 0.8, 1]:
+        np.testing.assert_allclose(
+            cache.quantile(q), np.quantile(replicated, q)
+        )
+    np.testing.assert_allclose(cache.median, np.median(replicated))
+    np.testing.assert_allclose(cache.prefix(0), [0, 1, 4, 6, 7])
+    np.testing.assert_allclose(cache.lorenz(3), 1.0 + 2 * 2.0)
+
+
+def test_cache_unweighted_population():
+    cache = IncomeCache(np.array([3.0, 1.0, 2.0]))
+    assert not cache.weighted
+    assert cache.ws is None
+    assert cache.population == 3
+    np.testing.assert_array_equal(cache.ranks, [0, 1, 2])
+
+
+@pytest.mark.parametrize("weighted", [False, True], ids=["plain", "weights"])
+def test_cache_extend(weighted):
+    random = np.random.RandomState(seed=42)
+    y = np.round(random.lognormal(size=500), 1) + 0.1
+    w = random.randint(1, 5, size=500) if weighted else None
+    old = IncomeCache(y[:450], None if w is None else w[:450])
+    old.warm(["ys", "cumsum", "total", "logys", ("prefix", 1)])
+    old.warm([("prefix", "log"), ("prefix", "rank"), ("power", -1)])
+    cache = old.extend(y[450:], None if w is None else w[450:])
+    fresh = IncomeCache(y, w)
+    np.testing.assert_array_equal(cache.y, y)
+    np.testing.assert_array_equal(cache.order, fresh.order)
+    np.testing.assert_array_equal(cache.ys, fresh.ys)
+    for name in ["cumsum", "total", "logys", "mean", "median", "ranks"]:
+        np.testing.assert_allclose(getattr(cache, name), getattr(fresh, name))
+    for kind in [0, 1, "log", "rank"]:
+        np.testing.assert_allclose(cache.prefix(kind), fresh.prefix(kind))
+    np.testing.assert_allclose(cache.power(-1), fresh.power(-1))
+    if weighted:
+        np.testing.assert_array_equal(cache.ws, fresh.ws)
+        assert cache.population == fresh.population
+
+
+def test_cache_extend_weights_mismatch():
+    with pytest.raises(ValueError):
+        IncomeCache(np.array([1.0, 2.0])).extend([3.0], weights=[1])
+    with pytest.raises(ValueError):
+        IncomeCache(np.array([1.0, 2.0]), np.array([1, 1])).extend([3.0])
+
+
+def test_apodedata_extend_does_not_resort():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    gini = data.inequality.gini()
+    new_rows = datasets.make_uniform(seed=7, size=20, mu=1, nbin=None).data
+    with mock.patch("numpy.sort", wraps=np.sort) as sort:
+        extended = data.extend(new_rows)
+        result = extended.inequality.gini()
+    assert sort.call_args[0][0].shape == (20,)
+    assert len(extended.data) == 320
+    expected = ApodeData(extended.data, income_column="x").inequality.gini()
+    np.testing.assert_allclose(result, expected)
+    assert gini == data.inequality.gini()
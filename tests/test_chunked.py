@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from unittest import mock
+
+from apode import ApodeData
+from apode import state as state_module
+from apode.chunked import evaluate_file, iter_chunks, read_state
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def income_df():
+    random = np.random.RandomState(seed=42)
+    return pd.DataFrame(
+        {
+            "x": random.lognormal(size=1000),
+            "w": random.randint(1, 4, size=1000),
+            "other": "foo",
+        }
+    )
+
+
+@pytest.fixture
+def csv_dir(tmp_path, income_df):
+    for i, part in enumerate(np.array_split(income_df, 3)):
+        part.to_csv(tmp_path / f"part{i}.csv", index=False)
+    (tmp_path / "notes.txt").write_text("not data")
+    return tmp_path
+
+
+# =============================================================================
+# TESTS CHUNKED
+# =============================================================================
+
+
+def test_iter_chunks_bounded(tmp_path, income_df):
+    fname = tmp_path / "income.csv"
+    income_df.to_csv(fname, index=False)
+    chunks = list(iter_chunks(fname, ["x"], chunksize=128))
+    assert max(len(c) for c in chunks) == 128
+    assert sum(len(c) for c in chunks) == 1000
+    assert all(list(c.columns) == ["x"] for c in chunks)
+
+
+def test_iter_chunks_directory(csv_dir, income_df):
+    chunks = list(iter_chunks(csv_dir, ["x", "w"], chunksize=100))
+    data = pd.concat(chunks, ignore_index=True)
+    np.testing.assert_allclose(data["x"].values, income_df["x"].values)
+
+
+@pytest.mark.parametrize("weight_column", [None, "w"])
+def test_read_state(csv_dir, income_df, weight_column):
+    idf = ApodeData(income_df, income_column="x", weight_column=weight_column)
+    state = read_state(
+        csv_dir, "x", weight_column, chunksize=64, plines=(1.0,)
+    )
+    assert state.count == 1000
+    np.testing.assert_allclose(
+        state.finalize("inequality.cv"), idf.inequality.cv()
+    )
+    np.testing.assert_allclose(
+        state.finalize("poverty.gap", pline=1.0), idf.poverty.gap(pline=1.0)
+    )
+
+
+def test_evaluate_file(csv_dir, income_df):
+    idf = ApodeData(income_df, income_column="x", weight_column="w")
+    specs = [
+        ("poverty", "fgt", {"pline": 1.2, "alpha": 2}),
+        ("poverty", "watts", {"pline": 0.8}),
+        ("inequality", "entropy", {"alpha": 0.5}),
+        ("inequality", "atkinson", {"alpha": 3}),
+        ("welfare", "isoelastic", {"alpha": 2}),
+        ("welfare", "utilitarian"),
+    ]
+    result = evaluate_file(csv_dir, specs, "x", "w", chunksize=250)
+    expected = idf.evaluate(specs)
+    pd.testing.assert_frame_equal(
+        result.drop(columns="value"), expected.drop(columns="value")
+    )
+    np.testing.assert_allclose(result["value"], expected["value"])
+
+
+def test_chunked_parquet(tmp_path, income_df):
+    pytest.importorskip("pyarrow")
+    fname = tmp_path / "income.parquet"
+    income_df.to_parquet(fname)
+    state = read_state(fname, "x", chunksize=100)
+    np.testing.assert_allclose(state.mean, income_df["x"].mean())
+
+
+def test_chunked_invalid(tmp_path, csv_dir):
+    with pytest.raises(ValueError):
+        list(iter_chunks(csv_dir, ["x"], chunksize=0))
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    with pytest.raises(ValueError):
+        read_state(empty, "x")
+
+
+def test_evaluate_file_relative_lines(csv_dir, income_df):
+    idf = ApodeData(income_df, income_column="x", weight_column="w")
+    specs = [
+        ("poverty", "headcount", {"pline": "median", "factor": 0.6}),
+        ("poverty", "gap"),
+        ("poverty", "severity", {"pline": 1.0}),
+    ]
+    result = evaluate_file(csv_dir, specs, "x", "w", chunksize=100)
+    expected = idf.evaluate(specs)
+    np.testing.assert_allclose(result["value"], expected["value"], atol=0.02)
+    assert result["value"][2] == pytest.approx(expected["value"][2])
+
+
+def test_evaluate_file_keep_values(csv_dir, income_df):
+    idf = ApodeData(income_df, income_column="x", weight_column="w")
+    specs = [
+        ("inequality", "gini"),
+        ("poverty", "sen", {"pline": 1.0}),
+        ("poverty", "thon", {"pline": "median", "factor": 0.6}),
+        ("poverty", "kakwani", {"pline": 1.0}),
+    ]
+    with pytest.raises(ValueError):
+        evaluate_file(csv_dir, specs[:1], "x", "w", chunksize=100)
+    result = evaluate_file(
+        csv_dir, specs, "x", "w", chunksize=100, keep_values=True
+    )
+    expected = idf.evaluate(specs)
+    np.testing.assert_allclose(result["value"], expected["value"])
+    state = read_state(csv_dir, "x", "w", chunksize=100, keep_values=True)
+    np.testing.assert_allclose(
+        state.finalize("inequality.gini"), idf.inequality.gini()
+    )
+
+
+def test_read_state_balanced_merge(tmp_path, income_df):
+    income_df.to_csv(tmp_path / "data.csv", index=False)
+    merged = []
+    merge_runs = state_module._merge_runs
+
+    def spy(a, b):
+        merged.append(len(a[0]) + len(b[0]))
+        return merge_runs(a, b)
+
+    with mock.patch.object(state_module, "_merge_runs", spy):
+        state = read_state(tmp_path, "x", chunksize=10, keep_values=True)
+    expected = np.sort(pd.read_csv(tmp_path / "data.csv")["x"].values)
+    np.testing.assert_array_equal(state.values[0], expected)
+    # 100 chunks: every row is copied about log2(100) times, not 50
+    assert len(merged) == 99
+    assert sum(merged) <= 1000 * 8
+
+
+def test_evaluate_file_array_plines(csv_dir, income_df):
+    idf = ApodeData(income_df, income_column="x", weight_column="w")
+    specs = [
+        ("poverty", "fgt", {"pline": [1.0, 2.0], "alpha": 1}),
+        ("poverty", "watts", {"pline": np.array([0.8, 1.2])}),
+        ("poverty", "headcount", {"pline": "median"}),
+    ]
+    result = evaluate_file(csv_dir, specs, "x", "w", chunksize=100)
+    np.testing.assert_allclose(
+        result["value"][0], idf.poverty.fgt(pline=[1.0, 2.0], alpha=1)
+    )
+    np.testing.assert_allclose(
+        result["value"][1], idf.poverty.watts(pline=np.array([0.8, 1.2]))
+    )
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from unittest import mock
+
+from apode.inequality import InequalityMeasures
+from apode.polarization import PolarizationMeasures
+
+from benchmarks.bench_measures import MEASURES
+from benchmarks.complexity import (
+    MAX_EXPONENT,
+    MAX_SORT_RATIO,
+    WORK_SIZES,
+    measure_runner,
+    measure_work,
+    scaling_exponent,
+    sort_ratio,
+)
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS COMPLEXITY
+# =============================================================================
+
+CASES = [
+    (family, method)
+    for family, methods in MEASURES.items()
+    for method in methods
+]
+
+
+@pytest.mark.parametrize(
+    "family, method", CASES, ids=[f"{f}.{m}" for f, m in CASES]
+)
+def test_measure_work_scaling(family, method):
+    measure_work(family, method, WORK_SIZES[0])  # imports and first use
+    small, large = (measure_work(family, method, n) for n in WORK_SIZES)
+    ratio = WORK_SIZES[1] / WORK_SIZES[0]
+    assert large.sorts == small.sorts <= 2
+    assert large.cached_bytes <= ratio * small.cached_bytes
+    # linear temporaries; a pairwise (n x n) path grows as ratio ** 2
+    assert large.peak_bytes <= 1.25 * ratio * small.peak_bytes
+
+
+def test_measure_work_flags_quadratic():
+    sizes = [500, 2000]  # (n x n) temporaries, keep them small
+
+    def pairwise(self):
+        y = self.idf.cache.ys
+        return np.abs(np.subtract.outer(y, y)).mean()
+
+    with mock.patch.object(InequalityMeasures, "gini", pairwise):
+        small, large = (measure_work("inequality", "gini", n) for n in sizes)
+    ratio = sizes[1] / sizes[0]
+    assert large.peak_bytes > 1.25 * ratio * small.peak_bytes
+
+
+@pytest.mark.parametrize(
+    "family, method", CASES, ids=[f"{f}.{m}" for f, m in CASES]
+)
+def test_measure_sort_ratio(family, method):
+    runner = measure_runner(family, method)
+    ratio = sort_ratio(runner)
+    if ratio > MAX_SORT_RATIO:
+        ratio = sort_ratio(runner)  # once more before failing
+    assert ratio <= MAX_SORT_RATIO, (
+        f"{family}.{method} time grows {ratio:.2f} times faster than a sort"
+    )
+
+
+def test_sort_ratio_flags_quadratic():
+    # quadratic time with linear memory, missed by measure_work
+    def pairwise(self, alpha=1):
+        y = self.idf.cache.ys
+        return sum(np.abs(y[i] - y).sum() for i in range(len(y)))
+
+    with mock.patch.object(PolarizationMeasures, "ray", pairwise):
+        runner = measure_runner("polarization", "ray")
+        assert sort_ratio(runner, repeats=1) > MAX_SORT_RATIO
+
+
+@pytest.mark.complexity
+@pytest.mark.parametrize(
+    "family, method", CASES, ids=[f"{f}.{m}" for f, m in CASES]
+)
+def test_measure_scaling(family, method):
+    exponent = scaling_exponent(measure_runner(family, method))
+    if exponent > MAX_EXPONENT:
+        # a second fit before failing, timings are noisy on shared boxes
+        exponent = scaling_exponent(measure_runner(family, method))
+    assert exponent <= MAX_EXPONENT, (
+        f"{family}.{method} scales as n**{exponent:.2f}"
+    )
+
+
+@pytest.mark.complexity
+def test_scaling_exponent_flags_quadratic():
+    def pairwise(n):
+        y = np.random.default_rng(1).lognormal(size=n)
+        return lambda: np.abs(np.subtract.outer(y, y)).sum()
+
+    exponent = scaling_exponent(pairwise, sizes=[250, 500, 1000, 2000])
+    assert exponent > MAX_EXPONENT
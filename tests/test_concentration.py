@@ -149,3 +149,23 @@ def test_concentration_k_range():
         data.concentration(method="concentration_ratio", k=n + 1)
     with pytest.raises(ValueError):
         data.concentration(method="concentration_ratio", k=-1)
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("herfindahl", {}),
+        ("herfindahl", {"normalized": False}),
+        ("rosenbluth", {}),
+        ("concentration_ratio", {"k": 7}),
+    ],
+)
+def test_weights_replication(weighted_data, method, kwargs):
+    weighted, replicated = weighted_data
+    np.testing.assert_allclose(
+        weighted.concentration(method, **kwargs),
+        replicated.concentration(method, **kwargs),
+    )
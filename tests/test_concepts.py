@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from apode import ApodeData
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def concepts(maybe_weighted):
+    idf = maybe_weighted(
+        500,
+        income_column="market",
+        disposable=lambda random, y: 0.3 + 0.8 * y,
+        draw=lambda random, y: random.lognormal(sigma=0.5, size=len(y)),
+    )
+    return idf, ["market", "disposable", "draw"]
+
+
+def _expected(idf, column, family, method, kwargs):
+    single = ApodeData(
+        idf.data, income_column=column, weight_column=idf.weight_column
+    )
+    return getattr(getattr(single, family), method)(**kwargs)
+
+
+# =============================================================================
+# TESTS CONCEPTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "family, method, kwargs",
+    [
+        ("poverty", "headcount", {"pline": 1.0}),
+        ("poverty", "fgt", {"pline": "median", "factor": 0.6, "alpha": 2}),
+        ("poverty", "sen", {"pline": 1.0}),
+        ("inequality", "gini", {}),
+        ("inequality", "atkinson", {"alpha": 0.5}),
+        ("inequality", "bonferroni", {}),
+        ("polarization", "wolfson", {}),
+        ("welfare", "utilitarian", {}),
+    ],
+)
+def test_concepts_measures(concepts, family, method, kwargs):
+    idf, columns = concepts
+    result = getattr(getattr(idf.concepts(columns), family), method)(
+        **kwargs
+    )
+    assert list(result.index) == columns
+    for column in columns:
+        expected = _expected(idf, column, family, method, kwargs)
+        np.testing.assert_allclose(result[column], expected)
+
+
+def test_concepts_standard_error(concepts):
+    idf, columns = concepts
+    result = idf.concepts(columns).standard_error("inequality.gini")
+    for column in columns:
+        single = ApodeData(
+            idf.data, income_column=column, weight_column=idf.weight_column
+        )
+        np.testing.assert_allclose(
+            result[column], single.standard_error("inequality.gini")
+        )
+
+
+def test_concepts_default_method(concepts):
+    idf, columns = concepts
+    multi = idf.concepts(columns)
+    assert len(multi) == 3
+    pd.testing.assert_series_equal(multi.inequality(), multi.inequality.gini())
+
+
+def test_concepts_invalid(concepts):
+    idf, _ = concepts
+    with pytest.raises(ValueError):
+        idf.concepts(["market", "foo"])
+    with pytest.raises(ValueError):
+        idf.concepts([])
+    with pytest.raises(AttributeError):
+        idf.concepts(["market"]).inequality.foo()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from unittest import mock
+
+from apode import ApodeData
+from apode.groupby import ApodeGroupBy, GroupSegments
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def grouped_df():
+    random = np.random.RandomState(seed=42)
+    size = 600
+    return pd.DataFrame(
+        {
+            "x": random.lognormal(size=size),
+            "region": random.choice(["a", "b", "c", "d"], size=size),
+            "w": random.randint(1, 5, size=size),
+        }
+    )
+
+
+def _expected(df, family, method, weight_column=None, **kwargs):
+    return pd.Series(
+        {
+            key: getattr(
+                ApodeData(
+                    sub, income_column="x", weight_column=weight_column
+                ),
+                family,
+            )(method, **kwargs)
+            for key, sub in df.groupby("region")
+        }
+    )
+
+
+# =============================================================================
+# TESTS GROUPBY
+# =============================================================================
+
+
+CASES = [
+    ("poverty", "headcount", {}),
+    ("poverty", "gap", {"pline": 1.0}),
+    ("poverty", "severity", {"pline": "mean", "factor": 0.6}),
+    ("poverty", "fgt", {"pline": "quantile", "q": 0.3, "alpha": 1.5}),
+    ("poverty", "watts", {"pline": "median"}),
+    ("poverty", "sen", {"pline": 1.0}),
+    ("inequality", "gini", {}),
+    ("inequality", "cv", {}),
+    ("inequality", "entropy", {"alpha": 0}),
+    ("inequality", "entropy", {"alpha": 1}),
+    ("inequality", "entropy", {"alpha": 2}),
+    ("inequality", "atkinson", {"alpha": 0.5}),
+    ("inequality", "bonferroni", {}),
+    ("polarization", "ray", {"alpha": 1.3}),
+    ("polarization", "wolfson", {}),
+    ("concentration", "herfindahl", {}),
+    ("welfare", "utilitarian", {}),
+]
+
+
+@pytest.mark.parametrize("weight_column", [None, "w"])
+@pytest.mark.parametrize("family, method, kwargs", CASES)
+def test_groupby_matches_subsets(
+    grouped_df, weight_column, family, method, kwargs
+):
+    idf = ApodeData(grouped_df, income_column="x", weight_column=weight_column)
+    result = getattr(idf.groupby("region"), family)(method, **kwargs)
+    expected = _expected(grouped_df, family, method, weight_column, **kwargs)
+    assert isinstance(result, pd.Series)
+    assert result.name == method
+    assert list(result.index) == ["a", "b", "c", "d"]
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-10)
+
+
+def test_groupby_method_access(grouped_df):
+    idf = ApodeData(grouped_df, income_column="x")
+    grouped = idf.groupby("region")
+    assert isinstance(grouped, ApodeGroupBy)
+    assert len(grouped) == 4
+    pd.testing.assert_series_equal(
+        grouped.inequality.gini(), grouped.inequality()
+    )
+    pd.testing.assert_series_equal(
+        grouped.poverty.fgt(pline=1.0, alpha=2),
+        grouped.poverty.severity(pline=1.0),
+        check_names=False,
+    )
+
+
+def test_groupby_sorts_once(grouped_df):
+    idf = ApodeData(grouped_df, income_column="x")
+    grouped = idf.groupby("region")
+    with mock.patch("numpy.lexsort", wraps=np.lexsort) as lexsort:
+        grouped.inequality.gini()
+        grouped.poverty.sen(pline=1.0)
+        grouped.welfare.utilitarian()
+    assert lexsort.call_count == 1
+
+
+def test_groupby_no_apodedata_per_group(grouped_df):
+    idf = ApodeData(grouped_df, income_column="x")
+    with mock.patch.object(ApodeData, "__getitem__") as getitem:
+        idf.groupby("region").inequality.rad()
+    getitem.assert_not_called()
+
+
+def test_groupby_missing_groups_dropped():
+    df = pd.DataFrame(
+        {"x": [1.0, 2.0, 3.0, 4.0, 5.0], "g": ["a", "a", None, "b", "b"]}
+    )
+    idf = ApodeData(df, income_column="x")
+    result = idf.groupby("g").welfare.utilitarian()
+    np.testing.assert_allclose(result.values, [1.5, 4.5])
+
+
+def test_groupby_unobserved_category():
+    df = pd.DataFrame(
+        {
+            "x": [1.0, 2.0, 4.0, 5.0],
+            "g": pd.Categorical(["a", "a", "c", "c"], ["a", "b", "c"]),
+        }
+    )
+    idf = ApodeData(df, income_column="x")
+    result = idf.groupby("g").welfare.utilitarian()
+    np.testing.assert_allclose(result.values, [1.5, 4.5])
+    assert list(result.index) == ["a", "c"]
+
+
+def test_group_segments_empty():
+    ys = np.array([1.0, 2.0, 4.0])
+    with pytest.raises(ValueError):
+        GroupSegments(pd.Index(["a", "b", "c"]), ys, None, np.array([2, 0, 1]))
+    with pytest.raises(ValueError):
+        GroupSegments.from_codes(
+            pd.Index(["a", "b", "c"]), np.array([0, 0, 2]), ys
+        )
+
+
+def test_groupby_several_columns(grouped_df):
+    df = grouped_df.assign(half=grouped_df.index % 2)
+    idf = ApodeData(df, income_column="x")
+    result = idf.groupby(["region", "half"]).inequality.gini()
+    assert isinstance(result.index, pd.MultiIndex)
+    sub = df[(df.region == "b") & (df.half == 1)]
+    expected = ApodeData(sub, income_column="x").inequality.gini()
+    np.testing.assert_allclose(result.loc[("b", 1)], expected)
+
+
+def test_groupby_invalid(grouped_df):
+    idf = ApodeData(grouped_df, income_column="x")
+    grouped = idf.groupby("region")
+    with pytest.raises(AttributeError):
+        grouped.poverty("foo")
+    with pytest.raises(ValueError):
+        grouped.poverty.fgt(pline=1.0, alpha=-1)
+    with pytest.raises(ValueError):
+        grouped.inequality.atkinson(alpha=0)
+
+
+# =============================================================================
+# TESTS DECOMPOSITION
+# =============================================================================
+
+
+@pytest.mark.parametrize("weight_column", [None, "w"])
+@pytest.mark.parametrize("alpha", [0, 1, 2, 1.5])
+def test_fgt_decomposition(grouped_df, weight_column, alpha):
+    idf = ApodeData(grouped_df, income_column="x", weight_column=weight_column)
+    table = idf.groupby("region").fgt_decomposition(
+        pline="median", factor=0.6, alpha=alpha
+    )
+    total = idf.poverty.fgt(pline="median", factor=0.6, alpha=alpha)
+    pline = 0.6 * idf.cache.median
+    expected = _expected(
+        grouped_df, "poverty", "fgt", weight_column, pline=pline, alpha=alpha
+    )
+    assert list(table.columns) == [
+        "population_share",
+        "fgt",
+        "contribution",
+        "relative",
+    ]
+    np.testing.assert_allclose(table.fgt.values, expected.values)
+    np.testing.assert_allclose(table.contribution.sum(), total)
+    np.testing.assert_allclose(table.relative.sum(), 1)
+    np.testing.assert_allclose(table.population_share.sum(), 1)
+
+
+@pytest.mark.parametrize("weight_column", [None, "w"])
+def test_watts_decomposition(grouped_df, weight_column):
+    idf = ApodeData(grouped_df, income_column="x", weight_column=weight_column)
+    table = idf.groupby("region").watts_decomposition(pline=1.0)
+    np.testing.assert_allclose(
+        table.contribution.sum(), idf.poverty.watts(pline=1.0)
+    )
+
+
+@pytest.mark.parametrize("weight_column", [None, "w"])
+@pytest.mark.parametrize("alpha", [0, 1, 2, 0.5, -1])
+def test_entropy_decomposition(grouped_df, weight_column, alpha):
+    idf = ApodeData(grouped_df, income_column="x", weight_column=weight_column)
+    result = idf.groupby("region").entropy_decomposition(alpha=alpha)
+    assert list(result.index) == ["within", "between", "total"]
+    assert result["within"] >= 0
+    assert result["between"] >= 0
+    np.testing.assert_allclose(
+        result["total"], idf.inequality.entropy(alpha=alpha)
+    )
+
+
+def test_entropy_decomposition_between():
+    df = pd.DataFrame({"x": [1.0, 1.0, 3.0, 3.0], "g": [0, 0, 1, 1]})
+    idf = ApodeData(df, income_column="x")
+    result = idf.groupby("g").entropy_decomposition(alpha=2)
+    assert result["within"] == 0
+    np.testing.assert_allclose(result["between"], idf.inequality.entropy(2))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+import subprocess
+import sys
+
+import pytest
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Self time (seconds) allowed for the apode modules loaded by
+# ``import apode``, third party packages excluded.
+IMPORT_BUDGET = 0.05
+
+# Modules that ``import apode`` must not load.
+LAZY_MODULES = [
+    "matplotlib",
+    "apode.plots",
+    "apode.poverty",
+    "apode.inequality",
+    "apode.bootstrap",
+    "apode.groupby",
+    "apode.state",
+    "concurrent.futures.process",
+    "multiprocessing.shared_memory",
+]
+
+
+def _run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+# =============================================================================
+# TESTS IMPORT
+# =============================================================================
+
+
+def test_import_is_lazy():
+    code = "import sys, apode; print('\\n'.join(sorted(sys.modules)))"
+    modules = set(_run(code).stdout.split())
+    assert "apode.basic" in modules
+    assert not modules.intersection(LAZY_MODULES)
+
+
+def test_import_time_budget():
+    stderr = _run("import apode", "-X", "importtime").stderr
+    self_time = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        usec, _, name = line.split(":", 1)[1].split("|")
+        if name.strip().split(".")[0] == "apode":
+            self_time += int(usec)
+    assert self_time / 1e6 < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize(
+    "attribute, module",
+    [("poverty", "apode.poverty"), ("plot", "matplotlib")],
+)
+def test_accessors_loaded_on_access(attribute, module):
+    code = (
+        "import sys, apode, pandas as pd; "
+        "idf = apode.ApodeData(pd.DataFrame({'x': [1.0, 2.0]}), 'x'); "
+        f"assert {module!r} not in sys.modules; "
+        f"idf.{attribute}; "
+        f"assert {module!r} in sys.modules; "
+        "assert apode.State.__module__ == 'apode.state'"
+    )
+    _run(code)
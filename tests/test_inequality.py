@@ -597,3 +597,44 @@ def test_ratio_invalid_alpha():
         data.inequality.ratio(alpha=-1)
     with pytest.raises(ValueError):
         data.inequality.ratio(alpha=2)
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("rrange", {}),
+        ("rad", {}),
+        ("cv", {}),
+        ("sdlog", {}),
+        ("ratio", {"alpha": 0.2}),
+        ("gini", {}),
+        ("merhan", {}),
+        ("piesch", {}),
+        ("bonferroni", {}),
+        ("kolm", {"alpha": 0.01}),
+        ("entropy", {"alpha": 0}),
+        ("entropy", {"alpha": 1}),
+        ("entropy", {"alpha": 2}),
+        ("atkinson", {"alpha": 1}),
+        ("atkinson", {"alpha": 0.5}),
+    ],
+)
+def test_weights_replication(weighted_data, method, kwargs):
+    weighted, replicated = weighted_data
+    np.testing.assert_allclose(
+        weighted.inequality(method, **kwargs),
+        replicated.inequality(method, **kwargs),
+    )
+
+
+def test_weights_unit():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    df = data.data.assign(w=1.0)
+    weighted = ApodeData(df, income_column="x", weight_column="w")
+    for method in ["gini", "merhan", "piesch", "bonferroni", "entropy"]:
+        np.testing.assert_allclose(
+            weighted.inequality(method), data.inequality(method)
+        )
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from unittest import mock
+
+from apode import ApodeData
+from apode import groupby as apode_groupby
+from apode.panel import ApodePanel
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+YEARS = [2001, 2002, 2003, 2004]
+
+
+@pytest.fixture(scope="module")
+def waves(maybe_weighted):
+    return maybe_weighted(
+        800, year=lambda random, y: random.choice(YEARS, size=len(y))
+    )
+
+
+def _wave(idf, year):
+    part = idf.data[idf.data["year"] == year].reset_index(drop=True)
+    return ApodeData(
+        part, income_column="x", weight_column=idf.weight_column
+    )
+
+
+# =============================================================================
+# TESTS PANEL
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "family, method, kwargs",
+    [
+        ("poverty", "headcount", {"pline": 1.0}),
+        ("poverty", "sen", {"pline": "median", "factor": 0.6}),
+        ("inequality", "gini", {}),
+        ("inequality", "bonferroni", {}),
+        ("welfare", "utilitarian", {}),
+    ],
+)
+def test_panel_measures(waves, family, method, kwargs):
+    series = getattr(getattr(waves.panel("year"), family), method)(**kwargs)
+    assert list(series.index) == [2001, 2002, 2003, 2004]
+    for year in series.index:
+        wave = _wave(waves, year)
+        expected = getattr(getattr(wave, family), method)(**kwargs)
+        np.testing.assert_allclose(series[year], expected)
+
+
+def test_panel_append_reuses_results(waves):
+    old = waves[waves.data["year"] < 2004]
+    panel = ApodePanel.from_data(old, "year")
+    before = panel.inequality.gini()
+    extended = panel.append(2004, _wave(waves, 2004))
+
+    calls = []
+    evaluate = apode_groupby.evaluate_segments
+
+    def spy(segments, *args, **kwargs):
+        calls.append(list(segments.keys))
+        return evaluate(segments, *args, **kwargs)
+
+    with mock.patch("apode.panel.evaluate_segments", side_effect=spy):
+        after = extended.inequality.gini()
+        extended.inequality.gini()
+    assert calls == [[2004]]
+    pd.testing.assert_series_equal(after.iloc[:3], before)
+    np.testing.assert_allclose(
+        after[2004], _wave(waves, 2004).inequality.gini()
+    )
+    assert len(panel) == 3
+    assert len(extended) == 4
+
+
+def test_panel_getitem(waves):
+    panel = waves.panel("year")
+    np.testing.assert_allclose(
+        panel[2002].inequality.gini(), _wave(waves, 2002).inequality.gini()
+    )
+    assert repr(panel) == "ApodePanel(periods=4, 2001..2004)"
+
+
+def test_panel_unhashable_parameters(waves):
+    panel = waves.panel("year")
+    series = panel.poverty.headcount(pline=[1.0])
+    assert len(series) == 4
+    assert not panel.results
+
+
+def test_panel_append_existing(waves):
+    panel = waves.panel("year")
+    with pytest.raises(ValueError):
+        panel.append(2002, _wave(waves, 2002))
@@ -301,3 +301,39 @@ def test_plot_hist_ax_None(fig_test, fig_ref):
 def test_hist_isequal():
     data = datasets.make_uniform(seed=42, size=300)
     assert data.plot.hist is data.plot.hist
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize("alpha", ["r", "g", "a"])
+def test_weights_lorenz_data(weighted_data, alpha):
+    weighted, replicated = weighted_data
+    wdf = weighted.plot._lorenz_data(alpha)
+    rdf = replicated.plot._lorenz_data(alpha)
+    np.testing.assert_allclose(
+        np.interp(rdf.population, wdf.population, wdf.variable),
+        rdf.variable,
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(
+        np.interp(rdf.population, wdf.population, wdf.line), rdf.line
+    )
+
+
+def test_weights_tip_data(weighted_data):
+    weighted, replicated = weighted_data
+    wdf = weighted.plot._tip_data(pline=30)
+    rdf = replicated.plot._tip_data(pline=30)
+    np.testing.assert_allclose(
+        np.interp(rdf.population, wdf.population, wdf.variable), rdf.variable
+    )
+
+
+def test_weights_pen_data(weighted_data):
+    weighted, replicated = weighted_data
+    wdf, wme = weighted.plot._pen_data()
+    rdf, rme = replicated.plot._pen_data()
+    assert wme == rme
+    np.testing.assert_allclose(wdf.line[0], rdf.line[0])
+    assert wdf.population.iloc[-1] == 1
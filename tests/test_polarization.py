@@ -40,12 +40,12 @@ def test_invalid():
 # =============================================================================
 def test_ray_method():
     data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
-    assert data.polarization.ray() == 0.001130140610524159
+    np.testing.assert_allclose(data.polarization.ray(), 0.001130140610524159)
 
 
 def test_ray_call():
     data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
-    assert data.polarization("ray") == 0.001130140610524159
+    np.testing.assert_allclose(data.polarization("ray"), 0.001130140610524159)
 
 
 def test_ray_call_equal_method():
@@ -55,6 +55,44 @@ def test_ray_call_equal_method():
     assert call_result == method_result
 
 
+def _ray_pairs(y, w, alpha):
+    n = np.sum(w)
+    d = np.abs(y[:, None] - y[None, :])
+    return np.sum(np.outer(w, w) * d) / n ** (2 + alpha)
+
+
+@pytest.mark.parametrize("alpha", [0.1, 0.5, 1, 1.6])
+def test_ray_alpha(alpha):
+    data = datasets.make_lognormal(seed=42, size=200, sigma=1.0, nbin=None)
+    y = data.data["x"].values
+    expected = _ray_pairs(y, np.ones(len(y)), alpha)
+    np.testing.assert_allclose(data.polarization.ray(alpha=alpha), expected)
+
+
+def test_ray_alpha_array():
+    data = datasets.make_lognormal(seed=42, size=200, sigma=1.0, nbin=None)
+    alphas = [0.25, 1.0, 1.5]
+    result = data.polarization.ray(alpha=alphas)
+    expected = [data.polarization.ray(alpha=a) for a in alphas]
+    np.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("alpha", [0, -1, 1.7, [0.5, 2]])
+def test_ray_invalid_alpha(alpha):
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    with pytest.raises(ValueError):
+        data.polarization.ray(alpha=alpha)
+
+
+def test_ray_zero_weights(weighted_data):
+    weighted, _ = weighted_data
+    df = weighted.data.copy()
+    df.iloc[:10, df.columns.get_loc("w")] = 0
+    data = ApodeData(df, income_column="x", weight_column="w")
+    expected = _ray_pairs(df["x"].values, df["w"].values, 0.8)
+    np.testing.assert_allclose(data.polarization.ray(alpha=0.8), expected)
+
+
 # =============================================================================
 # TESTS WOLFOSN
 # =============================================================================
@@ -86,3 +124,14 @@ def test_wolfson_symmetry():
     assert data.polarization(method="wolfson") == dr2.polarization(
         method="wolfson"
     )
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize("method", ["ray", "wolfson"])
+def test_weights_replication(weighted_data, method):
+    weighted, replicated = weighted_data
+    np.testing.assert_allclose(
+        weighted.polarization(method), replicated.polarization(method)
+    )
@@ -1066,3 +1066,166 @@ def test_chakravarty_homogeneity():
     assert data.poverty("chakravarty", pline=pline) == dr2.poverty(
         "chakravarty", pline=pline * k
     )
+
+
+# =============================================================================
+# TESTS ARRAY OF POVERTY LINES
+# =============================================================================
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("headcount", {}),
+        ("gap", {}),
+        ("severity", {}),
+        ("fgt", {"alpha": 0}),
+        ("fgt", {"alpha": 1}),
+        ("fgt", {"alpha": 2}),
+        ("fgt", {"alpha": 1.5}),
+        ("watts", {}),
+        ("chakravarty", {"alpha": 0.5}),
+        ("thon", {}),
+        ("takayama", {}),
+    ],
+)
+def test_pline_array(method, kwargs):
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    plines = np.linspace(0.001, 1.2, 25)
+    result = data.poverty(method, pline=plines, **kwargs)
+    expected = [data.poverty(method, pline=z, **kwargs) for z in plines]
+    assert result.shape == plines.shape
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+def test_pline_array_sorts_once():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    plines = np.linspace(0.1, 0.9, 1000)
+    data.poverty.gap(pline=plines)
+    assert set(data.cache._store) == {"ys", ("prefix", 1)}
+
+
+def test_pline_array_invalid():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    with pytest.raises(ValueError):
+        data.poverty("headcount", pline=[0.5, 0])
+    with pytest.raises(ValueError):
+        data.poverty("fgt", pline=[0.5, 0.6], alpha=-1)
+    with pytest.raises(ValueError):
+        data.poverty("chakravarty", pline=[0.5, 0.6], alpha=1)
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        "headcount",
+        "gap",
+        "severity",
+        "fgt",
+        "watts",
+        "chakravarty",
+        "thon",
+        "takayama",
+    ],
+)
+def test_pline_array_factor_q(method):
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    plines = [0.5, 0.6]
+    with pytest.raises(ValueError):
+        data.poverty(method, pline=plines, factor=0.5)
+    with pytest.raises(ValueError):
+        data.poverty(method, pline=plines, q=0.5)
+
+
+# =============================================================================
+# TESTS CURVES
+# =============================================================================
+@pytest.mark.parametrize("alpha", [0, 1, 2, 1.5])
+def test_fgt_curve(alpha):
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    curve = data.poverty.fgt_curve(0.2, 0.6, alpha=alpha)
+    y = data.data["x"].values
+    inner = np.sort(y[(y > 0.2) & (y < 0.6)])
+    np.testing.assert_array_equal(curve.pline[1:-1], inner)
+    assert curve.pline.iloc[0] == 0.2
+    assert curve.pline.iloc[-1] == 0.6
+    expected = [data.poverty.fgt(pline=z, alpha=alpha) for z in curve.pline]
+    np.testing.assert_allclose(curve.fgt, expected, atol=1e-12)
+
+
+def test_deficit_curve():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    curve = data.poverty.deficit_curve(0.1, 0.9)
+    y = data.data["x"].values
+    expected = [np.mean(np.maximum(z - y, 0)) for z in curve.pline]
+    np.testing.assert_allclose(curve.deficit, expected, atol=1e-12)
+
+
+def test_curve_invalid_range():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    with pytest.raises(ValueError):
+        data.poverty.fgt_curve(0, 0.5)
+    with pytest.raises(ValueError):
+        data.poverty.fgt_curve(0.5, 0.5)
+    with pytest.raises(ValueError):
+        data.poverty.fgt_curve(0.1, 0.5, alpha=-1)
+
+
+def test_dominance():
+    data = datasets.make_uniform(seed=42, size=300, mu=1, nbin=None)
+    y = data.data["x"].values
+    richer = ApodeData(pd.DataFrame({"x": y + 0.1}), income_column="x")
+    assert richer.poverty.dominance(data, 0.05, 0.9)
+    assert not data.poverty.dominance(richer, 0.05, 0.9)
+    assert richer.poverty.dominance(data, 0.05, 0.9, alpha=1)
+    assert data.poverty.dominance(data, 0.05, 0.9)
+    with pytest.raises(ValueError):
+        data.poverty.dominance(richer, 0.05, 0.9, alpha=2)
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("headcount", {}),
+        ("gap", {}),
+        ("severity", {}),
+        ("fgt", {"alpha": 1.5}),
+        ("sen", {}),
+        ("sst", {}),
+        ("watts", {}),
+        ("cuh", {"alpha": 0}),
+        ("cuh", {"alpha": 0.5}),
+        ("takayama", {}),
+        ("kakwani", {}),
+        ("kakwani", {"alpha": 1}),
+        ("thon", {}),
+        ("bd", {}),
+        ("hagenaars", {}),
+        ("chakravarty", {}),
+    ],
+)
+@pytest.mark.parametrize("pline", [None, 20.0, "mean"])
+def test_weights_replication(weighted_data, method, kwargs, pline):
+    weighted, replicated = weighted_data
+    np.testing.assert_allclose(
+        weighted.poverty(method, pline=pline, **kwargs),
+        replicated.poverty(method, pline=pline, **kwargs),
+    )
+
+
+def test_weights_pline_array(weighted_data):
+    weighted, replicated = weighted_data
+    plines = np.linspace(5, 60, 12)
+    for method in ["headcount", "gap", "severity", "watts", "thon"]:
+        np.testing.assert_allclose(
+            weighted.poverty(method, pline=plines),
+            replicated.poverty(method, pline=plines),
+        )
+
+
+def test_weights_fgt_curve(weighted_data):
+    weighted, replicated = weighted_data
+    curve = weighted.poverty.fgt_curve(5, 60, alpha=2)
+    expected = replicated.poverty.fgt(pline=curve.pline.values, alpha=2)
+    np.testing.assert_allclose(curve.fgt, expected)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+import math
+
+from apode import ApodeData
+from apode.precision import BLOCK, fcumsum, fsum, searchsorted
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS PRECISION
+# =============================================================================
+
+
+def _incomes(size, seed=42):
+    return np.random.default_rng(seed).lognormal(10, 1, size)
+
+
+def test_fsum_float32():
+    y = _incomes(3 * BLOCK + 17).astype(np.float32)
+    exact = math.fsum(y.astype(float))
+    assert fsum(y) == exact
+    assert fsum(y[:5]) == math.fsum(y[:5].astype(float))
+    assert fsum(y[:0]) == 0
+
+
+def test_fsum_float64_unchanged():
+    y = _incomes(1000)
+    assert fsum(y) == np.sum(y)
+    assert fsum(y, sum) == sum(y)
+
+
+def test_fcumsum_float32():
+    y = _incomes(5 * BLOCK + 3).astype(np.float32)
+    result = fcumsum(y)
+    assert result.dtype == np.float64
+    np.testing.assert_allclose(
+        result, np.cumsum(y.astype(float)), rtol=1e-13
+    )
+    assert result[-1] == math.fsum(y.astype(float))
+    np.testing.assert_array_equal(fcumsum(y[:0]), [])
+
+
+def test_searchsorted_float32():
+    ys = np.sort(_incomes(2000)).astype(np.float32)
+    lines = np.concatenate(
+        [ys[::97].astype(float), np.nextafter(ys[::89], np.inf) - 1e-3]
+    )
+    for side in ("left", "right"):
+        expected = np.searchsorted(ys.astype(float), lines, side=side)
+        np.testing.assert_array_equal(searchsorted(ys, lines, side), expected)
+        for line, count in zip(lines, expected):
+            assert searchsorted(ys, line, side) == count
+
+
+def test_float32_storage():
+    y = _incomes(10 ** 5)
+    data64 = ApodeData.from_array(y)
+    data32 = ApodeData.from_array(y, dtype="float32")
+    cache = data32.cache
+    assert data32.data["x"].dtype == np.float32
+    assert cache.ys.dtype == np.float32
+    assert cache.cumsum.dtype == np.float64
+    assert cache.ys.nbytes * 2 == data64.cache.ys.nbytes
+    measures = [
+        ("inequality", "gini", {}, 1e-9),
+        ("poverty", "fgt", {"pline": 20000.0, "alpha": 0}, 1e-7),
+        ("poverty", "fgt", {"pline": "median", "alpha": 1}, 1e-6),
+        ("poverty", "fgt", {"pline": "median", "alpha": 2}, 1e-6),
+        ("inequality", "entropy", {"alpha": 0}, 1e-6),
+        ("inequality", "entropy", {"alpha": 1}, 1e-6),
+        ("inequality", "entropy", {"alpha": 2}, 1e-6),
+    ]
+    for family, method, kwargs, rtol in measures:
+        expected = getattr(getattr(data64, family), method)(**kwargs)
+        result = getattr(getattr(data32, family), method)(**kwargs)
+        np.testing.assert_allclose(result, expected, rtol=rtol)
+
+
+def test_float32_store(tmp_path):
+    data = ApodeData.from_array(_incomes(1000), dtype="float32")
+    data.save_store(tmp_path / "store")
+    stored = ApodeData.open_store(tmp_path / "store")
+    assert stored.cache.y.dtype == np.float32
+    assert stored.inequality.gini() == data.inequality.gini()
+
+
+def test_from_array_dtype():
+    with pytest.raises(ValueError):
+        ApodeData.from_array(_incomes(10), dtype="int64")
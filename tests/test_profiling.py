@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+import threading
+
+from apode import ApodeData, datasets
+from apode.profiling import add_hook, measure_call, profile, remove_hook
+
+import numpy as np
+
+
+# =============================================================================
+# TESTS PROFILING
+# =============================================================================
+
+
+def test_profile_calls():
+    data = datasets.make_lognormal(seed=42, size=1000, nbin=None)
+    with profile() as prof:
+        data.poverty.sen(pline="median", factor=0.6)
+        data.inequality.gini()
+    first, second = prof.calls
+    assert first.measure == "poverty.sen"
+    assert first.params == {"pline": "median", "factor": 0.6}
+    assert first.sorts == 1
+    assert first.cache_misses > 0
+    assert first.cached_bytes >= data.cache.ys.nbytes
+    assert first.extract_time > 0
+    assert first.peak_bytes is None
+    assert second.measure == "inequality.gini"
+    assert second.sorts == 0
+    assert second.cache_hits > 0
+    assert second.cache_misses == 0
+    assert second.wall_time > 0
+    frame = prof.to_frame()
+    assert list(frame["measure"]) == ["poverty.sen", "inequality.gini"]
+
+
+def test_profile_nested_and_grouped():
+    data = datasets.make_lognormal(seed=42, size=1000, nbin=None)
+    grouped = ApodeData(
+        data.data.assign(g=np.arange(1000) % 3), income_column="x"
+    )
+    with profile() as prof:
+        data.poverty("sen", pline=1.0)
+        grouped.groupby("g").inequality.gini()
+    assert [call.measure for call in prof.calls] == [
+        "poverty.sen",
+        "inequality.gini",
+    ]
+    assert prof.calls[1].sorts == 1
+
+
+def test_profile_threads():
+    data = datasets.make_lognormal(seed=42, size=1000, nbin=None)
+    inside, done = threading.Event(), threading.Event()
+
+    def outer():
+        with measure_call("thread.outer", {}):
+            inside.set()
+            done.wait(10)
+
+    def measure():
+        inside.wait(10)
+        try:
+            data.inequality.gini()
+        finally:
+            done.set()
+
+    with profile() as prof:
+        threads = [threading.Thread(target=f) for f in (outer, measure)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    calls = {call.measure: call for call in prof.calls}
+    assert set(calls) == {"thread.outer", "inequality.gini"}
+    assert calls["thread.outer"].sorts == 0
+    assert calls["thread.outer"].cache_misses == 0
+    assert calls["inequality.gini"].sorts == 1
+    assert calls["inequality.gini"].cache_misses > 0
+
+
+def test_profile_trace_memory():
+    data = datasets.make_lognormal(seed=42, size=10000, nbin=None)
+    with profile(trace_memory=True) as prof:
+        data.inequality.gini()
+    assert prof.calls[0].peak_bytes >= data.cache.ys.nbytes
+
+
+def test_profile_hooks():
+    data = datasets.make_uniform(seed=42, size=100, mu=1, nbin=None)
+    events = []
+    add_hook(events.append)
+    try:
+        data.welfare.utilitarian()
+    finally:
+        remove_hook(events.append)
+    data.welfare.utilitarian()
+    assert len(events) == 1
+    assert events[0]["measure"] == "welfare.utilitarian"
+    assert set(events[0]) >= {"wall_time", "sorts", "cache_hits"}
+
+
+def test_profile_inactive():
+    data = datasets.make_uniform(seed=42, size=100, mu=1, nbin=None)
+    with profile() as prof:
+        pass
+    data.inequality.gini()
+    assert prof.calls == []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from functools import reduce
+
+from apode.sketch import QuantileSketch
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# TESTS SKETCH
+# =============================================================================
+
+
+def _rank_error(y, sketch, qs):
+    ys = np.sort(y)
+    found = [np.searchsorted(ys, sketch.quantile(q)) / len(ys) for q in qs]
+    return np.max(np.abs(np.array(found) - qs))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sketch_error_bound(seed):
+    random = np.random.RandomState(seed)
+    y = random.lognormal(size=50000)
+    sketches = [
+        QuantileSketch.from_array(part, seed=seed)
+        for part in np.array_split(y, 20)
+    ]
+    sketch = reduce(QuantileSketch.merge, sketches)
+    qs = np.linspace(0.01, 0.99, 50)
+    assert sketch.population == len(y)
+    assert sketch.size < 1000
+    assert _rank_error(y, sketch, qs) <= sketch.epsilon
+
+
+def test_sketch_weights():
+    random = np.random.RandomState(42)
+    y = random.lognormal(size=20000)
+    w = random.randint(0, 10, size=20000)
+    sketch = QuantileSketch.from_array(y, w, seed=42)
+    qs = np.linspace(0.01, 0.99, 50)
+    assert sketch.population == w.sum()
+    assert _rank_error(np.repeat(y, w), sketch, qs) <= sketch.epsilon
+
+
+def test_sketch_small_is_exact():
+    y = np.array([5.0, 1.0, 3.0, 2.0, 4.0])
+    sketch = QuantileSketch.from_array(y)
+    assert sketch.size == 5
+    assert sketch.quantile(0.5) == np.median(y)
+    assert sketch.rank(3.5) == 3
+
+
+def test_sketch_invalid():
+    with pytest.raises(ValueError):
+        QuantileSketch.from_array([1.0, 2.0], weights=[1.5, 1])
+    with pytest.raises(ValueError):
+        QuantileSketch.from_array([1.0, 2.0], k=4)
+    with pytest.raises(ValueError):
+        QuantileSketch.from_array([1.0]).merge(
+            QuantileSketch.from_array([1.0], k=100)
+        )
+    with pytest.raises(ValueError):
+        QuantileSketch.from_array([1.0]).quantile(2)
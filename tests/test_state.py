@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from functools import reduce
+
+import apode
+from apode import State
+
+import numpy as np
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def chunked(maybe_weighted):
+    idf = maybe_weighted(900, high=4)
+    y = idf.data["x"].values
+    w = None if idf.weight_column is None else idf.data["w"].values
+    chunks = np.array_split(np.arange(len(y)), 4)
+    return idf, y, w, chunks
+
+
+def _merged(y, w, chunks, **kwargs):
+    states = [
+        State.from_array(y[c], None if w is None else w[c], **kwargs)
+        for c in chunks
+    ]
+    return reduce(State.merge, states)
+
+
+# =============================================================================
+# TESTS STATE
+# =============================================================================
+
+
+def test_state_exported():
+    assert apode.State is State
+
+
+STATISTICS_CASES = [
+    ("poverty.headcount", {"pline": 1.0}),
+    ("poverty.gap", {"pline": 1.0}),
+    ("poverty.severity", {"pline": 1.0}),
+    ("poverty.fgt", {"pline": 1.0, "alpha": 2}),
+    ("poverty.watts", {"pline": 1.0}),
+    ("inequality.rrange", {}),
+    ("inequality.cv", {}),
+    ("inequality.entropy", {"alpha": 0}),
+    ("inequality.entropy", {"alpha": 1}),
+    ("inequality.entropy", {"alpha": 0.5}),
+    ("inequality.atkinson", {"alpha": 2}),
+    ("inequality.atkinson", {"alpha": 1}),
+    ("concentration.herfindahl", {}),
+    ("welfare.utilitarian", {}),
+    ("welfare.rawlsian", {}),
+    ("welfare.isoelastic", {"alpha": 2}),
+    ("welfare.theill", {}),
+    ("welfare.theilt", {}),
+]
+
+
+@pytest.mark.parametrize("measure, kwargs", STATISTICS_CASES)
+def test_state_statistics(chunked, measure, kwargs):
+    idf, y, w, chunks = chunked
+    state = _merged(y, w, chunks, exponents=(-1, 0.5), plines=(1.0,))
+    family, method = measure.split(".")
+    expected = getattr(getattr(idf, family), method)(**kwargs)
+    np.testing.assert_allclose(state.finalize(measure, **kwargs), expected)
+
+
+@pytest.mark.parametrize(
+    "measure, kwargs",
+    [
+        ("inequality.gini", {}),
+        ("poverty.sen", {"pline": 1.0}),
+        ("poverty.headcount", {"pline": "median"}),
+        ("polarization.wolfson", {}),
+        ("inequality.bonferroni", {}),
+    ],
+)
+def test_state_keep_values(chunked, measure, kwargs):
+    idf, y, w, chunks = chunked
+    state = _merged(y, w, chunks, keep_values=True)
+    family, method = measure.split(".")
+    expected = getattr(getattr(idf, family), method)(**kwargs)
+    np.testing.assert_allclose(state.finalize(measure, **kwargs), expected)
+    assert state.count == len(y)
+
+
+def test_state_merge_mixed_weights():
+    a = State.from_array([1.0, 3.0], keep_values=True)
+    b = State.from_array([2.0], weights=[2], keep_values=True)
+    state = a.merge(b)
+    np.testing.assert_array_equal(state.values[0], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(state.values[1], [1, 2, 1])
+    assert state.population == 4
+
+
+def test_state_merge_runs_ties():
+    rng = np.random.default_rng(42)
+    ya, yb = np.sort(rng.integers(0, 20, 50)), np.sort(rng.integers(0, 20, 30))
+    wa, wb = rng.integers(1, 5, 50), rng.integers(1, 5, 30)
+    a = State.from_array(ya, weights=wa, keep_values=True)
+    b = State.from_array(yb, weights=wb, keep_values=True)
+    ys, ws = a.merge(b).values
+    order = np.argsort(np.concatenate((ya, yb)), kind="mergesort")
+    np.testing.assert_array_equal(ys, np.concatenate((ya, yb))[order])
+    np.testing.assert_array_equal(ws, np.concatenate((wa, wb))[order])
+
+
+def test_state_tuple_measure():
+    state = State.from_array([1.0, 2.0, 3.0])
+    assert state.finalize(("welfare", "utilitarian")) == 2.0
+
+
+def test_state_missing_statistics():
+    state = State.from_array([1.0, 2.0, 3.0], plines=(1.5,))
+    with pytest.raises(ValueError):
+        state.finalize("inequality.gini")
+    with pytest.raises(ValueError):
+        state.finalize("poverty.headcount", pline=2.0)
+    with pytest.raises(ValueError):
+        state.finalize("inequality.atkinson", alpha=3)
+    with pytest.raises(ValueError):
+        state.finalize("poverty.fgt", pline=1.5, alpha=3)
+
+
+def test_state_invalid():
+    state = State.from_array([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        state.finalize("foo.gini")
+    with pytest.raises(ValueError):
+        state.merge(State.from_array([1.0], exponents=(3,)))
+    with pytest.raises(ValueError):
+        State.from_array([1.0], plines=(0,))
+
+
+@pytest.mark.parametrize(
+    "measure, kwargs",
+    [
+        ("poverty.headcount", {}),
+        ("poverty.headcount", {"pline": "median", "factor": 0.6}),
+        ("poverty.gap", {"pline": "mean", "factor": 0.5}),
+        ("poverty.fgt", {"pline": "quantile", "q": 0.3, "alpha": 2}),
+        ("poverty.sen", {"pline": 0.9}),
+    ],
+)
+def test_state_sketch(chunked, measure, kwargs):
+    idf, y, w, chunks = chunked
+    state = _merged(y, w, chunks, sketch=200)
+    family, method = measure.split(".")
+    expected = getattr(getattr(idf, family), method)(**kwargs)
+    result = state.finalize(measure, **kwargs)
+    assert abs(result - expected) <= 2 * state.sketch.epsilon
+
+
+def test_state_sketch_keeps_exact_lines(chunked):
+    idf, y, w, chunks = chunked
+    state = _merged(y, w, chunks, plines=(1.0,), sketch=200)
+    np.testing.assert_allclose(
+        state.finalize("poverty.gap", pline=1.0), idf.poverty.gap(pline=1.0)
+    )
+
+
+def test_state_merge_sketch_mismatch():
+    with pytest.raises(ValueError):
+        State.from_array([1.0], sketch=200).merge(State.from_array([1.0]))
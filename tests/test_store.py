@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+import json
+from unittest import mock
+
+from apode import ApodeData, datasets
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# TESTS STORE
+# =============================================================================
+
+
+@pytest.mark.parametrize("nbin", [None, 20], ids=["plain", "weights"])
+def test_store_roundtrip(tmp_path, nbin):
+    data = datasets.make_lognormal(seed=42, size=500, sigma=1.0, nbin=nbin)
+    data.save_store(tmp_path / "store")
+    with mock.patch("numpy.sort") as sort, mock.patch("numpy.argsort") as arg:
+        stored = ApodeData.open_store(tmp_path / "store")
+        values = [
+            stored.inequality.gini(),
+            stored.poverty.sen(pline="median", factor=0.6),
+            stored.polarization.wolfson(),
+            stored.inequality.bonferroni(),
+        ]
+    sort.assert_not_called()
+    arg.assert_not_called()
+    assert isinstance(stored.cache.ys, np.memmap)
+    assert stored.income_column == data.income_column
+    assert stored.weight_column == data.weight_column
+    expected = [
+        data.inequality.gini(),
+        data.poverty.sen(pline="median", factor=0.6),
+        data.polarization.wolfson(),
+        data.inequality.bonferroni(),
+    ]
+    np.testing.assert_allclose(values, expected)
+
+
+def test_store_in_memory(tmp_path):
+    data = datasets.make_uniform(seed=42, size=100, mu=1, nbin=None)
+    data.save_store(tmp_path)
+    stored = ApodeData.open_store(tmp_path, mmap_mode=None)
+    assert not isinstance(stored.cache.ys, np.memmap)
+    np.testing.assert_array_equal(stored.cache.y, data.cache.y)
+
+
+def test_store_version(tmp_path):
+    data = datasets.make_uniform(seed=42, size=100, mu=1, nbin=None)
+    data.save_store(tmp_path)
+    metadata = json.loads((tmp_path / "apode.json").read_text())
+    metadata["version"] = 99
+    (tmp_path / "apode.json").write_text(json.dumps(metadata))
+    with pytest.raises(ValueError):
+        ApodeData.open_store(tmp_path)
+
+
+def test_store_weights_not_read(tmp_path):
+    data = datasets.make_lognormal(seed=42, size=100, nbin=20)
+    data.save_store(tmp_path)
+    # the weights are checked when the data is built, not on open
+    weights = np.load(tmp_path / "weights.npy")
+    np.save(tmp_path / "weights.npy", -weights)
+    stored = ApodeData.open_store(tmp_path)
+    assert stored.weight_column == data.weight_column
+    with pytest.raises(ValueError):
+        ApodeData.from_array(stored.cache.y, weights=-weights)
+
+
+def test_store_int_incomes(tmp_path):
+    df = pd.DataFrame({"x": np.arange(1, 101), "w": np.arange(100) % 3})
+    data = ApodeData(df, income_column="x", weight_column="w")
+    data.save_store(tmp_path)
+    stored = ApodeData.open_store(tmp_path)
+    assert stored.cache.y.dtype == np.float64
+    assert stored.cache.ys.dtype == np.float64
+    np.testing.assert_array_equal(stored.cache.y, df["x"])
+    assert stored.inequality.gini() == data.inequality.gini()
+    assert stored.poverty.headcount(pline=30) == data.poverty.headcount(
+        pline=30
+    )
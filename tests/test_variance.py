@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the
+#   Apode Project (https://github.com/mchalela/apode).
+# Copyright (c) 2020, Néstor Grión and Sofía Sappia
+# License: MIT
+#   Full Text: https://github.com/ngrion/apode/blob/master/LICENSE.txt
+
+from apode import ApodeData
+from apode.variance import influence, linearized_se
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def sample(maybe_weighted):
+    return maybe_weighted(2000)
+
+
+# =============================================================================
+# TESTS VARIANCE
+# =============================================================================
+
+
+SE_CASES = [
+    ("poverty.headcount", {"pline": 1.0}),
+    ("poverty.headcount", {"pline": "median", "factor": 0.6}),
+    ("poverty.gap", {"pline": "mean", "factor": 0.5}),
+    ("poverty.severity", {"pline": 1.0}),
+    ("poverty.fgt", {"pline": "quantile", "q": 0.4, "alpha": 1.5}),
+    ("poverty.watts", {"pline": 1.0}),
+    ("poverty.sen", {"pline": 1.0}),
+    ("inequality.gini", {}),
+    ("inequality.entropy", {"alpha": 0}),
+    ("inequality.entropy", {"alpha": 1}),
+    ("inequality.entropy", {"alpha": 0.5}),
+    ("inequality.atkinson", {"alpha": 1}),
+    ("inequality.atkinson", {"alpha": 0.5}),
+    ("welfare.utilitarian", {}),
+]
+
+
+@pytest.mark.parametrize("measure, kwargs", SE_CASES)
+def test_linearized_se_bootstrap(sample, measure, kwargs):
+    se = sample.standard_error(measure, **kwargs)
+    result = sample.bootstrap(measure, reps=400, seed=7, **kwargs)
+    np.testing.assert_allclose(se, result.se, rtol=0.15)
+
+
+@pytest.mark.parametrize("measure, kwargs", SE_CASES)
+def test_influence_centered(sample, measure, kwargs):
+    cache = sample.cache
+    z = influence(cache, measure, **kwargs)
+    w = cache.ws if cache.weighted else np.ones(cache.n)
+    assert len(z) == cache.n
+    assert abs(np.sum(w * z) / np.sum(w)) < 0.05 * np.std(z)
+
+
+def test_linearized_se_mean():
+    y = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0])
+    idf = ApodeData(pd.DataFrame({"x": y}), income_column="x")
+    expected = np.std(y, ddof=1) / np.sqrt(len(y))
+    np.testing.assert_allclose(
+        idf.standard_error("welfare.utilitarian"), expected
+    )
+    np.testing.assert_allclose(
+        linearized_se(idf.cache, ("welfare", "utilitarian")), expected
+    )
+
+
+def test_linearized_se_invalid(sample):
+    with pytest.raises(ValueError):
+        sample.standard_error("inequality.bonferroni")
+    with pytest.raises(ValueError):
+        sample.standard_error("foo.gini")
+    with pytest.raises(ValueError):
+        sample.standard_error("poverty.fgt", pline=1.0, alpha=-1)
+
+
+def test_linearized_se_groupby():
+    random = np.random.RandomState(seed=3)
+    df = pd.DataFrame(
+        {"x": random.lognormal(size=600), "g": random.choice(list("abc"), 600)}
+    )
+    idf = ApodeData(df, income_column="x")
+    result = idf.groupby("g").standard_error("inequality.gini")
+    for key, part in df.groupby("g"):
+        expected = ApodeData(
+            part.reset_index(drop=True), income_column="x"
+        ).standard_error("inequality.gini")
+        np.testing.assert_allclose(result[key], expected)
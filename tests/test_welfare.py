@@ -329,3 +329,27 @@ def test_theilt_homogeneity():
     df2 = pd.DataFrame({"x": y})
     dr2 = ApodeData(df2, income_column="x")
     assert data.welfare("theilt") == dr2.welfare("theilt")
+
+
+# =============================================================================
+# TESTS WEIGHTS
+# =============================================================================
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("utilitarian", {}),
+        ("rawlsian", {}),
+        ("isoelastic", {"alpha": 0}),
+        ("isoelastic", {"alpha": 1}),
+        ("isoelastic", {"alpha": 2}),
+        ("sen", {}),
+        ("theill", {}),
+        ("theilt", {}),
+    ],
+)
+def test_weights_replication(weighted_data, method, kwargs):
+    weighted, replicated = weighted_data
+    np.testing.assert_allclose(
+        weighted.welfare(method, **kwargs),
+        replicated.welfare(method, **kwargs),
+    )